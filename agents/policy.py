@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Protocol, Sequence
+
+import httpx
+
+from agents.base_agent import AgentDecision, HospitalAIAgent
+from instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+_TIMEOUTS = metrics.counter("agent_policy_failures_total", reason="timeout")
+_ERRORS = metrics.counter("agent_policy_failures_total", reason="error")
+
+
+@dataclass
+class DecisionRequest:
+    """What a policy sees about one live agent at the start of a round."""
+
+    agent_name: str
+    round: int
+    balance: float
+    burn_rate: float
+    skill_level: float
+    reputation: float
+    beds: int
+    nurses: int
+    doctors: int
+
+
+@dataclass
+class PolicyDecision:
+    """A policy's answer for one agent; fields left as ``None`` fall back to the agent's own heuristics."""
+
+    decision: AgentDecision
+    staffing: dict[str, int] | None = None
+    triage_efficiency: float | None = None
+    workflow_efficiency: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PolicyDecision:
+        """Parse one decision from a policy server; raises ``ValueError`` on anything malformed."""
+        staffing = data.get("staffing")
+        if staffing is not None:
+            staffing = {key: int(staffing[key]) for key in ("beds", "nurses", "doctors")}
+            if min(staffing.values()) < 1:
+                raise ValueError(f"staffing must be positive: {staffing}")
+        efficiencies = [data.get(key) for key in ("triage_efficiency", "workflow_efficiency")]
+        efficiencies = [None if value is None else float(value) for value in efficiencies]
+        if any(value is not None and value <= 0 for value in efficiencies):
+            raise ValueError(f"efficiencies must be positive: {efficiencies}")
+        return cls(
+            decision=AgentDecision(str(data["action"]), str(data.get("reason", "")), float(data.get("expected_roi", 0.0))),
+            staffing=staffing,
+            triage_efficiency=efficiencies[0],
+            workflow_efficiency=efficiencies[1],
+        )
+
+
+class AgentPolicy(Protocol):
+    """Decides a whole round at once. Missing agents in the result get the heuristic fallback.
+
+    A policy with a ``batch`` attribute set to ``False`` is instead called once per agent,
+    so a slow or failing agent does not hold back the others' answers.
+    """
+
+    async def decide_round(self, requests: Sequence[DecisionRequest]) -> dict[str, PolicyDecision]: ...
+
+
+def decision_request(agent: HospitalAIAgent, round_idx: int, balance: float, burn_rate: float, beds: int, nurses: int, doctors: int) -> DecisionRequest:
+    return DecisionRequest(agent.name, round_idx, balance, burn_rate, agent.skill_level, agent.reputation, beds, nurses, doctors)
+
+
+class HttpAgentPolicy:
+    """Asks a model server for decisions over HTTP.
+
+    With ``batch=True`` the whole round is one ``POST {"agents": [...]}`` answered by
+    ``{"decisions": [...]}``; otherwise every agent is a concurrent ``POST`` of its own
+    request answered by one decision. Decisions are JSON objects with ``agent_name``,
+    ``action``, ``reason``, ``expected_roi`` and optionally ``staffing``,
+    ``triage_efficiency`` and ``workflow_efficiency``. A call that fails or misses
+    ``timeout_seconds`` raises; a malformed decision is logged and skipped.
+
+    One ``httpx.AsyncClient`` is kept for the life of the policy, so connections are reused
+    across rounds. It is rebuilt if the policy is used from a different event loop.
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 1.0, batch: bool = True, max_concurrency: int = 64) -> None:
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+        self.batch = batch
+        self.max_concurrency = max_concurrency
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    async def decide_round(self, requests: Sequence[DecisionRequest]) -> dict[str, PolicyDecision]:
+        client = self._client_for_running_loop()
+        if self.batch:
+            answers = await self._post(client, {"agents": [asdict(r) for r in requests]})
+            answers = answers.get("decisions", []) if isinstance(answers, dict) else []
+        else:
+            answers = await asyncio.gather(*(self._post(client, asdict(r)) for r in requests))
+        decisions = {}
+        for answer in answers:
+            try:
+                decisions[answer["agent_name"]] = PolicyDecision.from_dict(answer)
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("ignoring malformed decision from %s: %r (%s)", self.url, answer, exc)
+        return decisions
+
+    def _client_for_running_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            limits = httpx.Limits(max_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds, limits=limits)
+            self._client_loop = loop
+        return self._client
+
+    async def _post(self, client: httpx.AsyncClient, payload: dict) -> dict:
+        response = await client.post(self.url, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _policy_loop() -> asyncio.AbstractEventLoop:
+    """The event loop, on a daemon thread, that runs every round's policy calls; started on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agent-policy-loop", daemon=True).start()
+        return _loop
+
+
+def collect_decisions(policy: AgentPolicy, requests: Sequence[DecisionRequest], deadline_seconds: float) -> dict[str, PolicyDecision]:
+    """Run ``policy`` for one round, giving up on whatever is not back by ``deadline_seconds``.
+
+    Batch policies are one call for the round; others get one call per agent, and the
+    answers that are back by the deadline are kept. Calls that fail or run late are
+    logged and counted in ``agent_policy_failures_total``, and their agents fall back to
+    their heuristics.
+    """
+    return asyncio.run_coroutine_threadsafe(_collect(policy, requests, deadline_seconds), _policy_loop()).result()
+
+
+async def _collect(policy: AgentPolicy, requests: Sequence[DecisionRequest], deadline_seconds: float) -> dict[str, PolicyDecision]:
+    calls = [requests] if getattr(policy, "batch", True) else [[request] for request in requests]
+    tasks = {asyncio.ensure_future(policy.decide_round(call)): call for call in calls}
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+    decisions: dict[str, PolicyDecision] = {}
+    for task in done:
+        agents = {request.agent_name for request in tasks[task]}
+        exc = task.exception()
+        if exc is not None:
+            (_TIMEOUTS if isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError)) else _ERRORS).inc()
+            logger.warning("agent policy call for %s failed: %r", sorted(agents), exc)
+            continue
+        decisions.update((name, decision) for name, decision in task.result().items() if name in agents)
+    for task in pending:
+        task.cancel()
+        _TIMEOUTS.inc()
+        logger.warning("agent policy call for %s missed the %.3gs deadline", sorted(r.agent_name for r in tasks[task]), deadline_seconds)
+    return decisions
@@ -1,12 +1,207 @@
-from fastapi import APIRouter
+import json
+from dataclasses import asdict
+from typing import Literal
 
-from app.models.schemas import SimulationRequest, SimulationResponse
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+
+from app.models.schemas import (
+    BatchSimulationRequest,
+    BatchSimulationResponse,
+    EnsembleRequest,
+    EnsembleResponse,
+    ForkRequest,
+    JobStatus,
+    SimulationRequest,
+    SimulationResponse,
+    SweepRequest,
+    SweepResponse,
+)
+from app.services import columnar
+from app.services.batch import BatchRunner
+from app.services.ensemble import EnsembleRunner
+from app.services.jobs import Job, JobLimitError, JobManager
 from app.services.lab_service import SurvivalLabService
+from app.services.run_store import RunStore
+from app.services.sweep import StaffingSweep
+from app.services.timeseries import DEFAULT_METRICS, TimeSeriesView
+from instrumentation import metrics
 
 router = APIRouter(prefix="/api")
-service = SurvivalLabService()
+run_store = RunStore()
+service = SurvivalLabService(run_store=run_store)
+ensemble_runner = EnsembleRunner(service)
+batch_runner = BatchRunner(service)
+job_manager = JobManager(service)
+staffing_sweep = StaffingSweep(service)
+timeseries = TimeSeriesView(run_store)
 
 
 @router.post("/simulate", response_model=SimulationResponse)
-def run_simulation(payload: SimulationRequest) -> dict:
-    return service.run_iteration(payload)
+def run_simulation(
+    payload: SimulationRequest,
+    format: Literal["json", "columnar", "binary"] | None = None,
+    accept: str | None = Header(default=None),
+) -> dict | Response:
+    chosen = columnar.negotiate(format, accept)
+    if chosen != "json":
+        # Columnar formats leave out decision logs, so the run need not build a full log per row.
+        payload = payload.model_copy(update={"response_mode": "compact"})
+    # Handler time only; http_request_duration_seconds minus this is validation and serialization.
+    with metrics.timer("http_handler_seconds", path="/api/simulate"):
+        try:
+            result = service.run_iteration(payload)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from None
+    # Columnar formats are returned as a ready Response, which skips SimulationResponse validation.
+    if chosen == "columnar":
+        return Response(columnar.encode_json(result), media_type=columnar.JSON_MEDIA_TYPE)
+    if chosen == "binary":
+        return Response(columnar.encode_binary(result), media_type=columnar.BINARY_MEDIA_TYPE)
+    return result
+
+
+@router.post("/simulate/batch", response_model=BatchSimulationResponse)
+def run_simulation_batch(payload: BatchSimulationRequest) -> dict:
+    try:
+        return batch_runner.run(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+@router.get("/estimator/calibration")
+def estimator_calibration() -> dict:
+    return asdict(service.estimator.report)
+
+
+@router.get("/cache/stats")
+def cache_stats() -> dict:
+    return service.cache.stats()
+
+
+@router.get("/history/runs")
+def list_runs(limit: int = Query(default=50, ge=1, le=1000)) -> list[dict]:
+    return run_store.runs(limit=limit)
+
+
+@router.get("/history/runs/{run_id}/timeseries")
+def run_timeseries(
+    run_id: str,
+    points: int = Query(default=64, ge=3, le=2000),
+    metrics: list[str] = Query(default=list(DEFAULT_METRICS)),
+    agent_name: list[str] | None = Query(default=None),
+) -> dict:
+    try:
+        return timeseries.series(run_id, points=points, metrics=metrics, agent_names=agent_name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Run not found") from None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+@router.get("/history/agents/{agent_name}/series")
+def agent_series(agent_name: str, run_id: str | None = None, last_runs: int = Query(default=10, ge=1, le=1000)) -> list[dict]:
+    return run_store.agent_series(agent_name, run_id=run_id, last_runs=last_runs)
+
+
+@router.get("/history/leaderboard")
+def history_leaderboard(limit: int = Query(default=20, ge=1, le=1000), agent_name: str | None = None) -> list[dict]:
+    return run_store.leaderboard(limit=limit, agent_name=agent_name)
+
+
+@router.post("/runs/{run_id}/resume", response_model=SimulationResponse)
+def resume_run(run_id: str) -> dict:
+    try:
+        return service.resume(run_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Run or checkpoint not found") from None
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from None
+
+
+@router.post("/runs/{run_id}/fork", response_model=SimulationResponse)
+def fork_run(run_id: str, payload: ForkRequest) -> dict:
+    try:
+        return service.fork(run_id, payload.from_round, payload.overrides)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Run or checkpoint not found") from None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+@router.post("/simulate/stream")
+def stream_simulation(payload: SimulationRequest, format: Literal["ndjson", "sse"] = "ndjson") -> StreamingResponse:
+    try:
+        frames = service.stream_iteration(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    if format == "sse":
+        body = (f"event: {frame['type']}\ndata: {json.dumps(frame['data'])}\n\n" for frame in frames)
+        return StreamingResponse(body, media_type="text/event-stream")
+    return StreamingResponse((json.dumps(frame) + "\n" for frame in frames), media_type="application/x-ndjson")
+
+
+@router.post("/simulate/ensemble", response_model=EnsembleResponse)
+def run_ensemble(payload: EnsembleRequest) -> dict:
+    try:
+        return ensemble_runner.run(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+@router.post("/sweep", response_model=SweepResponse)
+def run_sweep(payload: SweepRequest) -> dict:
+    try:
+        return staffing_sweep.run(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+
+
+def _job_status(job: Job, since: int = 0) -> dict:
+    return {
+        "job_id": job.job_id,
+        "tenant": job.tenant,
+        "status": job.status,
+        "rounds_completed": job.rounds_completed,
+        "total_rounds": job.request.rounds,
+        "partial_results": job.partial_results[since:],
+        "error": job.error,
+    }
+
+
+def _get_job(job_id: str) -> Job:
+    try:
+        return job_manager.get(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found") from None
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+def submit_job(payload: SimulationRequest, x_tenant_id: str = Header(default="default")) -> dict:
+    try:
+        job = job_manager.submit(payload, tenant=x_tenant_id)
+    except JobLimitError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from None
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str, since: int = 0) -> dict:
+    return _job_status(_get_job(job_id), since=since)
+
+
+@router.get("/jobs/{job_id}/result", response_model=SimulationResponse)
+def get_job_result(job_id: str) -> dict:
+    job = _get_job(job_id)
+    if job.result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str) -> dict:
+    try:
+        job = job_manager.cancel(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found") from None
+    return _job_status(job)
@@ -1,6 +1,11 @@
+import time
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.api.routes import router
+from instrumentation import metrics
 
 app = FastAPI(
     title="Hospital AI Survival Lab",
@@ -11,6 +16,34 @@ app = FastAPI(
 app.include_router(router)
 
 
+class RequestDurationMiddleware:
+    """Plain ASGI middleware, so requests are not re-wrapped in extra streams and tasks."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not metrics.enabled():
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Label by route template so path parameters (job ids) do not explode the series count.
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            metrics.observe("http_request_duration_seconds", time.perf_counter() - started, path=path, method=scope["method"])
+
+
+app.add_middleware(RequestDurationMiddleware)
+
+
 @app.get("/health")
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
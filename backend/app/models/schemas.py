@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +15,12 @@ class SimulationRequest(BaseModel):
     api_calls: int = Field(default=15, ge=0)
     simulation_runs: int = Field(default=1, ge=1)
     seed: int | None = None
+    response_mode: Literal["full", "compact"] = "full"
+    ledger: Literal["scalar", "columnar"] = "scalar"
+    agent_workers: int = Field(default=1, ge=1, le=64)
+    random_streams: Literal["single", "common", "antithetic"] = "single"
+    mode: Literal["simulate", "estimate"] = "simulate"
+    agent_policy: str | None = None
 
 
 class AgentMetrics(BaseModel):
@@ -39,3 +47,105 @@ class SimulationResponse(BaseModel):
     rounds: int
     leaderboard: list[dict]
     results: list[AgentRoundResult]
+    decision_logs: dict[str, list[dict]] | None = None
+    run_id: str | None = None
+
+
+class BatchSimulationRequest(BaseModel):
+    requests: list[SimulationRequest] = Field(min_length=1, max_length=256)
+    workers: int = Field(default=1, ge=1, le=64)
+
+
+class BatchSimulationResponse(BaseModel):
+    results: list[SimulationResponse]
+    unique_requests: int
+    shifts_simulated: int
+    shifts_reused: int
+
+
+class ForkRequest(BaseModel):
+    from_round: int = Field(ge=0)
+    overrides: dict[str, Any] = Field(default_factory=dict)
+
+
+class EnsembleRequest(SimulationRequest):
+    max_replications: int = Field(default=200, ge=2, le=10000)
+    min_replications: int = Field(default=10, ge=2)
+    batch_size: int = Field(default=16, ge=1)
+    confidence: float = Field(default=0.95, gt=0, lt=1)
+    target_ci_width: float | None = Field(default=None, gt=0)
+    workers: int = Field(default=1, ge=1, le=64)
+    antithetic_pairs: bool = False
+
+
+class MetricEstimate(BaseModel):
+    mean: float
+    ci_low: float
+    ci_high: float
+
+
+class AgentEnsembleSummary(BaseModel):
+    agent_name: str
+    final_balance: MetricEstimate
+    bankruptcy_probability: MetricEstimate
+    kpis: dict[str, MetricEstimate]
+    gap_to_leader: MetricEstimate
+
+
+class EnsembleResponse(BaseModel):
+    replications: int
+    simulated_runs: int
+    base_seed: int
+    stopped_early: bool
+    confidence: float
+    agents: list[AgentEnsembleSummary]
+    variance_reduction: dict[str, dict[str, float | None]]
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    tenant: str
+    status: str
+    rounds_completed: int
+    total_rounds: int
+    partial_results: list[AgentRoundResult]
+    error: str | None = None
+
+
+class StaffingRange(BaseModel):
+    start: int = Field(ge=1)
+    stop: int = Field(ge=1)
+    step: int = Field(default=1, ge=1)
+
+    def values(self) -> list[int]:
+        return list(range(self.start, self.stop + 1, self.step))
+
+
+class SweepRequest(SimulationRequest):
+    beds_range: StaffingRange
+    nurses_range: StaffingRange
+    doctors_range: StaffingRange
+    prune_bankrupt_round: int | None = Field(default=None, ge=1)
+    workers: int = Field(default=1, ge=1, le=64)
+    max_points: int = Field(default=2000, ge=1, le=20000)
+
+
+class SweepPoint(BaseModel):
+    beds: int
+    nurses: int
+    doctors: int
+    status: Literal["evaluated", "cached", "pruned_dominated", "pruned_bankrupt"]
+    quality_score: float | None = None
+    operating_cost: float | None = None
+    staffing_cost: float | None = None
+    total_cost: float | None = None
+    rounds_played: int = 0
+    dominated_by: dict[str, int] | None = None
+
+
+class SweepResponse(BaseModel):
+    evaluated: int
+    cached: int
+    pruned: int
+    points: list[SweepPoint]
+    pareto_frontier: list[SweepPoint]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from app.models.schemas import BatchSimulationRequest, SimulationRequest
+from app.services import worker_pool
+from app.services.lab_service import SurvivalLabService
+
+from instrumentation import metrics
+
+# Seeded shifts kept per memo while a chunk runs; rounds use seed + round_idx, so requests
+# with nearby seeds overlap and all of a chunk's shifts should stay resident.
+BATCH_MEMO_SEEDS = 512
+
+_worker_service: SurvivalLabService | None = None
+
+
+def run_requests(service: SurvivalLabService, requests: list[SimulationRequest]) -> tuple[list[dict], int, int]:
+    """Play ``requests`` in order with one shared memo per random-streams mode.
+
+    Returns the results plus how many shifts were simulated and how many were reused.
+    """
+    memos = {}
+    results = []
+    for request in requests:
+        memo = memos.get(request.random_streams)
+        if memo is None:
+            memo = memos[request.random_streams] = service._new_memo(request, max_seeds=BATCH_MEMO_SEEDS)
+        state = service.start_run(request, memo=memo)
+        round_results = list(service.iter_round_results(request, state))
+        results.append({**service.summary(request, state), "results": round_results})
+    return results, sum(m.misses for m in memos.values()), sum(m.hits for m in memos.values())
+
+
+def _run_chunk_in_worker(payloads: list[dict]) -> tuple[tuple[list[dict], int, int], dict]:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = SurvivalLabService(cache_size=0)
+    else:
+        # Workers outlive requests; pick up config changes like the parent service does.
+        _worker_service.refresh_config()
+    # This already runs on the shared pool, so each request plays its agents serially.
+    outcome = run_requests(_worker_service, [SimulationRequest(**{**payload, "agent_workers": 1}) for payload in payloads])
+    return outcome, metrics.drain()
+
+
+class BatchRunner:
+    """Runs many ``SimulationRequest``s in one call, computing shared work once.
+
+    Identical seeded requests are played once and answered from the service cache when
+    possible. The rest are sorted by random-streams mode and seed, then split into
+    contiguous chunks, one per worker on the shared process pool, with at most one worker
+    per CPU. Within a chunk every request shares a memo, so a (seed, round, staffing,
+    efficiency) shift is simulated once however many requests contain it. Requests with an
+    ``agent_policy`` run in this process as one more chunk, since workers only know the
+    config's policies, not those registered on this service.
+    """
+
+    def __init__(self, service: SurvivalLabService) -> None:
+        self.service = service
+
+    def run(self, batch: BatchSimulationRequest) -> dict:
+        self.service.refresh_config()
+        requests = batch.requests
+        for name in {request.agent_policy for request in requests if request.agent_policy is not None}:
+            self.service.policy(name)
+        keys = [self.service.cache.key(request, self.service.config_fingerprint) for request in requests]
+
+        results: dict[int, dict] = {}
+        first_index: dict[tuple[str, str], int] = {}
+        pending: list[int] = []
+        for index, key in enumerate(keys):
+            if key is not None:
+                if key in first_index:
+                    continue
+                first_index[key] = index
+            cached = self.service.cache.get(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        pending.sort(key=lambda i: (requests[i].random_streams, requests[i].seed is None, requests[i].seed or 0))
+        with_policy = [i for i in pending if requests[i].agent_policy is not None]
+        pending = [i for i in pending if requests[i].agent_policy is None]
+        workers = worker_pool.worker_count(batch.workers)
+        chunk_size = max(1, -(-len(pending) // workers))
+        chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        if workers > 1 and len(chunks) > 1:
+            payloads = [[requests[i].model_dump() for i in chunk] for chunk in chunks]
+            outcomes = []
+            for outcome, recorded in worker_pool.shared_pool().map(_run_chunk_in_worker, payloads):
+                metrics.merge(recorded)
+                outcomes.append(outcome)
+        else:
+            outcomes = [run_requests(self.service, [requests[i] for i in chunk]) for chunk in chunks]
+        if with_policy:
+            chunks.append(with_policy)
+            outcomes.append(run_requests(self.service, [requests[i] for i in with_policy]))
+
+        simulated = reused = 0
+        for chunk, (chunk_results, chunk_simulated, chunk_reused) in zip(chunks, outcomes):
+            simulated += chunk_simulated
+            reused += chunk_reused
+            for index, result in zip(chunk, chunk_results):
+                if self.service.run_store is not None:
+                    result = {**result, "run_id": self.service.run_store.record_run(requests[index], result)}
+                self.service.cache.put(keys[index], result)
+                results[index] = result
+
+        return {
+            "results": [results[first_index[key] if key is not None else index] for index, key in enumerate(keys)],
+            "unique_requests": len(results),
+            "shifts_simulated": simulated,
+            "shifts_reused": reused,
+        }
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import numpy as np
+
+JSON_MEDIA_TYPE = "application/vnd.hospital-lab.columnar+json"
+BINARY_MEDIA_TYPE = "application/vnd.hospital-lab.columnar"
+MAGIC = b"HLC1"
+
+# (column, dtype, source) where source is (section, key) in a round result row.
+COLUMNS = (
+    ("round", "<i4", (None, "round")),
+    ("payment", "<f8", (None, "payment")),
+    ("balance", "<f8", ("metrics", "balance")),
+    ("profit_margin", "<f8", ("metrics", "profit_margin")),
+    ("reputation_score", "<f8", ("metrics", "reputation_score")),
+    ("survival_time", "<f8", ("metrics", "survival_time")),
+    ("bankrupt", "u1", ("metrics", "bankrupt")),
+    ("total_cost", "<f8", ("cost_breakdown", "total_cost")),
+    ("door_to_doctor", "<f8", ("kpis", "door_to_doctor")),
+    ("length_of_stay", "<f8", ("kpis", "length_of_stay")),
+    ("throughput", "<f8", ("kpis", "throughput")),
+    ("error_rate", "<f8", ("kpis", "error_rate")),
+)
+
+
+def negotiate(format: str | None, accept: str | None) -> str:
+    """``"json"``, ``"columnar"`` or ``"binary"``; an explicit ``format`` query parameter wins over ``Accept``."""
+    if format is not None:
+        return format
+    accept = accept or ""
+    if JSON_MEDIA_TYPE in accept:
+        return "columnar"
+    if BINARY_MEDIA_TYPE in accept or "application/octet-stream" in accept:
+        return "binary"
+    return "json"
+
+
+def to_columns(result: dict) -> dict:
+    """One array per field instead of one object per (round, agent) row.
+
+    Agent names and decisions are dictionary-encoded: the ``agent`` and ``decision``
+    columns hold indexes into ``agents`` and ``decisions``. Decision logs are left out;
+    request the default JSON format for them.
+    """
+    rows = result["results"]
+    agents = [entry["agent_name"] for entry in result["leaderboard"]]
+    agent_index = {name: i for i, name in enumerate(agents)}
+    decisions: dict[str, int] = {}
+    columns = {
+        "agent": [agent_index[row["agent_name"]] for row in rows],
+        "decision": [decisions.setdefault(row["decision"], len(decisions)) for row in rows],
+    }
+    for name, _, (section, key) in COLUMNS:
+        columns[name] = [row[key] for row in rows] if section is None else [row[section][key] for row in rows]
+    return {
+        "rounds": result["rounds"],
+        "run_id": result.get("run_id"),
+        "leaderboard": result["leaderboard"],
+        "agents": agents,
+        "decisions": list(decisions),
+        "length": len(rows),
+        "columns": columns,
+    }
+
+
+def encode_json(result: dict) -> bytes:
+    return json.dumps(to_columns(result), separators=(",", ":")).encode()
+
+
+def encode_binary(result: dict) -> bytes:
+    """``MAGIC``, a little-endian uint32 header length, a JSON header, then the raw column arrays.
+
+    The header is ``to_columns`` without ``columns``, plus ``dtype`` and byte ``offset``
+    of every array. Arrays start on 8-byte boundaries so clients can map them as typed
+    arrays without copying.
+    """
+    table = to_columns(result)
+    columns = table.pop("columns")
+    dtypes = {"agent": "<i4", "decision": "<i4", **{name: dtype for name, dtype, _ in COLUMNS}}
+    arrays = [(name, np.asarray(values, dtype=dtypes[name]).tobytes()) for name, values in columns.items()]
+
+    def header_bytes(offset: int) -> bytes:
+        layout = []
+        for name, data in arrays:
+            layout.append({"name": name, "dtype": dtypes[name], "offset": offset})
+            offset += -(-len(data) // 8) * 8
+        return json.dumps({**table, "columns": layout}, separators=(",", ":")).encode()
+
+    # Offsets are relative to the end of the padded header, so its own length does not feed back.
+    header = header_bytes(0)
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+    parts = [MAGIC, struct.pack("<I", len(header)), header]
+    for _, data in arrays:
+        parts.append(data + b"\0" * (-len(data) % 8))
+    return b"".join(parts)
+
+
+def decode_binary(body: bytes) -> dict:
+    """Inverse of ``encode_binary``, giving the ``to_columns`` layout with numpy arrays."""
+    if body[:4] != MAGIC:
+        raise ValueError("not a columnar simulation payload")
+    (header_length,) = struct.unpack_from("<I", body, 4)
+    start = 8 + header_length
+    table = json.loads(body[8:start])
+    columns = {}
+    for column in table.pop("columns"):
+        dtype = np.dtype(column["dtype"])
+        columns[column["name"]] = np.frombuffer(body, dtype=dtype, count=table["length"], offset=start + column["offset"])
+    return {**table, "columns": columns}
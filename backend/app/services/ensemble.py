@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+import random
+from statistics import NormalDist, fmean, stdev, variance
+
+from app.models.schemas import EnsembleRequest, SimulationRequest
+from app.services import worker_pool
+from app.services.lab_service import KPI_FIELDS, SurvivalLabService
+
+from instrumentation import metrics
+
+ENSEMBLE_FIELDS = set(EnsembleRequest.model_fields) - set(SimulationRequest.model_fields)
+
+_worker_service: SurvivalLabService | None = None
+
+
+def replication_seeds(base_seed: int, count: int) -> list[int]:
+    # Drawn from one stream so the first n seeds do not depend on max_replications.
+    rng = random.Random(base_seed)
+    return [rng.getrandbits(31) for _ in range(count)]
+
+
+def summarize_replication(result: dict) -> dict[str, dict[str, float]]:
+    summary: dict[str, dict[str, float]] = {}
+    for entry in result["leaderboard"]:
+        rounds = [r["kpis"] for r in result["results"] if r["agent_name"] == entry["agent_name"]]
+        summary[entry["agent_name"]] = {
+            "final_balance": entry["balance"],
+            "bankruptcy_probability": float(entry["bankrupt"]),
+            **{kpi: fmean(k[kpi] for k in rounds) if rounds else 0.0 for kpi in KPI_FIELDS},
+        }
+    return summary
+
+
+def average_summaries(summaries: list[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    return {name: {metric: fmean(s[name][metric] for s in summaries) for metric in summaries[0][name]} for name in summaries[0]}
+
+
+def replication_payloads(payload: dict, antithetic_pairs: bool) -> list[dict]:
+    """The runs making up one replication: the request alone, or a common/antithetic pair."""
+    if not antithetic_pairs:
+        return [payload]
+    return [{**payload, "random_streams": "common"}, {**payload, "random_streams": "antithetic"}]
+
+
+def variance_reduction_factor(reduced_variance: float, baseline_variance: float) -> float | None:
+    """How many times more replications the baseline would need for the same CI width."""
+    if reduced_variance <= 0:
+        return None
+    return round(baseline_variance / reduced_variance, 3)
+
+
+def _run_replication(payload: dict, seed: int) -> tuple[dict[str, dict[str, float]], dict]:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = SurvivalLabService(cache_size=0)
+    else:
+        # Workers outlive requests; pick up config changes like the parent service does.
+        _worker_service.refresh_config()
+    # This already runs on the shared pool, so the replication plays its agents serially.
+    request = SimulationRequest(**{**payload, "agent_workers": 1}, seed=seed)
+    return summarize_replication(_worker_service.run_iteration(request, persist=False)), metrics.drain()
+
+
+class EnsembleRunner:
+    """Monte Carlo replications of ``run_iteration`` with CI-based early stopping.
+
+    With ``antithetic_pairs`` each replication is the mean of a common-streams run and its
+    antithetic mirror. Agent gaps to the leader are estimated from paired per-replication
+    differences, so randomness shared between agents (same seed, common streams) cancels.
+    The response reports both effects as variance reduction factors over independent runs.
+    """
+
+    def __init__(self, service: SurvivalLabService) -> None:
+        self.service = service
+
+    def run(self, request: EnsembleRequest) -> dict:
+        base_seed = request.seed if request.seed is not None else random.SystemRandom().getrandbits(31)
+        seeds = replication_seeds(base_seed, request.max_replications)
+        payloads = replication_payloads(request.model_dump(exclude=ENSEMBLE_FIELDS | {"seed"}), request.antithetic_pairs)
+        z = NormalDist().inv_cdf(0.5 + request.confidence / 2)
+
+        runs: list[dict[str, dict[str, float]]] = []
+        samples: list[dict[str, dict[str, float]]] = []
+        stopped_early = False
+        # Workers only know the config's policies, so policy runs stay in this process.
+        parallel = request.agent_policy is None and worker_pool.worker_count(request.workers) > 1
+        pool = worker_pool.shared_pool() if parallel else None
+        while len(samples) < len(seeds):
+            batch = [(payload, seed) for seed in seeds[len(samples) : len(samples) + request.batch_size] for payload in payloads]
+            if pool is not None:
+                batch_runs = []
+                for summary, recorded in pool.map(_run_replication, *zip(*batch)):
+                    metrics.merge(recorded)
+                    batch_runs.append(summary)
+            else:
+                batch_runs = [
+                    summarize_replication(self.service.run_iteration(SimulationRequest(**payload, seed=seed), persist=False))
+                    for payload, seed in batch
+                ]
+            runs.extend(batch_runs)
+            samples.extend(average_summaries(batch_runs[i : i + len(payloads)]) for i in range(0, len(batch_runs), len(payloads)))
+            if self._converged(samples, request, z):
+                stopped_early = len(samples) < len(seeds)
+                break
+
+        balances = {name: [s[name]["final_balance"] for s in samples] for name in request.agent_names}
+        leader = max(request.agent_names, key=lambda name: fmean(balances[name]))
+        agents = [
+            {
+                "agent_name": name,
+                "final_balance": self._estimate(balances[name], z),
+                "bankruptcy_probability": self._estimate([s[name]["bankruptcy_probability"] for s in samples], z),
+                "kpis": {kpi: self._estimate([s[name][kpi] for s in samples], z) for kpi in KPI_FIELDS},
+                "gap_to_leader": self._estimate([a - b for a, b in zip(balances[leader], balances[name])], z),
+            }
+            for name in request.agent_names
+        ]
+        return {
+            "replications": len(samples),
+            "simulated_runs": len(runs),
+            "base_seed": base_seed,
+            "stopped_early": stopped_early,
+            "confidence": request.confidence,
+            "agents": agents,
+            "variance_reduction": self._variance_reduction(request, runs, balances, leader),
+        }
+
+    @staticmethod
+    def _variance_reduction(
+        request: EnsembleRequest,
+        runs: list[dict[str, dict[str, float]]],
+        balances: dict[str, list[float]],
+        leader: str,
+    ) -> dict[str, dict[str, float | None]]:
+        """Final-balance variance reduction per agent, relative to independent replications.
+
+        ``antithetic``: variance of a pair mean vs half the variance of a single run.
+        ``common_random_numbers``: variance of the paired gap to the leader vs the sum of
+        both agents' variances, which is what independently seeded runs would give.
+        """
+        reduction: dict[str, dict[str, float | None]] = {}
+        if len(balances[leader]) < 2:
+            return reduction
+        if request.antithetic_pairs:
+            reduction["antithetic"] = {
+                name: variance_reduction_factor(variance(balances[name]), variance([r[name]["final_balance"] for r in runs]) / 2)
+                for name in request.agent_names
+            }
+        reduction["common_random_numbers"] = {
+            name: variance_reduction_factor(
+                variance([a - b for a, b in zip(balances[leader], balances[name])]),
+                variance(balances[leader]) + variance(balances[name]),
+            )
+            for name in request.agent_names
+            if name != leader
+        }
+        return reduction
+
+    @classmethod
+    def _converged(cls, samples: list[dict[str, dict[str, float]]], request: EnsembleRequest, z: float) -> bool:
+        if request.target_ci_width is None or len(samples) < request.min_replications:
+            return False
+        for name in request.agent_names:
+            for metric in ("final_balance", "bankruptcy_probability"):
+                estimate = cls._estimate([s[name][metric] for s in samples], z)
+                if estimate["ci_high"] - estimate["ci_low"] > request.target_ci_width:
+                    return False
+        return True
+
+    @staticmethod
+    def _estimate(values: list[float], z: float) -> dict[str, float]:
+        mean = fmean(values)
+        half_width = z * stdev(values) / math.sqrt(len(values)) if len(values) > 1 else 0.0
+        return {"mean": round(mean, 4), "ci_low": round(mean - half_width, 4), "ci_high": round(mean + half_width, 4)}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from app.models.schemas import SimulationRequest
+from app.services.lab_service import SurvivalLabService
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobLimitError(Exception):
+    """Raised when a tenant already has the maximum number of active jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised from the round hook to stop a job that was cancelled mid-run."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    tenant: str
+    request: SimulationRequest
+    status: str = "queued"
+    rounds_completed: int = 0
+    partial_results: list[dict] = field(default_factory=list)
+    result: dict | None = None
+    error: str | None = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+
+class JobManager:
+    """Runs simulations on a bounded worker pool separate from request-handling threads.
+
+    ``max_workers`` caps concurrent simulations across all tenants and
+    ``max_jobs_per_tenant`` caps queued + running jobs per tenant. Queued jobs wait in
+    per-tenant queues and a free worker takes the next job round-robin across tenants,
+    skipping tenants already running ``max_running_per_tenant`` jobs (by default one less
+    than ``max_workers``), so one tenant's sweep cannot hold every worker while others wait.
+    """
+
+    def __init__(
+        self,
+        service: SurvivalLabService,
+        max_workers: int = 2,
+        max_jobs_per_tenant: int = 4,
+        max_retained_jobs: int = 256,
+        max_running_per_tenant: int | None = None,
+    ):
+        if max_running_per_tenant is None:
+            max_running_per_tenant = max(1, max_workers - 1)
+        if not 1 <= max_running_per_tenant <= max_workers:
+            raise ValueError("max_running_per_tenant must be between 1 and max_workers")
+        self.service = service
+        self.max_workers = max_workers
+        self.max_jobs_per_tenant = max_jobs_per_tenant
+        self.max_running_per_tenant = max_running_per_tenant
+        self.max_retained_jobs = max_retained_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sim-job")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        # Tenants in round-robin order; a tenant moves to the back when one of its jobs starts.
+        self._queued: OrderedDict[str, deque[Job]] = OrderedDict()
+        self._running: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def submit(self, request: SimulationRequest, tenant: str = "default") -> Job:
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if job.tenant == tenant and job.status in ACTIVE_STATUSES)
+            if active >= self.max_jobs_per_tenant:
+                raise JobLimitError(f"tenant '{tenant}' already has {active} active jobs")
+            job = Job(job_id=uuid.uuid4().hex, tenant=tenant, request=request)
+            self._jobs[job.job_id] = job
+            self._queued.setdefault(tenant, deque()).append(job)
+            self._evict_finished()
+            self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Job:
+        return self._jobs[job_id]
+
+    def cancel(self, job_id: str) -> Job:
+        job = self._jobs[job_id]
+        job.cancel_event.set()
+        with self._lock:
+            if job.status == "queued":
+                job.status = "cancelled"
+        return job
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """Wait for outstanding jobs, or cancel them all first when ``cancel`` is set."""
+        if cancel:
+            for job_id in list(self._jobs):
+                self.cancel(job_id)
+        with self._idle:
+            self._dispatch()  # drops jobs cancelled while queued
+            self._idle.wait_for(lambda: not self._running and not self._queued)
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        """Start queued jobs on free workers, round-robin across tenants. Called with ``_lock`` held."""
+        while sum(self._running.values()) < self.max_workers:
+            job = self._next_job()
+            if job is None:
+                break
+            job.status = "running"
+            self._running[job.tenant] = self._running.get(job.tenant, 0) + 1
+            self._executor.submit(self._run, job)
+        self._idle.notify_all()
+
+    def _next_job(self) -> Job | None:
+        for tenant in list(self._queued):
+            queue = self._queued[tenant]
+            while queue and queue[0].status != "queued":
+                queue.popleft()  # cancelled while waiting
+            if not queue:
+                del self._queued[tenant]
+                continue
+            if self._running.get(tenant, 0) >= self.max_running_per_tenant:
+                continue
+            self._queued.move_to_end(tenant)
+            return queue.popleft()
+        return None
+
+    def _run(self, job: Job) -> None:
+        def on_round(round_idx: int, results: list[dict]) -> None:
+            job.partial_results.extend(results)
+            job.rounds_completed = round_idx
+            if job.cancel_event.is_set():
+                raise JobCancelled
+
+        try:
+            job.result = self.service.run_iteration(job.request, on_round=on_round)
+            job.status = "completed"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as exc:  # surfaced through the status endpoint
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.status = "failed"
+        finally:
+            with self._lock:
+                self._running[job.tenant] -= 1
+                if not self._running[job.tenant]:
+                    del self._running[job.tenant]
+                self._dispatch()
+
+    def _evict_finished(self) -> None:
+        overflow = len(self._jobs) - self.max_retained_jobs
+        for job_id in [j.job_id for j in self._jobs.values() if j.status not in ACTIVE_STATUSES][: max(0, overflow)]:
+            del self._jobs[job_id]
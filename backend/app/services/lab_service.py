@@ -1,98 +1,751 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import random
 import sys
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import Callable, Iterator
 
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+import numpy as np
+
+from agents.base_agent import AgentDecision, HospitalAIAgent
 from agents.example_agent import TriageOptimizerAgent
+from agents.policy import AgentPolicy, HttpAgentPolicy, PolicyDecision, collect_decisions, decision_request
 from economic_engine.engine import EconomicEngine
+from economic_engine.ledger import EconomicLedger
+from economic_engine.models import AgentEconomics
+from instrumentation import metrics
+from simulation.analytic import QueueingEstimator
 from simulation.engine import ERSimulationEngine
 from simulation.entities import Resources
+from simulation.memo import SimulationMemo
 
 from app.models.schemas import SimulationRequest
-from app.services.config_loader import load_config
+from app.services import worker_pool
+from app.services.config_loader import config_fingerprint, config_version, load_config
+from app.services.result_cache import ResultCache
+from app.services.run_store import RunStore
+
+KPI_FIELDS = ("door_to_doctor", "length_of_stay", "throughput", "error_rate")
+
+# Both ledgers play a round as decide, charge, simulate, reward.
+_ROUND_PHASES = metrics.phases("service_phase_seconds", "phase", ("decision", "economics_charge", "simulation", "economics_reward"))
+_RESULT_BUILDING = metrics.phases("service_phase_seconds", "phase", ("result_building",))
+_POLICY_TIMER = metrics.summary("service_phase_seconds", phase="policy")
+_ECONOMICS_OPERATIONS = {
+    operation: metrics.counter("economics_operations_total", operation=operation)
+    for operation in ("charge_usage", "apply_burn_rate", "reward", "invest_in_upgrade")
+}
+_INVESTMENTS = metrics.counter("economics_investments_total")
+
+
+def _new_stream_seed() -> int:
+    return random.SystemRandom().getrandbits(63)
+
+
+def _shift_seed(stream_seed: int, round_idx: int, agent_name: str) -> int:
+    # A pure function of its inputs, so it does not depend on which agents ran before or where.
+    digest = hashlib.blake2b(f"{stream_seed}:{round_idx}:{agent_name}".encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big")
+
+
+@dataclass
+class RunState:
+    agents: dict[str, HospitalAIAgent]
+    economics: dict[str, AgentEconomics]
+    memo: SimulationMemo = field(repr=False)
+    rounds_completed: int = 0
+    ledger: EconomicLedger | None = field(default=None, repr=False)
+    # Unseeded runs derive every shift seed from this, so checkpoints and workers can replay them.
+    stream_seed: int | None = None
+
+
+@dataclass
+class RunSnapshot:
+    """JSON-serializable copy of a ``RunState`` after ``rounds_completed`` rounds.
+
+    Decision logs are append-only, so a snapshot may hold only each agent's entries from
+    ``log_start`` on; ``full_log`` marks snapshots that hold every entry.
+    """
+
+    rounds_completed: int
+    agents: list[dict]
+    economics: list[dict]
+    stream_seed: int | None = None
+    full_log: bool = True
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_chain(cls, chain: list[dict]) -> RunSnapshot:
+        """Rebuild a full snapshot from checkpoints newest first, back to a ``full_log`` one."""
+        snapshot = cls(**chain[0])
+        logs = {data["name"]: data["decision_log"] for data in snapshot.agents}
+        for older in chain[1:]:
+            for data in older["agents"]:
+                logs[data["name"]] = data["decision_log"] + logs[data["name"]]
+        snapshot.agents = [{**data, "decision_log": logs[data["name"]], "log_start": 0} for data in snapshot.agents]
+        snapshot.full_log = True
+        return snapshot
+
+
+_worker_service: SurvivalLabService | None = None
+_worker_memos: dict[str, SimulationMemo] = {}
+
+
+def _advance_agents_in_worker(
+    request: SimulationRequest,
+    round_idx: int,
+    stream_seed: int | None,
+    agents: list[tuple[HospitalAIAgent, AgentEconomics]],
+) -> tuple[list[tuple[HospitalAIAgent, AgentEconomics, AgentDecision, float, dict]], dict]:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = SurvivalLabService(cache_size=0)
+    elif _worker_service.refresh_config():
+        # Workers outlive runs, so shifts memoized under an older config must go.
+        _worker_memos.clear()
+    memo = _worker_memos.get(request.random_streams)
+    if memo is None:
+        memo = _worker_memos[request.random_streams] = _worker_service._new_memo(request)
+    state = RunState(agents={}, economics={}, memo=memo, stream_seed=stream_seed)
+    advanced = []
+    for agent, economics in agents:
+        decision, payment, kpis = _worker_service._advance_agent(request, round_idx, agent, economics, state)
+        advanced.append((agent, economics, decision, payment, kpis))
+    return advanced, metrics.drain()
 
 
 class SurvivalLabService:
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = 128, run_store: RunStore | None = None, checkpoint_every: int = 10) -> None:
+        self.cache = ResultCache(max_entries=cache_size)
+        self.run_store = run_store
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be at least 1, got {checkpoint_every}")
+        self.checkpoint_every = checkpoint_every
+        self._policies: dict[str, tuple[AgentPolicy, float]] = {}
+        self._load_config()
+
+    def _load_config(self) -> None:
+        self.config_version = config_version()
         self.config = load_config()
+        self.config_fingerprint = config_fingerprint(self.config)
         self.econ_engine = EconomicEngine(self.config)
+        self._estimator: QueueingEstimator | None = None
+        self._config_policies: dict[str, tuple[AgentPolicy, float]] = {}
+
+    @property
+    def estimator(self) -> QueueingEstimator:
+        """Serves ``mode="estimate"``, calibrated on first use.
+
+        Calibration uses fixed seeds, so every process that builds one fits the same factors.
+        """
+        if self._estimator is None:
+            sim_cfg = self.config["simulation"]
+            estimator = QueueingEstimator(sim_cfg["shift_hours"], sim_cfg["patients_per_hour"], sim_cfg["event_probabilities"])
+            estimator.calibrate()
+            self._estimator = estimator
+        return self._estimator
+
+    def register_policy(self, name: str, policy: AgentPolicy, deadline_seconds: float = 2.0) -> None:
+        """Make ``policy`` available to requests with ``agent_policy=name``; each round waits at most ``deadline_seconds``."""
+        self._policies[name] = (policy, deadline_seconds)
+
+    def policy(self, name: str) -> tuple[AgentPolicy, float]:
+        """A registered policy, or an ``HttpAgentPolicy`` built from the config's ``agent_policies`` entry.
+
+        Config policies are built once per config, so their HTTP connections are reused across runs.
+        """
+        if name in self._policies:
+            return self._policies[name]
+        if name not in self._config_policies:
+            entry = self.config.get("agent_policies", {}).get(name)
+            if entry is None:
+                raise ValueError(f"unknown agent policy: {name}")
+            timeout = entry.get("timeout_seconds", 1.0)
+            policy = HttpAgentPolicy(entry["url"], timeout_seconds=timeout, batch=entry.get("batch", True))
+            self._config_policies[name] = (policy, entry.get("deadline_seconds", 2 * timeout))
+        return self._config_policies[name]
+
+    def refresh_config(self) -> bool:
+        """Reload the config file if it changed on disk; cached results for the old config are dropped."""
+        if config_version() == self.config_version:
+            return False
+        self._load_config()
+        self.cache.clear()
+        return True
+
+    def run_iteration(
+        self,
+        request: SimulationRequest,
+        on_round: Callable[[int, list[dict]], None] | None = None,
+        persist: bool = True,
+    ) -> dict:
+        """Play every round; ``on_round(round_idx, results)`` is called as each round completes.
+
+        Seeded requests are served from ``self.cache`` when possible; ``on_round`` is then
+        replayed from the cached results. With a ``run_store`` and ``persist`` set, each
+        round is written to the store with a checkpoint as it completes and the response
+        carries its ``run_id``. Runs with ``persist`` unset (ensemble replications) neither
+        read nor fill the cache, so they cannot evict interactive results or answer a later
+        request with a result that was never stored.
+        """
+        started = time.perf_counter()
+        self.refresh_config()
+        cache_key = None
+        if persist:
+            cache_key = self.cache.key(request, self.config_fingerprint)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # A cached seeded result is already stored under its original run_id.
+                metrics.inc("service_cache_lookups_total", outcome="hit")
+                if on_round is not None:
+                    for round_idx in range(1, request.rounds + 1):
+                        on_round(round_idx, [r for r in cached["results"] if r["round"] == round_idx])
+                return cached
+        metrics.inc("service_cache_lookups_total", outcome="miss" if cache_key is not None else "bypass")
+
+        state = self.start_run(request)
+        if self.run_store is not None and persist:
+            run_id = self.run_store.begin_run(request, self.snapshot(state).to_dict(), config_fingerprint=self.config_fingerprint)
+        else:
+            run_id = None
+        result = self._play(request, state, on_round, run_id)
+        self.cache.put(cache_key, result)
+        metrics.observe("service_run_iteration_seconds", time.perf_counter() - started)
+        return result
+
+    def resume(self, run_id: str) -> dict:
+        """Finish a stored run from its latest checkpoint; only the remaining rounds are played."""
+        store = self._require_store()
+        payload, chain = store.checkpoint(run_id)
+        request = SimulationRequest(**payload)
+        snapshot = RunSnapshot.from_chain(chain)
+        if snapshot.rounds_completed >= request.rounds:
+            raise ValueError(f"run {run_id} already completed all {request.rounds} rounds")
+        store.mark_running(run_id)
+        return self._play(request, self.restore(snapshot, request), None, run_id)
+
+    def fork(self, run_id: str, from_round: int, overrides: dict | None = None) -> dict:
+        """Branch a stored run after ``from_round`` with ``overrides`` applied to its request.
+
+        The fork is recorded as a new run holding only the rounds after the fork point; with
+        no overrides those rounds reproduce the original run exactly. Rounds after the nearest
+        checkpoint are replayed to reach the fork point, which is refused with ``ValueError``
+        when the replay could differ from the original: for runs with an ``agent_policy``,
+        whose answers are not recorded, and for runs played under a different config.
+        """
+        store = self._require_store()
+        payload, chain = store.checkpoint(run_id, from_round)
+        original = SimulationRequest(**payload)
+        if from_round > original.rounds:
+            raise KeyError(f"{run_id} round {from_round}")
+        request = SimulationRequest(**{**payload, **(overrides or {})})
+        if request.agent_names != original.agent_names:
+            raise ValueError("a fork keeps the original agents; agent_names cannot be overridden")
+        if request.rounds <= from_round:
+            raise ValueError(f"rounds must exceed the fork round {from_round}")
+        self.refresh_config()
+        snapshot = RunSnapshot.from_chain(chain)
+        if snapshot.rounds_completed < from_round:
+            # Without a policy, rounds are a pure function of the state, the config and the
+            # seed (or stored stream seed), so replaying the original request reaches the fork
+            # point exactly.
+            if original.agent_policy is not None:
+                raise ValueError(f"run {run_id} has no checkpoint at round {from_round}, and its policy answers cannot be replayed")
+            if store.config_fingerprint(run_id) != self.config_fingerprint:
+                raise ValueError(f"run {run_id} has no checkpoint at round {from_round}, and the config changed since it was played")
+        state = self.restore(snapshot, original)
+        for _ in self.iter_round_results(original.model_copy(update={"rounds": from_round}), state):
+            pass
+        state.memo = self._new_memo(request)
+        fork_id = store.begin_run(
+            request, self.snapshot(state).to_dict(), parent_run_id=run_id, fork_round=from_round, config_fingerprint=self.config_fingerprint
+        )
+        return self._play(request, state, None, fork_id)
+
+    def _require_store(self) -> RunStore:
+        if self.run_store is None:
+            raise RuntimeError("this service has no run store")
+        return self.run_store
+
+    def _play(
+        self,
+        request: SimulationRequest,
+        state: RunState,
+        on_round: Callable[[int, list[dict]], None] | None,
+        run_id: str | None,
+    ) -> dict:
+        """Play the remaining rounds of ``state``, recording them and a checkpoint under ``run_id`` if set.
+
+        Rounds are stored as they complete only when ``on_round`` is watching; otherwise
+        nobody can see the run before it returns, so they are written once at the end.
+        """
+        round_results = list(self._iter_recorded(request, state, on_round, run_id, live=on_round is not None))
+        summary = self.summary(request, state)
+        return {**summary, "results": round_results} if run_id is None else {**summary, "results": round_results, "run_id": run_id}
+
+    def _iter_recorded(
+        self,
+        request: SimulationRequest,
+        state: RunState,
+        on_round: Callable[[int, list[dict]], None] | None,
+        run_id: str | None,
+        live: bool = False,
+    ) -> Iterator[dict]:
+        """``iter_round_results`` that also stores the rounds, then finishes or aborts the run.
+
+        A checkpoint is written every ``checkpoint_every`` rounds (every round for runs with
+        an ``agent_policy``) and when the run ends, together with the rounds buffered since
+        the last write. With ``live`` set, for runs whose stored history may be read while
+        they play, every round is written as it completes. An aborted run keeps what was written and resumes from its latest
+        checkpoint, replaying the rounds after it.
+        """
+        if run_id is None:
+            yield from self.iter_round_results(request, state, on_round=on_round)
+            return
+
+        store = self.run_store
+        # Each checkpoint only carries the decisions logged since the previous one.
+        logged = {name: len(agent.decision_log) for name, agent in state.agents.items()}
+        checkpointed = state.rounds_completed
+        pending: list[dict] = []
+
+        def checkpoint() -> dict:
+            nonlocal checkpointed
+            snapshot = self.snapshot(state, log_from=logged).to_dict()
+            for name, agent in state.agents.items():
+                logged[name] = len(agent.decision_log)
+            checkpointed = state.rounds_completed
+            return snapshot
+
+        # Policy answers are not recorded, so a fork can only start from a checkpoint.
+        every = 1 if request.agent_policy is not None else self.checkpoint_every
+
+        def record_round(round_idx: int, results: list[dict]) -> None:
+            pending.extend(results)
+            if round_idx - checkpointed >= every:
+                store.append_round(run_id, pending, checkpoint())
+                pending.clear()
+            elif live:
+                store.append_round(run_id, pending)
+                pending.clear()
+            if on_round is not None:
+                on_round(round_idx, results)
+
+        try:
+            yield from self.iter_round_results(request, state, on_round=record_round)
+        except BaseException:
+            store.finish_run(run_id, None, status="aborted")
+            raise
+        final = checkpoint() if state.rounds_completed > checkpointed else None
+        store.finish_run(run_id, self.leaderboard(state), results=pending, checkpoint=final)
 
-    def run_iteration(self, request: SimulationRequest) -> dict:
-        round_results: list[dict] = []
-        econ_by_agent = {name: self.econ_engine.initialize_agent(name) for name in request.agent_names}
-        agents = {name: TriageOptimizerAgent(name=name) for name in request.agent_names}
+    @staticmethod
+    def snapshot(state: RunState, log_from: dict[str, int] | None = None) -> RunSnapshot:
+        """Copy ``state``; with ``log_from`` each agent's decision log starts at that index."""
+        log_from = log_from or {}
+        agents = []
+        for name, agent in state.agents.items():
+            start = log_from.get(name, 0)
+            agents.append(
+                {
+                    **agent.__dict__,
+                    "decision_log": [[d.action, d.reason, d.expected_roi] for d in agent.decision_log[start:]],
+                    "log_start": start,
+                }
+            )
+        return RunSnapshot(
+            rounds_completed=state.rounds_completed,
+            agents=agents,
+            economics=[{**e.__dict__, "roi_history": list(e.roi_history)} for e in state.economics.values()],
+            stream_seed=state.stream_seed,
+            full_log=not any(data["log_start"] for data in agents),
+        )
+
+    def restore(self, snapshot: RunSnapshot, request: SimulationRequest) -> RunState:
+        if not snapshot.full_log:
+            raise ValueError("restore needs a snapshot with full decision logs")
+        agents = {}
+        for data in snapshot.agents:
+            agent = TriageOptimizerAgent(name=data["name"])
+            agent.skill_level = data["skill_level"]
+            agent.reputation = data["reputation"]
+            agent.subcontracting_enabled = data["subcontracting_enabled"]
+            agent.decision_log = [AgentDecision(*entry) for entry in data["decision_log"]]
+            agents[agent.name] = agent
+        return RunState(
+            agents=agents,
+            economics={data["name"]: AgentEconomics(**data) for data in snapshot.economics},
+            memo=self._new_memo(request),
+            rounds_completed=snapshot.rounds_completed,
+            stream_seed=snapshot.stream_seed if snapshot.stream_seed is not None else _new_stream_seed(),
+        )
+
+    def stream_iteration(self, request: SimulationRequest) -> Iterator[dict]:
+        """Frames of a ``round_result`` per agent per round, then one ``leaderboard``.
 
+        The request is validated here, before the first frame, so a bad request raises
+        ``ValueError`` instead of breaking a stream that has already started. With a
+        ``run_store`` the run is recorded like ``run_iteration`` and a ``run`` frame
+        carrying its ``run_id`` comes first, so clients can follow its stored history.
+        """
+        self.refresh_config()
+        state = self.start_run(request)
+        return self._stream_frames(request, state)
+
+    def _stream_frames(self, request: SimulationRequest, state: RunState) -> Iterator[dict]:
+        if self.run_store is not None:
+            run_id = self.run_store.begin_run(request, self.snapshot(state).to_dict(), config_fingerprint=self.config_fingerprint)
+        else:
+            run_id = None
+        if run_id is not None:
+            yield {"type": "run", "data": {"run_id": run_id}}
+        for result in self._iter_recorded(request, state, None, run_id, live=True):
+            yield {"type": "round_result", "data": result}
+        yield {"type": "leaderboard", "data": self.summary(request, state)}
+
+    def start_run(self, request: SimulationRequest, memo: SimulationMemo | None = None) -> RunState:
+        """Fresh state for ``request``; pass ``memo`` to share simulated shifts with other runs."""
+        if request.agent_policy is not None:
+            self.policy(request.agent_policy)
+        return RunState(
+            agents={name: TriageOptimizerAgent(name=name) for name in request.agent_names},
+            economics={name: self.econ_engine.initialize_agent(name) for name in request.agent_names},
+            memo=memo if memo is not None else self._new_memo(request),
+            stream_seed=_new_stream_seed() if request.seed is None else None,
+        )
+
+    def _new_memo(self, request: SimulationRequest, max_seeds: int = 4) -> SimulationMemo:
         sim_cfg = self.config["simulation"]
+        return SimulationMemo(
+            sim_cfg["shift_hours"],
+            sim_cfg["patients_per_hour"],
+            sim_cfg["event_probabilities"],
+            max_seeds=max_seeds,
+            random_streams=request.random_streams,
+        )
+
+    def iter_round_results(
+        self,
+        request: SimulationRequest,
+        state: RunState,
+        on_round: Callable[[int, list[dict]], None] | None = None,
+    ) -> Iterator[dict]:
+        """Yield each agent's round result as soon as it is computed, advancing ``state``.
+
+        ``request.agent_workers > 1`` splits each round's agents into that many chunks, at most
+        one per CPU, on the process pool shared by all runs; the columnar ledger only applies
+        to serial runs. Runs with an ``agent_policy`` take their decisions from it and play the
+        rest of the round serially.
+        """
+        workers = worker_pool.worker_count(request.agent_workers)
+        if request.agent_policy is not None:
+            policy, deadline = self.policy(request.agent_policy)
+            play_round = partial(self._play_round_with_policy, policy=policy, deadline_seconds=deadline)
+        elif workers > 1:
+            play_round = partial(self._play_round_parallel, pool=worker_pool.shared_pool(), workers=workers)
+        elif request.ledger == "columnar":
+            play_round = self._play_round_columnar
+        else:
+            play_round = self._play_round
+        counting = metrics.enabled()
+        funded = self._investments(state) if counting else 0
+        for round_idx in range(state.rounds_completed + 1, request.rounds + 1):
+            round_results: list[dict] = []
+            for result in play_round(request, round_idx, state):
+                round_results.append(result)
+                yield result
+
+            state.rounds_completed = round_idx
+            if counting:
+                funded = self._count_economics(round_results, state, funded)
+            if on_round is not None:
+                on_round(round_idx, round_results)
+
+    @staticmethod
+    def _investments(state: RunState) -> int:
+        # Every funded upgrade appends to roi_history, whichever way the round was played.
+        return sum(len(economics.roi_history) for economics in state.economics.values())
+
+    def _count_economics(self, round_results: list[dict], state: RunState, funded_before: int) -> int:
+        """Count a round's economic operations in one update per series; returns the new funded total."""
+        played = len(round_results)
+        for operation in ("charge_usage", "apply_burn_rate", "reward"):
+            _ECONOMICS_OPERATIONS[operation].inc(played)
+        _ECONOMICS_OPERATIONS["invest_in_upgrade"].inc(sum(1 for r in round_results if r["decision"] == "invest"))
+        funded = self._investments(state)
+        _INVESTMENTS.inc(funded - funded_before)
+        return funded
+
+    def _play_round(self, request: SimulationRequest, round_idx: int, state: RunState) -> Iterator[dict]:
+        for name in request.agent_names:
+            if state.economics[name].bankrupt:
+                continue
+            yield self._play_agent_round(request, round_idx, state.agents[name], state.economics[name], state)
+
+    def _play_round_with_policy(
+        self,
+        request: SimulationRequest,
+        round_idx: int,
+        state: RunState,
+        policy: AgentPolicy,
+        deadline_seconds: float,
+    ) -> Iterator[dict]:
+        """Same round as ``_play_round`` with every live agent's choices requested from ``policy`` at once.
+
+        The round waits for the slowest answer or the deadline, whichever comes first; agents
+        without an answer use their own heuristics.
+        """
+        live = [name for name in request.agent_names if not state.economics[name].bankrupt]
+        requests = [
+            decision_request(
+                state.agents[name],
+                round_idx,
+                state.economics[name].balance,
+                state.economics[name].burn_rate,
+                request.beds,
+                request.nurses,
+                request.doctors,
+            )
+            for name in live
+        ]
+        with _POLICY_TIMER.time():
+            choices = collect_decisions(policy, requests, deadline_seconds)
+        fallbacks = sum(1 for name in live if name not in choices)
+        if fallbacks:
+            metrics.inc("agent_policy_fallbacks_total", fallbacks)
+        for name in live:
+            yield self._play_agent_round(request, round_idx, state.agents[name], state.economics[name], state, choices.get(name))
+
+    def _play_round_parallel(self, request: SimulationRequest, round_idx: int, state: RunState, pool: Executor, workers: int) -> Iterator[dict]:
+        """Same round as ``_play_round`` with the live agents split into ``workers`` contiguous chunks on ``pool``.
+
+        Each agent's round only touches its own agent and economics, and unseeded shift seeds
+        depend only on (stream seed, round, agent), so results merged back in agent order
+        are identical to the serial loop. Phase timings and counters recorded by the workers
+        come back with their results and are added to this process's metrics.
+        """
+        live = [name for name in request.agent_names if not state.economics[name].bankrupt]
+        chunk_size = max(1, -(-len(live) // workers))
+        chunks = [live[i : i + chunk_size] for i in range(0, len(live), chunk_size)]
+        futures = []
+        for chunk in chunks:
+            # Workers get the agent without its decision log, which only grows and is merged back here.
+            shells = []
+            for name in chunk:
+                shell = copy.copy(state.agents[name])
+                shell.decision_log = []
+                shells.append((shell, state.economics[name]))
+            futures.append(pool.submit(_advance_agents_in_worker, request, round_idx, state.stream_seed, shells))
+
+        try:
+            for chunk, future in zip(chunks, futures):
+                advanced, recorded = future.result()
+                metrics.merge(recorded)
+                for name, (agent, economics, decision, payment, kpis) in zip(chunk, advanced):
+                    agent.decision_log = state.agents[name].decision_log
+                    agent.decision_log.append(decision)
+                    state.agents[name] = agent
+                    state.economics[name] = economics
+                    started = time.perf_counter()
+                    result = self._round_result(request, round_idx, agent, decision, payment, kpis, economics)
+                    if metrics.enabled():
+                        _RESULT_BUILDING.record(started, time.perf_counter())
+                    yield result
+        finally:
+            # The pool outlives this run; an abandoned round should not keep it busy.
+            for future in futures:
+                future.cancel()
 
-        for round_idx in range(1, request.rounds + 1):
-            for name in request.agent_names:
-                agent = agents[name]
-                economics = econ_by_agent[name]
-                if economics.bankrupt:
-                    continue
-
-                decision = agent.decide(balance=economics.balance, burn_rate=economics.burn_rate)
-                if decision.action == "invest" and self.econ_engine.invest_in_upgrade(economics, decision.expected_roi):
-                    agent.skill_level += self.config["investment"]["efficiency_gain"]
-
-                self.econ_engine.charge_usage(
-                    economics,
-                    tokens=request.tokens_used,
-                    api_calls=request.api_calls,
-                    simulation_runs=request.simulation_runs,
-                )
-                self.econ_engine.apply_burn_rate(economics, hours=sim_cfg["shift_hours"])
-
-                staffing = agent.allocate_staff(request.beds, request.nurses, request.doctors)
-                sim_engine = ERSimulationEngine(
-                    shift_hours=sim_cfg["shift_hours"],
-                    patients_per_hour=sim_cfg["patients_per_hour"],
-                    event_probabilities=sim_cfg["event_probabilities"],
-                    seed=(request.seed + round_idx if request.seed is not None else None),
-                )
-                triage_efficiency = agent.optimize_triage()
-                workflow_efficiency = agent.redesign_workflow()
-
-                sim_result = sim_engine.run(
-                    resources=Resources(**staffing),
-                    triage_efficiency=triage_efficiency,
-                    workflow_efficiency=workflow_efficiency,
-                )
-                kpis = sim_engine.result_to_dict(sim_result)
-                quality_score = self.econ_engine.quality_score_from_kpis(kpis)
-                payment = self.econ_engine.reward(economics, quality_score, self.config["impact_factor"])
-
-                round_results.append(
-                    {
-                        "round": round_idx,
-                        "agent_name": name,
-                        "decision": decision.action,
-                        "payment": round(payment, 3),
-                        "kpis": kpis,
-                        "metrics": {
-                            "balance": round(economics.balance, 3),
-                            "burn_rate": economics.burn_rate,
-                            "profit_margin": round(economics.profit_margin, 3),
-                            "survival_time": economics.survival_time_hours,
-                            "reputation_score": round(economics.reputation_score, 2),
-                            "bankrupt": economics.bankrupt,
-                        },
-                        "cost_breakdown": {
-                            "token_spend": round(economics.token_spend, 3),
-                            "api_spend": round(economics.api_spend, 3),
-                            "simulation_spend": round(economics.simulation_spend, 3),
-                            "total_cost": round(economics.total_cost, 3),
-                            "rewards_earned": round(economics.rewards_earned, 3),
-                        },
-                        "decision_logs": [d.__dict__ for d in agent.decision_log],
-                    }
-                )
-
-        leaderboard = sorted(
+    def _play_agent_round(
+        self,
+        request: SimulationRequest,
+        round_idx: int,
+        agent: HospitalAIAgent,
+        economics: AgentEconomics,
+        state: RunState,
+        choice: PolicyDecision | None = None,
+    ) -> dict:
+        decision, payment, kpis = self._advance_agent(request, round_idx, agent, economics, state, choice)
+        started = time.perf_counter()
+        result = self._round_result(request, round_idx, agent, decision, payment, kpis, economics)
+        if metrics.enabled():
+            _RESULT_BUILDING.record(started, time.perf_counter())
+        return result
+
+    def _advance_agent(
+        self,
+        request: SimulationRequest,
+        round_idx: int,
+        agent: HospitalAIAgent,
+        economics: AgentEconomics,
+        state: RunState,
+        choice: PolicyDecision | None = None,
+    ) -> tuple[AgentDecision, float, dict]:
+        """Decide, charge, simulate and reward one agent, updating ``agent`` and ``economics`` in place.
+
+        A policy's ``choice`` replaces the agent's own decision and any staffing or
+        efficiencies it sets.
+        """
+        started = time.perf_counter()
+        if choice is None:
+            decision = agent.decide(balance=economics.balance, burn_rate=economics.burn_rate)
+        else:
+            decision = choice.decision
+            agent.decision_log.append(decision)
+
+        decided = time.perf_counter()
+        if decision.action == "invest" and self.econ_engine.invest_in_upgrade(economics, decision.expected_roi):
+            agent.skill_level += self.config["investment"]["efficiency_gain"]
+
+        self.econ_engine.charge_usage(
+            economics,
+            tokens=request.tokens_used,
+            api_calls=request.api_calls,
+            simulation_runs=request.simulation_runs,
+        )
+        self.econ_engine.apply_burn_rate(economics, hours=self.config["simulation"]["shift_hours"])
+
+        charged = time.perf_counter()
+        kpis = self._simulate(request, round_idx, agent, state, choice)
+
+        simulated = time.perf_counter()
+        quality_score = self.econ_engine.quality_score_from_kpis(kpis)
+        payment = self.econ_engine.reward(economics, quality_score, self.config["impact_factor"])
+        if metrics.enabled():
+            _ROUND_PHASES.record(started, decided, charged, simulated, time.perf_counter())
+        return decision, payment, kpis
+
+    def _play_round_columnar(self, request: SimulationRequest, round_idx: int, state: RunState) -> Iterator[dict]:
+        """Same round as ``_play_round`` with every ledger update applied to all live agents at once."""
+        if state.ledger is None:
+            state.ledger = EconomicLedger.from_economics(self.config, list(state.economics.values()))
+        ledger = state.ledger
+        live = ~ledger.bankrupt
+        indices = np.flatnonzero(live)
+        agents = [state.agents[ledger.names[i]] for i in indices]
+
+        started = time.perf_counter()
+        decisions = [agent.decide(balance=float(ledger.balance[i]), burn_rate=float(ledger.burn_rate[i])) for agent, i in zip(agents, indices)]
+
+        decided = time.perf_counter()
+        investing = np.zeros(len(ledger), dtype=bool)
+        expected_roi = np.zeros(len(ledger))
+        for i, decision in zip(indices, decisions):
+            investing[i] = decision.action == "invest"
+            expected_roi[i] = decision.expected_roi
+        for i in np.flatnonzero(ledger.invest_in_upgrade(investing, expected_roi)):
+            state.agents[ledger.names[i]].skill_level += self.config["investment"]["efficiency_gain"]
+
+        ledger.charge_usage(live, tokens=request.tokens_used, api_calls=request.api_calls, simulation_runs=request.simulation_runs)
+        ledger.apply_burn_rate(live, hours=self.config["simulation"]["shift_hours"])
+
+        charged = time.perf_counter()
+        kpis = [self._simulate(request, round_idx, agent, state) for agent in agents]
+
+        simulated = time.perf_counter()
+        quality_scores = np.zeros(len(ledger))
+        quality_scores[live] = ledger.quality_scores(*(np.array([k[name] for k in kpis]) for name in KPI_FIELDS))
+        payments = ledger.reward(live, quality_scores, self.config["impact_factor"])
+        if metrics.enabled():
+            _ROUND_PHASES.record(started, decided, charged, simulated, time.perf_counter())
+
+        for agent, economics, decision, agent_kpis, payment in zip(agents, ledger.to_economics(indices), decisions, kpis, payments.tolist()):
+            state.economics[agent.name] = economics
+            yield self._round_result(request, round_idx, agent, decision, payment, agent_kpis, economics)
+
+    def _simulate(
+        self,
+        request: SimulationRequest,
+        round_idx: int,
+        agent: HospitalAIAgent,
+        state: RunState,
+        choice: PolicyDecision | None = None,
+    ) -> dict:
+        staffing = agent.allocate_staff(request.beds, request.nurses, request.doctors)
+        triage_efficiency = agent.optimize_triage()
+        workflow_efficiency = agent.redesign_workflow()
+        if choice is not None:
+            staffing = choice.staffing or staffing
+            triage_efficiency = choice.triage_efficiency or triage_efficiency
+            workflow_efficiency = choice.workflow_efficiency or workflow_efficiency
+        if request.mode == "estimate":
+            estimate = self.estimator.estimate(Resources(**staffing), triage_efficiency, workflow_efficiency)
+            return ERSimulationEngine.result_to_dict(estimate)
+
+        # Agents in a round share seed + round_idx, so identical setups reuse one shift.
+        # Unseeded runs give every agent its own shift, derived from the run's stream seed,
+        # unless split random streams ask for common random numbers across agents.
+        if request.seed is not None:
+            seed, shared = request.seed + round_idx, True
+        elif request.random_streams != "single":
+            seed, shared = _shift_seed(state.stream_seed, round_idx, ""), True
+        else:
+            seed, shared = _shift_seed(state.stream_seed, round_idx, agent.name), False
+        sim_result = state.memo.run(
+            seed=seed,
+            resources=Resources(**staffing),
+            triage_efficiency=triage_efficiency,
+            workflow_efficiency=workflow_efficiency,
+            share=shared,
+        )
+        return ERSimulationEngine.result_to_dict(sim_result)
+
+    @staticmethod
+    def _round_result(
+        request: SimulationRequest,
+        round_idx: int,
+        agent: HospitalAIAgent,
+        decision: AgentDecision,
+        payment: float,
+        kpis: dict,
+        economics: AgentEconomics,
+    ) -> dict:
+        return {
+            "round": round_idx,
+            "agent_name": agent.name,
+            "decision": decision.action,
+            "payment": round(payment, 3),
+            "kpis": kpis,
+            "metrics": {
+                "balance": round(economics.balance, 3),
+                "burn_rate": economics.burn_rate,
+                "profit_margin": round(economics.profit_margin, 3),
+                "survival_time": economics.survival_time_hours,
+                "reputation_score": round(economics.reputation_score, 2),
+                "bankrupt": economics.bankrupt,
+            },
+            "cost_breakdown": {
+                "token_spend": round(economics.token_spend, 3),
+                "api_spend": round(economics.api_spend, 3),
+                "simulation_spend": round(economics.simulation_spend, 3),
+                "total_cost": round(economics.total_cost, 3),
+                "rewards_earned": round(economics.rewards_earned, 3),
+            },
+            # Compact mode sends only this round's decision; the full logs go out once in summary().
+            "decision_logs": [d.__dict__ for d in agent.decision_log] if request.response_mode == "full" else [decision.__dict__],
+        }
+
+    def summary(self, request: SimulationRequest, state: RunState) -> dict:
+        summary = {"rounds": request.rounds, "leaderboard": self.leaderboard(state)}
+        if request.response_mode == "compact":
+            summary["decision_logs"] = {name: [d.__dict__ for d in agent.decision_log] for name, agent in state.agents.items()}
+        return summary
+
+    @staticmethod
+    def leaderboard(state: RunState) -> list[dict]:
+        return sorted(
             [
                 {
                     "agent_name": name,
@@ -101,9 +754,7 @@ class SurvivalLabService:
                     "survival_time": economics.survival_time_hours,
                     "bankrupt": economics.bankrupt,
                 }
-                for name, economics in econ_by_agent.items()
+                for name, economics in state.economics.items()
             ],
             key=lambda x: (x["bankrupt"], -x["balance"], -x["reputation_score"]),
         )
-
-        return {"rounds": request.rounds, "leaderboard": leaderboard, "results": round_results}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+
+from app.models.schemas import SimulationRequest
+
+
+class ResultCache:
+    """Bounded LRU of seeded simulation responses keyed on request + config fingerprint.
+
+    Cached responses are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._entries: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request: SimulationRequest, config_fingerprint: str) -> tuple[str, str] | None:
+        # Policy-backed agents answer from outside the process, so their runs are not reproducible.
+        if request.seed is None or request.agent_policy is not None:
+            return None
+        return config_fingerprint, json.dumps(request.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: tuple[str, str] | None) -> dict | None:
+        with self._lock:
+            if key is None or self.max_entries <= 0:
+                self.bypassed += 1
+                return None
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: tuple[str, str] | None, result: dict) -> None:
+        if key is None or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from app.models.schemas import SimulationRequest
+from app.services.config_loader import ROOT_DIR
+
+DEFAULT_PATH = Path(os.environ.get("HOSPITAL_LAB_RUN_STORE", ROOT_DIR / "data" / "runs.sqlite"))
+KPI_COLUMNS = ("door_to_doctor", "length_of_stay", "throughput", "error_rate")
+METRIC_COLUMNS = ("balance", "profit_margin", "reputation_score", "bankrupt")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    seed INTEGER,
+    rounds INTEGER NOT NULL,
+    request TEXT NOT NULL,
+    parent_run_id TEXT,
+    fork_round INTEGER,
+    config_fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs (created_at);
+
+CREATE TABLE IF NOT EXISTS round_results (
+    run_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    agent_name TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    payment REAL NOT NULL,
+    door_to_doctor REAL NOT NULL,
+    length_of_stay REAL NOT NULL,
+    throughput REAL NOT NULL,
+    error_rate REAL NOT NULL,
+    balance REAL NOT NULL,
+    profit_margin REAL NOT NULL,
+    reputation_score REAL NOT NULL,
+    bankrupt INTEGER NOT NULL,
+    PRIMARY KEY (run_id, round, agent_name)
+);
+CREATE INDEX IF NOT EXISTS round_results_agent ON round_results (agent_name, run_id, round);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    run_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    agent_name TEXT NOT NULL,
+    balance REAL NOT NULL,
+    reputation_score REAL NOT NULL,
+    survival_time REAL NOT NULL,
+    bankrupt INTEGER NOT NULL,
+    PRIMARY KEY (run_id, agent_name)
+);
+CREATE INDEX IF NOT EXISTS leaderboard_ranking ON leaderboard (bankrupt, balance DESC, reputation_score DESC);
+CREATE INDEX IF NOT EXISTS leaderboard_agent ON leaderboard (agent_name);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    full_log INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (run_id, round)
+);
+"""
+
+# Columns added after the first release of the schema, applied to older database files.
+MIGRATIONS = {"runs": {"parent_run_id": "TEXT", "fork_round": "INTEGER", "config_fingerprint": "TEXT"}}
+
+
+class RunStore:
+    """SQLite history of runs: one transaction per completed round, plus the final leaderboard.
+
+    Queries for agent time series and cross-run rankings are served from indexes, so
+    historical views never re-run a simulation. Each round's transaction also stores a
+    checkpoint of the run state (``SurvivalLabService.snapshot``) so runs can be resumed or
+    forked from any round. ``path=":memory:"`` keeps it in-process.
+
+    The database is opened on first use, so building a store touches no files. WAL with
+    ``synchronous=NORMAL`` skips the fsync on every commit; a crash can lose the last
+    transactions but never corrupts the file.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_PATH) -> None:
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Always reached with _lock held.
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        if str(self.path) != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            for table, columns in MIGRATIONS.items():
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for column, kind in columns.items():
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def begin_run(
+        self,
+        request: SimulationRequest,
+        checkpoint: dict | None = None,
+        parent_run_id: str | None = None,
+        fork_round: int | None = None,
+        config_fingerprint: str | None = None,
+    ) -> str:
+        run_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, created_at, status, seed, rounds, request, parent_run_id, fork_round, config_fingerprint) "
+                "VALUES (?, ?, 'running', ?, ?, ?, ?, ?, ?)",
+                (run_id, time.time(), request.seed, request.rounds, request.model_dump_json(), parent_run_id, fork_round, config_fingerprint),
+            )
+            if checkpoint is not None:
+                self._save_checkpoint(run_id, checkpoint)
+        return run_id
+
+    def record_run(self, request: SimulationRequest, result: dict) -> str:
+        """Store a result computed elsewhere in one transaction. It has no checkpoints, so it cannot be resumed or forked."""
+        run_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, created_at, status, seed, rounds, request) VALUES (?, ?, 'completed', ?, ?, ?)",
+                (run_id, time.time(), request.seed, request.rounds, request.model_dump_json()),
+            )
+            self._insert_rounds(run_id, result["results"])
+            self._insert_leaderboard(run_id, result["leaderboard"])
+        return run_id
+
+    def mark_running(self, run_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET status = 'running' WHERE run_id = ?", (run_id,))
+
+    def append_round(self, run_id: str, results: list[dict], checkpoint: dict | None = None) -> None:
+        """Store round results (one round or several) and optionally a checkpoint in one transaction."""
+        with self._lock, self._conn:
+            self._insert_rounds(run_id, results)
+            if checkpoint is not None:
+                self._save_checkpoint(run_id, checkpoint)
+
+    def _insert_rounds(self, run_id: str, results: list[dict]) -> None:
+        placeholders = ", ".join("?" * (5 + len(KPI_COLUMNS) + len(METRIC_COLUMNS)))
+        self._conn.executemany(f"INSERT OR REPLACE INTO round_results VALUES ({placeholders})", [self._round_row(run_id, r) for r in results])
+
+    @staticmethod
+    def _round_row(run_id: str, result: dict) -> tuple:
+        return (
+            run_id,
+            result["round"],
+            result["agent_name"],
+            result["decision"],
+            result["payment"],
+            *(result["kpis"][name] for name in KPI_COLUMNS),
+            *(result["metrics"][name] for name in METRIC_COLUMNS),
+        )
+
+    def _insert_leaderboard(self, run_id: str, leaderboard: list[dict]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO leaderboard VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, rank, e["agent_name"], e["balance"], e["reputation_score"], e["survival_time"], e["bankrupt"])
+                for rank, e in enumerate(leaderboard, start=1)
+            ],
+        )
+
+    def _save_checkpoint(self, run_id: str, checkpoint: dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)",
+            (run_id, checkpoint["rounds_completed"], checkpoint["full_log"], json.dumps(checkpoint, separators=(",", ":"))),
+        )
+
+    def checkpoint(self, run_id: str, round_idx: int | None = None) -> tuple[dict, list[dict]]:
+        """The run's request and its checkpoints up to ``round_idx`` (latest when omitted).
+
+        Checkpoints come newest first, starting at the latest one at or before ``round_idx``
+        and going back to the nearest one with ``full_log`` set, so the caller can stitch
+        incremental decision logs together. Not every round has a checkpoint; callers replay
+        forward from the first one. Raises ``KeyError`` when the run or any checkpoint at or
+        before ``round_idx`` is missing.
+        """
+        with self._lock:
+            run = self._conn.execute("SELECT request FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if run is None:
+                raise KeyError(run_id)
+            if round_idx is None:
+                latest = self._conn.execute("SELECT MAX(round) FROM checkpoints WHERE run_id = ?", (run_id,)).fetchone()[0]
+                round_idx = -1 if latest is None else latest
+            rows = self._conn.execute(
+                "SELECT round, full_log, state FROM checkpoints WHERE run_id = ? AND round <= ? AND round >= "
+                "(SELECT MAX(round) FROM checkpoints WHERE run_id = ? AND round <= ? AND full_log) ORDER BY round DESC",
+                (run_id, round_idx, run_id, round_idx),
+            ).fetchall()
+        if not rows:
+            raise KeyError(f"{run_id} round {round_idx}")
+        return json.loads(run["request"]), [json.loads(row["state"]) for row in rows]
+
+    def config_fingerprint(self, run_id: str) -> str | None:
+        """The fingerprint of the config the run was played under, if it was recorded. Raises ``KeyError`` for unknown runs."""
+        with self._lock:
+            row = self._conn.execute("SELECT config_fingerprint FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(run_id)
+        return row["config_fingerprint"]
+
+    def finish_run(
+        self,
+        run_id: str,
+        leaderboard: list[dict] | None,
+        status: str = "completed",
+        results: list[dict] | None = None,
+        checkpoint: dict | None = None,
+    ) -> None:
+        """Set the run's final status, storing any still-buffered ``results`` and ``checkpoint`` in the same transaction."""
+        with self._lock, self._conn:
+            if results:
+                self._insert_rounds(run_id, results)
+            if checkpoint is not None:
+                self._save_checkpoint(run_id, checkpoint)
+            if leaderboard:
+                self._insert_leaderboard(run_id, leaderboard)
+            self._conn.execute("UPDATE runs SET status = ? WHERE run_id = ?", (status, run_id))
+
+    def round_rows(self, run_id: str, after_round: int = 0) -> tuple[str, list[sqlite3.Row]]:
+        """The run's status and its stored rows for rounds after ``after_round``, by round then agent.
+
+        The status is read first, so a ``completed`` status means every row is included.
+        Raises ``KeyError`` for an unknown run.
+        """
+        columns = ", ".join(("round", "agent_name", "payment") + KPI_COLUMNS + METRIC_COLUMNS)
+        with self._lock:
+            run = self._conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if run is None:
+                raise KeyError(run_id)
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM round_results WHERE run_id = ? AND round > ? ORDER BY round, agent_name",
+                (run_id, after_round),
+            ).fetchall()
+        return run["status"], rows
+
+    def runs(self, limit: int = 50) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, created_at, status, seed, rounds, parent_run_id, fork_round FROM runs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def agent_series(self, agent_name: str, run_id: str | None = None, last_runs: int = 10) -> list[dict]:
+        """Per-round KPIs and metrics for one agent, oldest run first.
+
+        Covers ``run_id`` alone when given, otherwise the agent's ``last_runs`` most recent runs.
+        """
+        columns = ", ".join(("r.run_id", "r.round", "r.decision", "r.payment") + tuple(f"r.{c}" for c in KPI_COLUMNS + METRIC_COLUMNS))
+        if run_id is not None:
+            query = f"SELECT {columns} FROM round_results r JOIN runs USING (run_id) WHERE r.agent_name = ? AND r.run_id = ?"
+            params: tuple = (agent_name, run_id)
+        else:
+            query = (
+                f"SELECT {columns} FROM round_results r JOIN runs USING (run_id) WHERE r.agent_name = ? AND r.run_id IN ("
+                "SELECT DISTINCT run_id FROM round_results JOIN runs USING (run_id) WHERE agent_name = ? ORDER BY created_at DESC LIMIT ?)"
+            )
+            params = (agent_name, agent_name, last_runs)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY runs.created_at, r.round", params).fetchall()
+        return [
+            {
+                "run_id": row["run_id"],
+                "round": row["round"],
+                "decision": row["decision"],
+                "payment": row["payment"],
+                "kpis": {name: row[name] for name in KPI_COLUMNS},
+                "metrics": {**{name: row[name] for name in METRIC_COLUMNS}, "bankrupt": bool(row["bankrupt"])},
+            }
+            for row in rows
+        ]
+
+    def leaderboard(self, limit: int = 20, agent_name: str | None = None) -> list[dict]:
+        """Best final standings across all stored runs, ranked like ``SurvivalLabService.leaderboard``."""
+        where, params = ("WHERE agent_name = ?", (agent_name,)) if agent_name is not None else ("", ())
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, agent_name, balance, reputation_score, survival_time, bankrupt FROM leaderboard "
+                f"{where} ORDER BY bankrupt, balance DESC, reputation_score DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [{**dict(row), "bankrupt": bool(row["bankrupt"])} for row in rows]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from itertools import product
+from statistics import fmean
+
+from app.models.schemas import SimulationRequest, SweepRequest
+from app.services import worker_pool
+from app.services.lab_service import SurvivalLabService
+from app.services.result_cache import ResultCache
+
+from agents.example_agent import TriageOptimizerAgent
+from instrumentation import metrics
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+SWEEP_FIELDS = set(SweepRequest.model_fields) - set(SimulationRequest.model_fields)
+
+_worker_service: SurvivalLabService | None = None
+
+
+class _Pruned(Exception):
+    pass
+
+
+def evaluate_point(service: SurvivalLabService, request: SimulationRequest, prune_bankrupt_round: int | None = None) -> dict:
+    """Play one staffing point, abandoning it if any agent is bankrupt by ``prune_bankrupt_round``."""
+    state = service.start_run(request)
+    quality_scores: list[float] = []
+
+    def on_round(round_idx: int, results: list[dict]) -> None:
+        if round_idx == prune_bankrupt_round and any(e.bankrupt for e in state.economics.values()):
+            raise _Pruned
+
+    try:
+        for result in service.iter_round_results(request, state, on_round=on_round):
+            quality_scores.append(service.econ_engine.quality_score_from_kpis(result["kpis"]))
+    except _Pruned:
+        return {"status": "pruned_bankrupt", "rounds_played": state.rounds_completed}
+
+    return {
+        "status": "evaluated",
+        "quality_score": fmean(quality_scores) if quality_scores else 0.0,
+        "operating_cost": sum(e.total_cost for e in state.economics.values()),
+        "agent_rounds": len(quality_scores),
+        "rounds_played": state.rounds_completed,
+    }
+
+
+def _evaluate_in_worker(payload: dict, prune_bankrupt_round: int | None) -> tuple[dict, dict]:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = SurvivalLabService(cache_size=0)
+    else:
+        # Workers outlive requests; pick up config changes like the parent service does.
+        _worker_service.refresh_config()
+    # This already runs on the shared pool, so the point plays its agents serially.
+    outcome = evaluate_point(_worker_service, SimulationRequest(**{**payload, "agent_workers": 1}), prune_bankrupt_round)
+    return outcome, metrics.drain()
+
+
+def pareto_frontier(points: list[dict]) -> list[dict]:
+    """Points not beaten on both quality (higher) and total cost (lower), cheapest first."""
+    frontier: list[dict] = []
+    for point in sorted(points, key=lambda p: (p["total_cost"], -p["quality_score"])):
+        if not frontier or point["quality_score"] > frontier[-1]["quality_score"]:
+            frontier.append(point)
+    return frontier
+
+
+class StaffingSweep:
+    """Grid search over beds/nurses/doctors that returns the quality vs total cost Pareto frontier.
+
+    The simulation depends on staffing only through gross capacity, so among grid points
+    whose allocated staffing has the same gross capacity only the cheapest is simulated
+    and the rest are reported as dominated. That only holds when the agents' own
+    allocation is what gets simulated: with an ``agent_policy`` the policy sees the
+    requested counts and may staff differently, so every point is simulated. Evaluations
+    are cached across sweeps.
+    """
+
+    def __init__(self, service: SurvivalLabService, cache_size: int = 4096) -> None:
+        self.service = service
+        self.cache = ResultCache(max_entries=cache_size)
+
+    def run(self, request: SweepRequest) -> dict:
+        self.service.refresh_config()
+        grid = list(product(request.beds_range.values(), request.nurses_range.values(), request.doctors_range.values()))
+        if len(grid) > request.max_points:
+            raise ValueError(f"sweep has {len(grid)} points, above max_points={request.max_points}")
+
+        base = request.model_dump(exclude=SWEEP_FIELDS | {"beds", "nurses", "doctors"})
+        hourly_costs = self.service.config["staffing_hourly_cost"]
+        shift_hours = self.service.config["simulation"]["shift_hours"]
+        probe = TriageOptimizerAgent()
+
+        prune_dominated = request.agent_policy is None
+        points: list[dict] = []
+        cheapest_by_capacity: dict[float, dict] = {}
+        for beds, nurses, doctors in grid:
+            staffing = probe.allocate_staff(beds, nurses, doctors)
+            point = {
+                "beds": beds,
+                "nurses": nurses,
+                "doctors": doctors,
+                "_staffing": staffing,
+                "_hourly_cost": sum(hourly_costs[role] * count for role, count in staffing.items()),
+            }
+            points.append(point)
+            if not prune_dominated:
+                continue
+            capacity = round(ERSimulationEngine._gross_capacity(Resources(**staffing)), 6)
+            incumbent = cheapest_by_capacity.get(capacity)
+            if incumbent is None or point["_hourly_cost"] < incumbent["_hourly_cost"]:
+                cheapest_by_capacity[capacity] = point
+
+        to_evaluate = list(cheapest_by_capacity.values()) if prune_dominated else points
+        fingerprint = f"{self.service.config_fingerprint}:prune={request.prune_bankrupt_round}"
+        pending: list[tuple[dict, tuple[str, str] | None, dict]] = []
+        for point in to_evaluate:
+            payload = {**base, "beds": point["beds"], "nurses": point["nurses"], "doctors": point["doctors"]}
+            key = self.cache.key(SimulationRequest(**payload), fingerprint)
+            cached = self.cache.get(key)
+            if cached is not None:
+                point["_outcome"] = {**cached, "status": "cached" if cached["status"] == "evaluated" else cached["status"]}
+            else:
+                pending.append((point, key, payload))
+
+        # Workers only know the config's policies, so policy sweeps stay in this process.
+        if request.agent_policy is None and worker_pool.worker_count(request.workers) > 1 and len(pending) > 1:
+            pool = worker_pool.shared_pool()
+            outcomes = []
+            for outcome, recorded in pool.map(_evaluate_in_worker, [p for _, _, p in pending], [request.prune_bankrupt_round] * len(pending)):
+                metrics.merge(recorded)
+                outcomes.append(outcome)
+        else:
+            outcomes = [evaluate_point(self.service, SimulationRequest(**p), request.prune_bankrupt_round) for _, _, p in pending]
+        for (point, key, _), outcome in zip(pending, outcomes):
+            self.cache.put(key, outcome)
+            point["_outcome"] = outcome
+
+        evaluated_ids = {id(p) for p in to_evaluate}
+        for point in points:
+            if id(point) not in evaluated_ids:
+                representative = cheapest_by_capacity[round(ERSimulationEngine._gross_capacity(Resources(**point["_staffing"])), 6)]
+                point["status"] = "pruned_dominated"
+                point["dominated_by"] = {k: representative[k] for k in ("beds", "nurses", "doctors")}
+                continue
+            outcome = point["_outcome"]
+            point["status"] = outcome["status"]
+            point["rounds_played"] = outcome["rounds_played"]
+            if outcome["status"] != "pruned_bankrupt":
+                staffing_cost = point["_hourly_cost"] * shift_hours * outcome["agent_rounds"]
+                point["quality_score"] = round(outcome["quality_score"], 4)
+                point["operating_cost"] = round(outcome["operating_cost"], 4)
+                point["staffing_cost"] = round(staffing_cost, 4)
+                point["total_cost"] = round(outcome["operating_cost"] + staffing_cost, 4)
+
+        public = [{k: v for k, v in point.items() if not k.startswith("_")} for point in points]
+        feasible = [p for p in public if p["status"] in ("evaluated", "cached")]
+        return {
+            "evaluated": sum(1 for p in public if p["status"] == "evaluated"),
+            "cached": sum(1 for p in public if p["status"] == "cached"),
+            "pruned": sum(1 for p in public if p["status"].startswith("pruned")),
+            "points": public,
+            "pareto_frontier": pareto_frontier(feasible),
+        }
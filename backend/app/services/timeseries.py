@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from app.services.run_store import KPI_COLUMNS, RunStore
+
+SERIES_METRICS = ("balance", "profit_margin", "reputation_score", "payment") + KPI_COLUMNS
+DEFAULT_METRICS = ("balance",) + KPI_COLUMNS
+
+
+def lttb(x: Sequence[float], y: Sequence[float], points: int) -> list[int]:
+    """Indices of the ``points`` samples kept by largest-triangle-three-buckets.
+
+    The first and last samples are always kept. Each bucket in between keeps the sample
+    forming the largest triangle with the previously kept sample and the mean of the
+    next bucket, which preserves peaks and troughs that plain striding would drop.
+    """
+    n = len(x)
+    if points >= n:
+        return list(range(n))
+    if points < 3:
+        raise ValueError("largest-triangle-three-buckets needs at least 3 points")
+    bucket = (n - 2) / (points - 2)
+    kept = [0]
+    anchor = 0
+    for i in range(points - 2):
+        start, end = int(i * bucket) + 1, int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        mean_x = sum(x[end:next_end]) / (next_end - end)
+        mean_y = sum(y[end:next_end]) / (next_end - end)
+        ax, ay = x[anchor], y[anchor]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - mean_x) * (y[j] - ay) - (ax - x[j]) * (mean_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        anchor = best
+    kept.append(n - 1)
+    return kept
+
+
+@dataclass
+class RunSeries:
+    """Raw per-agent series of one run, extended as its rounds are stored."""
+
+    status: str = "running"
+    rounds_completed: int = 0
+    rounds: dict[str, list[int]] = field(default_factory=dict)
+    values: dict[str, dict[str, list[float]]] = field(default_factory=dict)
+    downsampled: dict[tuple, dict] = field(default_factory=dict)
+
+    def extend(self, rows: Sequence) -> None:
+        for row in rows:
+            name = row["agent_name"]
+            self.rounds.setdefault(name, []).append(row["round"])
+            agent_values = self.values.setdefault(name, {metric: [] for metric in SERIES_METRICS})
+            for metric in SERIES_METRICS:
+                agent_values[metric].append(row[metric])
+            self.rounds_completed = max(self.rounds_completed, row["round"])
+        if rows:
+            self.downsampled.clear()
+
+
+class TimeSeriesView:
+    """Downsampled per-agent KPI series for stored runs, in constant size whatever the run length.
+
+    Each run's raw series is kept in a small LRU and extended with only the rounds stored
+    since the last query, so polling a run in progress reads each round once. Downsampled
+    answers are cached until the run gains rounds.
+    """
+
+    def __init__(self, run_store: RunStore, max_runs: int = 64) -> None:
+        self.run_store = run_store
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, RunSeries] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def series(
+        self,
+        run_id: str,
+        points: int = 64,
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        agent_names: Sequence[str] | None = None,
+    ) -> dict:
+        """``{agent: {metric: {"round": [...], "value": [...]}}}`` with at most ``points`` samples per series.
+
+        Raises ``KeyError`` for an unknown run and ``ValueError`` for an unknown metric.
+        """
+        unknown = sorted(set(metrics) - set(SERIES_METRICS))
+        if unknown:
+            raise ValueError(f"unknown metrics: {', '.join(unknown)}")
+        with self._lock:
+            run = self._refresh(run_id)
+            names = list(run.rounds) if agent_names is None else [name for name in agent_names if name in run.rounds]
+            key = (points, tuple(metrics), tuple(names))
+            agents = run.downsampled.get(key)
+            if agents is None:
+                agents = run.downsampled[key] = {name: self._downsample(run, name, points, metrics) for name in names}
+            return {"run_id": run_id, "status": run.status, "rounds_completed": run.rounds_completed, "points": points, "agents": agents}
+
+    def _refresh(self, run_id: str) -> RunSeries:
+        run = self._runs.get(run_id)
+        if run is None:
+            run = RunSeries()
+        # Completed runs never change; aborted ones can still be resumed.
+        if run.status != "completed" or run_id not in self._runs:
+            run.status, rows = self.run_store.round_rows(run_id, after_round=run.rounds_completed)
+            run.extend(rows)
+        self._runs[run_id] = run
+        self._runs.move_to_end(run_id)
+        while len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+        return run
+
+    @staticmethod
+    def _downsample(run: RunSeries, name: str, points: int, metrics: Sequence[str]) -> dict:
+        rounds = run.rounds[name]
+        downsampled = {}
+        for metric in metrics:
+            values = run.values[name][metric]
+            kept = lttb(rounds, values, points)
+            downsampled[metric] = {"round": [rounds[i] for i in kept], "value": [values[i] for i in kept]}
+        return downsampled
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentation import metrics
+
+_pool: ProcessPoolExecutor | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def worker_count(requested: int) -> int:
+    """``requested`` workers, at most one per CPU."""
+    return max(1, min(requested, os.cpu_count() or 1))
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    """The process pool every parallel code path shares, with one worker per CPU, started on first use.
+
+    Work submitted here must not submit to the pool itself: a worker process inherits a
+    copy of this module, so callers run their tasks serially inside a worker. Workers start
+    with empty metrics, so what a task returns from ``metrics.drain`` is its own work.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A forked child sees the parent's executor, which it cannot use.
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, initializer=metrics.reset)
+            _pool_pid = os.getpid()
+        return _pool
@@ -0,0 +1,65 @@
+"""Wall-clock time of a mixed scheduler batch as one POST /api/simulate call per request
+versus a single POST /api/simulate/batch.
+
+Requests use neighbouring seeds and a few staffing variants, the way a scheduler
+submits them, so many (seed, round, staffing, efficiency) shifts recur across requests.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.services.run_store import RunStore
+
+
+def scheduler_batch(size: int, rounds: int) -> list[dict]:
+    staffing = ({}, {"doctors": 6}, {"nurses": 14})
+    return [
+        {"rounds": rounds, "agent_names": ["Agent A", "Agent B"], "seed": 100 + i % 8, "tokens_used": 0, "api_calls": 0, **staffing[i % 3]}
+        for i in range(size)
+    ]
+
+
+def run_benchmark(size: int = 48, rounds: int = 12) -> dict:
+    routes.service.run_store = RunStore(":memory:")
+    routes.service.cache.max_entries = 0
+    client = TestClient(app)
+    payloads = scheduler_batch(size, rounds)
+
+    start = time.perf_counter()
+    for payload in payloads:
+        client.post("/api/simulate", json=payload).raise_for_status()
+    individual = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = client.post("/api/simulate/batch", json={"requests": payloads})
+    response.raise_for_status()
+    batched = time.perf_counter() - start
+
+    body = response.json()
+    return {
+        "requests": size,
+        "rounds": rounds,
+        "individual_seconds": round(individual, 4),
+        "batch_seconds": round(batched, 4),
+        "speedup": round(individual / batched, 2),
+        "unique_requests": body["unique_requests"],
+        "shifts_simulated": body["shifts_simulated"],
+        "shifts_reused": body["shifts_reused"],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
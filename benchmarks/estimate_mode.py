@@ -0,0 +1,53 @@
+"""Latency of one what-if KPI evaluation: ERSimulationEngine.run against the calibrated
+QueueingEstimator, plus the estimator's calibration report.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from simulation.analytic import QueueingEstimator
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+EVENT_PROBABILITIES = {"mass_casualty": 0.08, "system_outage": 0.05}
+
+
+def best_of(operation, repeats: int) -> float:
+    best = float("inf")
+    for i in range(repeats):
+        start = time.perf_counter()
+        operation(i)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(shift_hours: int = 12, patients_per_hour: int = 6, repeats: int = 200) -> dict:
+    start = time.perf_counter()
+    estimator = QueueingEstimator(shift_hours, patients_per_hour, EVENT_PROBABILITIES)
+    report = estimator.calibrate()
+    calibration = time.perf_counter() - start
+
+    resources = Resources(beds=20, nurses=12, doctors=6)
+    simulate = best_of(lambda i: ERSimulationEngine(shift_hours, patients_per_hour, EVENT_PROBABILITIES, seed=i).run(resources), repeats)
+    estimate = best_of(lambda i: estimator.estimate(resources, 1.0 + i % 5 * 0.1), repeats)
+    return {
+        "shift_hours": shift_hours,
+        "patients_per_hour": patients_per_hour,
+        "simulate_ms": round(simulate * 1000, 4),
+        "estimate_ms": round(estimate * 1000, 4),
+        "calibration_seconds": round(calibration, 3),
+        "calibration": asdict(report),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps([run_benchmark(), run_benchmark(patients_per_hour=60)], indent=2))
@@ -0,0 +1,202 @@
+"""Reproducible benchmark suite with scaling sweeps and a regression gate.
+
+Times ERSimulationEngine.run, EconomicEngine operations, SurvivalLabService.run_iteration
+end to end, and the /api/simulate handler through FastAPI's test client, sweeping
+patients_per_hour, shift_hours, rounds and agent count. Every case reports throughput,
+latency percentiles and peak traced memory as JSON.
+
+    python benchmarks/harness.py --output bench.json
+    python benchmarks/harness.py --save-baseline            # refresh benchmarks/baseline.json
+    python benchmarks/harness.py --compare --threshold 0.25 # exit 1 on a >25% p50 regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from statistics import quantiles
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from app.models.schemas import SimulationRequest
+from app.services.config_loader import load_config
+from app.services.lab_service import SurvivalLabService
+from app.services.run_store import RunStore
+from economic_engine.engine import EconomicEngine
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+EVENT_PROBABILITIES = {"mass_casualty": 0.08, "system_outage": 0.05}
+FULL_SWEEP = {
+    "patients_per_hour": (6, 60, 240),
+    "shift_hours": (12, 48),
+    "rounds": (6, 24, 72),
+    "agents": (2, 8, 32),
+}
+QUICK_SWEEP = {
+    "patients_per_hour": (6, 60),
+    "shift_hours": (12,),
+    "rounds": (6, 24),
+    "agents": (2, 8),
+}
+
+
+def measure(name: str, params: dict, operation: Callable[[int], object], repeats: int, ops_per_call: int = 1) -> dict:
+    """Time ``operation(i)`` for ``repeats`` calls, then rerun once under tracemalloc for peak memory."""
+    operation(-1)  # warm-up
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    operation(repeats)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cuts = quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "name": name,
+        "params": params,
+        "repeats": repeats,
+        "p50_ms": round(cuts[49] * 1000, 4),
+        "p90_ms": round(cuts[89] * 1000, 4),
+        "p99_ms": round(cuts[98] * 1000, 4),
+        "throughput_per_s": round(repeats * ops_per_call / sum(latencies), 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def bench_engine(sweep: dict, repeats: int) -> list[dict]:
+    cases = []
+    resources = Resources(beds=20, nurses=12, doctors=6)
+    for shift_hours in sweep["shift_hours"]:
+        for pph in sweep["patients_per_hour"]:
+            def run(i: int, shift_hours: int = shift_hours, pph: int = pph) -> None:
+                ERSimulationEngine(shift_hours, pph, EVENT_PROBABILITIES, seed=i).run(resources)
+
+            cases.append(measure(f"engine.run[h={shift_hours},pph={pph}]", {"shift_hours": shift_hours, "patients_per_hour": pph}, run, repeats))
+    return cases
+
+
+def bench_economics(repeats: int) -> list[dict]:
+    engine = EconomicEngine(load_config())
+    kpis = {"door_to_doctor": 0.4, "length_of_stay": 2.5, "throughput": 70, "error_rate": 0.02}
+    calls = 1000
+
+    def run(i: int) -> None:
+        economics = engine.initialize_agent("bench")
+        for _ in range(calls):
+            engine.invest_in_upgrade(economics, 0.12)
+            engine.charge_usage(economics, tokens=1500, api_calls=15, simulation_runs=1)
+            engine.apply_burn_rate(economics, hours=12)
+            engine.reward(economics, engine.quality_score_from_kpis(kpis), 2.5)
+
+    return [measure("economics.round_ops", {"agent_rounds_per_call": calls}, run, repeats, ops_per_call=calls)]
+
+
+def _request(rounds: int, agents: int, seed: int) -> SimulationRequest:
+    # Zero usage charges keep every agent alive so each case does its full amount of work.
+    return SimulationRequest(rounds=rounds, agent_names=[f"Agent {i}" for i in range(agents)], tokens_used=0, api_calls=0, seed=seed)
+
+
+def bench_service(sweep: dict, repeats: int) -> list[dict]:
+    service = SurvivalLabService(cache_size=0)
+    cases = []
+    for agents in sweep["agents"]:
+        for rounds in sweep["rounds"]:
+            def run(i: int, rounds: int = rounds, agents: int = agents) -> None:
+                service.run_iteration(_request(rounds, agents, seed=i))
+
+            cases.append(measure(f"service.run_iteration[r={rounds},a={agents}]", {"rounds": rounds, "agents": agents}, run, repeats))
+    return cases
+
+
+def bench_api(sweep: dict, repeats: int) -> list[dict]:
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.main import app
+
+    routes.service.cache.max_entries = 0
+    client = TestClient(app)
+    cases = []
+    # Run history is stored like the server does, in a scratch file instead of data/.
+    with tempfile.TemporaryDirectory(prefix="hospital-lab-bench-") as scratch:
+        previous, routes.service.run_store = routes.service.run_store, RunStore(Path(scratch) / "runs.sqlite")
+        try:
+            for agents in sweep["agents"]:
+                for rounds in sweep["rounds"]:
+                    def run(i: int, rounds: int = rounds, agents: int = agents) -> None:
+                        response = client.post("/api/simulate", json=_request(rounds, agents, seed=i).model_dump())
+                        response.raise_for_status()
+
+                    cases.append(measure(f"api.simulate[r={rounds},a={agents}]", {"rounds": rounds, "agents": agents}, run, repeats))
+        finally:
+            routes.service.run_store.close()
+            routes.service.run_store = previous
+    return cases
+
+
+def run_suite(quick: bool = False, repeats: int = 15) -> dict:
+    sweep = QUICK_SWEEP if quick else FULL_SWEEP
+    cases = bench_engine(sweep, repeats) + bench_economics(repeats) + bench_service(sweep, repeats) + bench_api(sweep, repeats)
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "quick": quick, "repeats": repeats},
+        "cases": cases,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of cases whose p50 latency grew by more than ``threshold`` over the baseline."""
+    previous = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in report["cases"]:
+        reference = previous.get(case["name"])
+        if reference and case["p50_ms"] > reference["p50_ms"] * (1 + threshold):
+            regressions.append(f"{case['name']}: p50 {reference['p50_ms']}ms -> {case['p50_ms']}ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sweep for CI smoke runs")
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--compare", action="store_true", help="fail if any case regresses past --threshold")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional p50 slowdown")
+    args = parser.parse_args(argv)
+
+    report = run_suite(quick=args.quick, repeats=args.repeats)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.save_baseline:
+        args.baseline.write_text(text + "\n", encoding="utf-8")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Wall-clock time of a many-agent tournament with serial vs process-pool agent execution.
+
+Speedup is bounded by the number of cores; each round pays one round trip per chunk.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from app.models.schemas import SimulationRequest
+from app.services.lab_service import SurvivalLabService
+
+
+def time_tournament(agents: int, rounds: int, agent_workers: int) -> dict:
+    service = SurvivalLabService(cache_size=0)
+    # Unseeded, so every agent simulates its own shift and there is real work to spread.
+    request = SimulationRequest(
+        rounds=rounds,
+        agent_names=[f"Agent {i}" for i in range(agents)],
+        tokens_used=0,
+        api_calls=0,
+        agent_workers=agent_workers,
+    )
+    start = time.perf_counter()
+    service.run_iteration(request)
+    return {"agents": agents, "rounds": rounds, "agent_workers": agent_workers, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def run_benchmark(agents: int = 256, rounds: int = 12) -> list[dict]:
+    # Worker counts above the CPU count are capped, so they would only repeat it.
+    cpus = os.cpu_count() or 1
+    workers = sorted({n for n in (1, 2, 4) if n <= cpus} | {cpus})
+    return [time_tournament(agents, rounds, n) for n in workers]
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
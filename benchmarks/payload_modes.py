@@ -0,0 +1,79 @@
+"""Compare payload size and latency of full vs compact simulation responses, and of the
+columnar JSON and binary formats.
+
+Each case runs run_iteration, then encodes the result the way /api/simulate does for
+that format: validation through SimulationResponse plus JSON serialization by default,
+or the direct columnar encoders, which skip validation.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from app.models.schemas import SimulationRequest, SimulationResponse
+from app.services import columnar
+from app.services.lab_service import SurvivalLabService
+
+
+def validate_and_dump(result: dict) -> str:
+    return SimulationResponse.model_validate(result).model_dump_json()
+
+
+def measure(
+    service: SurvivalLabService,
+    request: SimulationRequest,
+    encode: Callable[[dict], str | bytes] = validate_and_dump,
+    repeats: int = 3,
+) -> dict:
+    best_simulate = best_serialize = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = service.run_iteration(request)
+        simulated = time.perf_counter()
+        body = encode(result)
+        best_simulate = min(best_simulate, simulated - start)
+        best_serialize = min(best_serialize, time.perf_counter() - simulated)
+    return {
+        "payload_bytes": len(body),
+        "simulate_ms": round(best_simulate * 1000, 3),
+        "validate_serialize_ms": round(best_serialize * 1000, 3),
+    }
+
+
+def run_benchmark(rounds: tuple[int, ...] = (12, 36, 72), agent_counts: tuple[int, ...] = (2, 8)) -> list[dict]:
+    # Without the result cache, every repeat simulates instead of returning the first result.
+    service = SurvivalLabService(cache_size=0)
+    rows = []
+    for n_agents in agent_counts:
+        for n_rounds in rounds:
+            # Zero usage charges keep every agent alive so all rounds produce results.
+            base = dict(rounds=n_rounds, agent_names=[f"Agent {i}" for i in range(n_agents)], tokens_used=0, api_calls=0, seed=1)
+            full = measure(service, SimulationRequest(**base, response_mode="full"))
+            compact = measure(service, SimulationRequest(**base, response_mode="compact"))
+            columnar_json = measure(service, SimulationRequest(**base, response_mode="compact"), columnar.encode_json)
+            binary = measure(service, SimulationRequest(**base, response_mode="compact"), columnar.encode_binary)
+            rows.append(
+                {
+                    "rounds": n_rounds,
+                    "agents": n_agents,
+                    "full": full,
+                    "compact": compact,
+                    "columnar_json": columnar_json,
+                    "binary": binary,
+                    "payload_ratio": round(full["payload_bytes"] / compact["payload_bytes"], 2),
+                }
+            )
+    return rows
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
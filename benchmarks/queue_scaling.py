@@ -0,0 +1,48 @@
+"""Scaling benchmark for ERSimulationEngine.run as patients_per_hour and shift_hours grow.
+
+Uses a deliberately understaffed ER so the backlog keeps growing; with the
+heap-backed triage queue the cost per patient should stay roughly flat.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+EVENT_PROBABILITIES = {"mass_casualty": 0.08, "system_outage": 0.05}
+RESOURCES = Resources(beds=10, nurses=8, doctors=4)
+
+
+def time_run(shift_hours: int, patients_per_hour: int, repeats: int = 3) -> dict:
+    best = float("inf")
+    for seed in range(repeats):
+        engine = ERSimulationEngine(shift_hours, patients_per_hour, EVENT_PROBABILITIES, seed=seed)
+        start = time.perf_counter()
+        result = engine.run(RESOURCES)
+        best = min(best, time.perf_counter() - start)
+    patients = shift_hours * patients_per_hour
+    return {
+        "shift_hours": shift_hours,
+        "patients_per_hour": patients_per_hour,
+        "patients": patients,
+        "untreated_patients": result.untreated_patients,
+        "seconds": round(best, 6),
+        "us_per_patient": round(best / patients * 1e6, 3),
+    }
+
+
+def run_benchmark(patients_per_hour: tuple[int, ...] = (6, 50, 200, 800), shift_hours: tuple[int, ...] = (12, 48, 168)) -> list[dict]:
+    return [time_run(hours, pph) for hours in shift_hours for pph in patients_per_hour]
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
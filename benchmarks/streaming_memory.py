@@ -0,0 +1,50 @@
+"""Peak traced memory and time of ERSimulationEngine.run vs run_streaming for long shifts.
+
+With adequate staffing the backlog stays small, so run_streaming's peak should stay flat
+as shift_hours grows while run's grows with total arrivals.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+EVENT_PROBABILITIES = {"mass_casualty": 0.08, "system_outage": 0.05}
+RESOURCES = Resources(beds=200, nurses=120, doctors=60)
+
+
+def measure(shift_hours: int, patients_per_hour: int, mode: str) -> dict:
+    engine = ERSimulationEngine(shift_hours, patients_per_hour, EVENT_PROBABILITIES, seed=1)
+    run = engine.run_streaming if mode == "streaming" else engine.run
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run(RESOURCES)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": mode,
+        "shift_hours": shift_hours,
+        "patients_per_hour": patients_per_hour,
+        "untreated_patients": result.untreated_patients,
+        "seconds": round(seconds, 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(shift_hours: tuple[int, ...] = (24, 168, 720), patients_per_hour: int = 200) -> list[dict]:
+    return [measure(hours, patients_per_hour, mode) for hours in shift_hours for mode in ("run", "streaming")]
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(), indent=2))
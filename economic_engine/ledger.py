@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from economic_engine.models import AgentEconomics
+
+FLOAT_FIELDS = (
+    "balance",
+    "burn_rate",
+    "token_spend",
+    "api_spend",
+    "simulation_spend",
+    "rewards_earned",
+    "total_cost",
+    "profit_margin",
+    "survival_time_hours",
+    "reputation_score",
+)
+
+
+class EconomicLedger:
+    """Struct-of-arrays ``AgentEconomics`` for many agents, updated with one vectorized step each.
+
+    Every method mirrors its ``EconomicEngine`` counterpart operation for operation on
+    float64 arrays, restricted to the agents selected by ``mask``, so converting back with
+    ``to_economics`` gives exactly the values the per-agent engine would have produced.
+    """
+
+    def __init__(self, config: dict, names: Sequence[str]):
+        self.config = config
+        self.names = list(names)
+        n_agents = len(self.names)
+        self.balance = np.full(n_agents, float(config["initial_capital"]))
+        self.burn_rate = np.full(n_agents, float(config["hourly_burn_rate"]))
+        for name in FLOAT_FIELDS[2:]:
+            setattr(self, name, np.zeros(n_agents))
+        self.reputation_score = np.full(n_agents, 50.0)
+        self.roi_history: list[list[float]] = [[] for _ in range(n_agents)]
+
+        multipliers = config["reward_multipliers"]
+        self._multipliers = tuple(multipliers[k] for k in ("door_to_doctor", "length_of_stay", "throughput", "error_rate"))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_economics(cls, config: dict, economics: Sequence[AgentEconomics]) -> EconomicLedger:
+        ledger = cls(config, [e.name for e in economics])
+        for name in FLOAT_FIELDS:
+            setattr(ledger, name, np.array([getattr(e, name) for e in economics], dtype=np.float64))
+        ledger.roi_history = [list(e.roi_history) for e in economics]
+        return ledger
+
+    def to_economics(self, indices: Sequence[int] | np.ndarray) -> list[AgentEconomics]:
+        columns = [getattr(self, name)[indices].tolist() for name in FLOAT_FIELDS]
+        return [
+            AgentEconomics(
+                name=self.names[index],
+                **dict(zip(FLOAT_FIELDS, values)),
+                roi_history=list(self.roi_history[index]),
+            )
+            for index, *values in zip(np.asarray(indices).tolist(), *columns)
+        ]
+
+    @property
+    def bankrupt(self) -> np.ndarray:
+        return self.balance <= 0
+
+    def charge_usage(self, mask: np.ndarray, tokens: int, api_calls: int, simulation_runs: int) -> float:
+        token_cost = tokens * self.config["token_cost"]
+        api_cost = api_calls * self.config["api_call_cost"]
+        run_cost = simulation_runs * self.config["simulation_run_cost"]
+        charge = token_cost + api_cost + run_cost
+
+        self.token_spend[mask] += token_cost
+        self.api_spend[mask] += api_cost
+        self.simulation_spend[mask] += run_cost
+        self.total_cost[mask] += charge
+        self.balance[mask] -= charge
+        return charge
+
+    def apply_burn_rate(self, mask: np.ndarray, hours: float) -> np.ndarray:
+        burn_cost = self.burn_rate[mask] * hours
+        self.total_cost[mask] += burn_cost
+        self.balance[mask] -= burn_cost
+        self.survival_time_hours[mask] += hours
+        return burn_cost
+
+    def reward(self, mask: np.ndarray, quality_scores: np.ndarray, impact_factor: float) -> np.ndarray:
+        payments = quality_scores[mask] * impact_factor
+        self.rewards_earned[mask] += payments
+        self.balance[mask] += payments
+        priced = mask & (self.total_cost > 0)
+        self.profit_margin[priced] = (self.rewards_earned[priced] - self.total_cost[priced]) / self.total_cost[priced]
+        return payments
+
+    def invest_in_upgrade(self, mask: np.ndarray, expected_roi: np.ndarray) -> np.ndarray:
+        cost = self.config["investment"]["skill_upgrade_cost"]
+        funded = mask & (self.balance >= cost)
+
+        self.balance[funded] -= cost
+        self.total_cost[funded] += cost
+        for index in np.flatnonzero(funded):
+            self.roi_history[index].append(float(expected_roi[index]))
+        self.reputation_score[funded] += np.minimum(5.0, expected_roi[funded] * 10)
+        return funded
+
+    def quality_scores(self, door_to_doctor: np.ndarray, length_of_stay: np.ndarray, throughput: np.ndarray, error_rate: np.ndarray) -> np.ndarray:
+        door_m, los_m, throughput_m, safety_m = self._multipliers
+        door_component = np.maximum(0, 1 - (door_to_doctor / 6)) * door_m
+        los_component = np.maximum(0, 1 - (length_of_stay / 14)) * los_m
+        throughput_component = np.minimum(1.5, throughput / 100) * throughput_m
+        safety_component = np.maximum(0, 1 - error_rate) * safety_m
+        raw = (door_component + los_component + throughput_component + safety_component) / 4
+        # Python's round() is correctly rounded; np.round is not, so keep the scalar rounding.
+        return np.array([round(value, 4) for value in raw.tolist()])
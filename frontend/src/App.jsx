@@ -1,20 +1,46 @@
-import { useMemo, useState } from 'react'
+import { useState } from 'react'
 import KPICard from './components/KPICard'
-import { runSimulation } from './services/api'
+import Sparkline from './components/Sparkline'
+import { fetchTimeSeries, streamSimulation } from './services/api'
 
-const defaultData = { rounds: 0, leaderboard: [], results: [] }
+const defaultData = { rounds: 0, leaderboard: [], latest: null }
+const TREND_METRICS = ['balance', 'door_to_doctor', 'throughput']
 
 export default function App() {
   const [data, setData] = useState(defaultData)
   const [loading, setLoading] = useState(false)
+  const [trends, setTrends] = useState(null)
 
-  const latest = useMemo(() => data.results[data.results.length - 1], [data.results])
+  const latest = data.latest
+  const latestLogs = (latest && data.decision_logs?.[latest.agent_name]) ?? latest?.decision_logs ?? []
 
   const handleRun = async () => {
     setLoading(true)
+    setData(defaultData)
+    setTrends(null)
+    // Trend lines come downsampled from the server, refreshed as each round is stored.
+    let runId = null
+    let currentRound = 0
+    const refreshTrends = () => {
+      if (runId) fetchTimeSeries(runId, { points: 48, metrics: TREND_METRICS }).then(setTrends).catch(console.error)
+    }
     try {
-      const result = await runSimulation({ rounds: 3 })
-      setData(result)
+      await streamSimulation({ rounds: 3, response_mode: 'compact' }, (frame) => {
+        if (frame.type === 'run') {
+          runId = frame.data.run_id
+        } else if (frame.type === 'round_result') {
+          // The first result of a round means the previous round has been stored.
+          if (frame.data.round !== currentRound) {
+            currentRound = frame.data.round
+            if (currentRound > 1) refreshTrends()
+          }
+          // Only the newest result is rendered, so a long run does not accumulate frames.
+          setData((prev) => ({ ...prev, latest: frame.data }))
+        } else if (frame.type === 'leaderboard') {
+          setData((prev) => ({ ...prev, ...frame.data }))
+          refreshTrends()
+        }
+      })
     } catch (error) {
       console.error(error)
     } finally {
@@ -43,6 +69,20 @@ export default function App() {
             <KPICard label="Error Rate" value={`${(latest.kpis.error_rate * 100).toFixed(1)}%`} />
           </section>
 
+          {trends && (
+            <section className="panel">
+              <h3>Trends (through round {trends.rounds_completed})</h3>
+              {Object.entries(trends.agents).map(([name, series]) => (
+                <div key={name}>
+                  <h4>{name}</h4>
+                  {TREND_METRICS.map((metric) => (
+                    <Sparkline key={metric} label={metric} series={series[metric]} />
+                  ))}
+                </div>
+              ))}
+            </section>
+          )}
+
           <section className="panel">
             <h3>Leaderboard</h3>
             <pre>{JSON.stringify(data.leaderboard, null, 2)}</pre>
@@ -51,7 +91,7 @@ export default function App() {
           <section className="panel">
             <h3>Decision Logs (Latest Agent)</h3>
             <ul>
-              {latest.decision_logs.map((log, idx) => (
+              {latestLogs.map((log, idx) => (
                 <li key={idx}>{log.action}: {log.reason} (ROI {log.expected_roi})</li>
               ))}
             </ul>
@@ -0,0 +1,22 @@
+export default function Sparkline({ label, series, width = 160, height = 40 }) {
+  if (!series || series.value.length === 0) return null
+
+  const { round, value } = series
+  const minX = round[0]
+  const spanX = round[round.length - 1] - minX || 1
+  const minY = Math.min(...value)
+  const spanY = Math.max(...value) - minY || 1
+  const points = value
+    .map((v, i) => `${((round[i] - minX) / spanX) * width},${height - ((v - minY) / spanY) * height}`)
+    .join(' ')
+
+  return (
+    <div className="sparkline">
+      <span>{label}</span>
+      <svg width={width} height={height} viewBox={`0 0 ${width} ${height}`}>
+        <polyline points={points} fill="none" stroke="currentColor" strokeWidth="1.5" />
+      </svg>
+      <span>{value[value.length - 1]}</span>
+    </div>
+  )
+}
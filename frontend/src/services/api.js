@@ -13,3 +13,87 @@ export async function runSimulation(payload = {}) {
 
   return response.json()
 }
+
+const COLUMNAR_MEDIA_TYPE = 'application/vnd.hospital-lab.columnar'
+const TYPED_ARRAYS = { '<f8': Float64Array, '<i4': Int32Array, u1: Uint8Array }
+
+// Layout written by backend/app/services/columnar.py: "HLC1", uint32 header length,
+// JSON header, then 8-byte aligned little-endian column arrays.
+export function decodeColumnar(buffer) {
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+  if (magic !== 'HLC1') {
+    throw new Error('Not a columnar simulation payload')
+  }
+  const headerLength = view.getUint32(4, true)
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)))
+  const dataStart = 8 + headerLength
+  const columns = {}
+  header.columns.forEach(({ name, dtype, offset }) => {
+    columns[name] = new TYPED_ARRAYS[dtype](buffer, dataStart + offset, header.length)
+  })
+  return { ...header, columns }
+}
+
+export function agentSeries(table, agentName, column) {
+  const agent = table.agents.indexOf(agentName)
+  const { round, agent: agents } = table.columns
+  const values = table.columns[column]
+  const series = []
+  for (let i = 0; i < table.length; i += 1) {
+    if (agents[i] === agent) series.push({ round: round[i], value: values[i] })
+  }
+  return series
+}
+
+export async function runSimulationColumnar(payload = {}) {
+  const response = await fetch(`${API_BASE}/simulate`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: COLUMNAR_MEDIA_TYPE },
+    body: JSON.stringify(payload)
+  })
+
+  if (!response.ok) {
+    throw new Error('Failed to run simulation')
+  }
+
+  return decodeColumnar(await response.arrayBuffer())
+}
+
+export async function fetchTimeSeries(runId, { points = 64, metrics = ['balance'] } = {}) {
+  const params = new URLSearchParams({ points: String(points) })
+  metrics.forEach((metric) => params.append('metrics', metric))
+  const response = await fetch(`${API_BASE}/history/runs/${runId}/timeseries?${params}`)
+
+  if (!response.ok) {
+    throw new Error('Failed to load time series')
+  }
+
+  return response.json()
+}
+
+export async function streamSimulation(payload = {}, onFrame = () => {}) {
+  const response = await fetch(`${API_BASE}/simulate/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload)
+  })
+
+  if (!response.ok || !response.body) {
+    throw new Error('Failed to stream simulation')
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    lines.filter(Boolean).forEach((line) => onFrame(JSON.parse(line)))
+  }
+  if (buffer.trim()) {
+    onFrame(JSON.parse(buffer))
+  }
+}
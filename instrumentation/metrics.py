@@ -0,0 +1,254 @@
+"""In-process counters, phase timers and histograms with Prometheus text exposition.
+
+Set ``HOSPITAL_LAB_METRICS=0`` (or call ``set_enabled(False)``) to turn collection off;
+every recording call then returns immediately and ``timer`` hands back a shared no-op
+context manager. Hot paths should bind their series once with ``counter``, ``summary``
+and ``phases``, which sort labels at bind time, and guard any work done only to compute
+a value with ``enabled()``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from operator import sub
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASE_BATCH = 256
+
+_enabled = os.environ.get("HOSPITAL_LAB_METRICS", "1") != "0"
+_lock = threading.Lock()
+_counters: dict[str, dict[tuple, float]] = defaultdict(lambda: defaultdict(float))
+_summaries: dict[str, dict[tuple, list[float]]] = defaultdict(dict)
+_histograms: dict[str, dict[tuple, list[float]]] = defaultdict(dict)
+_phase_series: list[Phases] = []
+_NOOP = nullcontext()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(flag: bool) -> None:
+    global _enabled
+    _enabled = flag
+
+
+def reset() -> None:
+    for phases in _phase_series:
+        phases._pending.clear()
+    with _lock:
+        _counters.clear()
+        _summaries.clear()
+        _histograms.clear()
+
+
+def drain() -> dict:
+    """Everything recorded in this process so far, which is then reset; see ``merge``.
+
+    Pool workers return this with each task's result, so the parent process reports the
+    work they did.
+    """
+    for phases in _phase_series:
+        phases._drain()
+    with _lock:
+        recorded = {
+            "counters": {name: dict(series) for name, series in _counters.items()},
+            "summaries": {name: dict(series) for name, series in _summaries.items()},
+            "histograms": {name: dict(series) for name, series in _histograms.items()},
+        }
+        _counters.clear()
+        _summaries.clear()
+        _histograms.clear()
+    return recorded
+
+
+def merge(recorded: dict) -> None:
+    """Add values ``drain`` took in another process to this one."""
+    with _lock:
+        for name, series in recorded["counters"].items():
+            for key, value in series.items():
+                _counters[name][key] += value
+        for name, series in recorded["summaries"].items():
+            for key, (seconds, count) in series.items():
+                total = _summaries[name].setdefault(key, [0.0, 0])
+                total[0] += seconds
+                total[1] += count
+        for name, series in recorded["histograms"].items():
+            for key, values in series.items():
+                totals = _histograms[name].setdefault(key, [0] * (len(DEFAULT_BUCKETS) + 1) + [0.0, 0])
+                totals[:] = map(sum, zip(totals, values))
+
+
+def inc(name: str, value: float = 1, **labels: str) -> None:
+    if not _enabled:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _counters[name][key] += value
+
+
+def _record(name: str, key: tuple, seconds: float) -> None:
+    with _lock:
+        total = _summaries[name].setdefault(key, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Add one observation to a histogram with ``DEFAULT_BUCKETS``."""
+    if not _enabled:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        # Per-bucket (non-cumulative) counts, then sum and count.
+        series = _histograms[name].setdefault(key, [0] * (len(DEFAULT_BUCKETS) + 1) + [0.0, 0])
+        series[bisect_left(DEFAULT_BUCKETS, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+
+class _Timer:
+    __slots__ = ("name", "key", "start")
+
+    def __init__(self, name: str, key: tuple) -> None:
+        self.name = name
+        self.key = key
+
+    def __enter__(self) -> _Timer:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _record(self.name, self.key, time.perf_counter() - self.start)
+
+
+def timer(name: str, **labels: str) -> _Timer | nullcontext:
+    """Context manager that records its elapsed seconds into summary ``name``."""
+    if not _enabled:
+        return _NOOP
+    return _Timer(name, tuple(sorted(labels.items())))
+
+
+class Counter:
+    """One counter series with its labels bound up front."""
+
+    __slots__ = ("name", "key")
+
+    def __init__(self, name: str, key: tuple) -> None:
+        self.name = name
+        self.key = key
+
+    def inc(self, value: float = 1) -> None:
+        if not _enabled:
+            return
+        with _lock:
+            _counters[self.name][self.key] += value
+
+
+class Summary:
+    """One summary series with its labels bound up front."""
+
+    __slots__ = ("name", "key")
+
+    def __init__(self, name: str, key: tuple) -> None:
+        self.name = name
+        self.key = key
+
+    def time(self) -> _Timer | nullcontext:
+        """Like ``timer(name, **labels)`` without re-keying the labels on every call."""
+        if not _enabled:
+            return _NOOP
+        return _Timer(self.name, self.key)
+
+
+class Phases:
+    """Consecutive phases of one code path, timed from shared timestamps.
+
+    ``record(t0, t1, ..., tn)`` takes ``perf_counter()`` readings at the start of each
+    phase and the end of the last. Each phase needs its own label value, since every series
+    counts one observation per record. Records are queued without taking the lock and
+    folded into the summary in batches, and whenever the metrics are rendered.
+    """
+
+    __slots__ = ("name", "keys", "_pending")
+
+    def __init__(self, name: str, keys: tuple[tuple, ...]) -> None:
+        self.name = name
+        self.keys = keys
+        self._pending: deque[tuple[float, ...]] = deque()
+        _phase_series.append(self)
+
+    def record(self, *stamps: float) -> None:
+        if not _enabled:
+            return
+        self._pending.append(stamps)
+        if len(self._pending) >= PHASE_BATCH:
+            self._drain()
+
+    def _drain(self) -> None:
+        batch = []
+        try:
+            while True:
+                batch.append(self._pending.popleft())
+        except IndexError:
+            pass
+        if not batch:
+            return
+        columns = list(zip(*batch))
+        with _lock:
+            series = _summaries[self.name]
+            for key, starts, ends in zip(self.keys, columns, columns[1:]):
+                total = series.setdefault(key, [0.0, 0])
+                total[0] += sum(map(sub, ends, starts))
+                total[1] += len(batch)
+
+
+def counter(name: str, **labels: str) -> Counter:
+    return Counter(name, tuple(sorted(labels.items())))
+
+
+def summary(name: str, **labels: str) -> Summary:
+    return Summary(name, tuple(sorted(labels.items())))
+
+
+def phases(name: str, label: str, values: tuple[str, ...]) -> Phases:
+    """Summary ``name`` with one series per entry of ``values`` under ``label``, in order."""
+    return Phases(name, tuple(((label, value),) for value in values))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render() -> str:
+    """Current values in the Prometheus text exposition format (version 0.0.4)."""
+    for phases in _phase_series:
+        phases._drain()
+    lines: list[str] = []
+    with _lock:
+        for name, series in sorted(_counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in sorted(series.items()))
+        for name, series in sorted(_summaries.items()):
+            lines.append(f"# TYPE {name} summary")
+            for key, (total, count) in sorted(series.items()):
+                lines.append(f"{name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+        for name, series in sorted(_histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for key, values in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(DEFAULT_BUCKETS + ("+Inf",), values):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {values[-2]}")
+                lines.append(f"{name}_count{_format_labels(key)} {values[-1]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,231 @@
+"""Closed-form KPI estimates for a shift, calibrated against the simulator.
+
+The simulator is not an M/M/c system: arrivals are a fixed ``patients_per_hour``, and
+servers are an hourly start capacity ``_hourly_capacity(resources, disruption,
+workflow_efficiency)`` that treatment time does not consume. Its natural analytic model
+is a fluid priority queue. Each hour, the expected starts per acuity class are taken over
+the distribution of active disruption events, highest acuity first. Treatment times
+follow the engine's truncated-normal service model. What the fluid model misses (random
+backlogs, the service-time ordering within a class) is absorbed by per-KPI correction
+factors fitted by ``QueueingEstimator.calibrate``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import product
+from math import comb
+from statistics import NormalDist
+from typing import Sequence
+
+import numpy as np
+
+from simulation.batch import simulate_batch
+from simulation.engine import ERSimulationEngine
+from simulation.entities import KPIResult, Resources
+
+ACUITY_LEVELS = (5, 4, 3, 2, 1)  # treatment order
+SERVICE_SIGMA = 0.35
+SERVICE_FLOOR = 0.4
+CALIBRATED_KPIS = ("door_to_doctor", "length_of_stay", "throughput", "error_rate")
+DEFAULT_SCENARIOS = tuple(
+    (Resources(beds=beds, nurses=nurses, doctors=doctors), triage, 1.0)
+    for doctors in (1, 2, 4, 6)
+    for nurses in (1, 3, 12)
+    for beds in (1, 20)
+    for triage in (1.0, 1.3)
+)
+
+
+@dataclass
+class CalibrationReport:
+    """Fitted factors and the estimator's error against simulated means, before and after fitting."""
+
+    factors: dict[str, float]
+    scenarios: int
+    shifts_per_scenario: int
+    mean_abs_error_raw: dict[str, float]
+    mean_abs_error: dict[str, float]
+    max_abs_error: dict[str, float]
+    simulated_means: dict[str, float] = field(default_factory=dict)
+
+
+class QueueingEstimator:
+    """Predicts ``ERSimulationEngine.run`` KPIs without simulating patients."""
+
+    def __init__(self, shift_hours: int, patients_per_hour: int, event_probabilities: dict[str, float]):
+        self.shift_hours = shift_hours
+        self.patients_per_hour = patients_per_hour
+        self.event_probabilities = event_probabilities
+        self.factors = {name: 1.0 for name in CALIBRATED_KPIS}
+        self.report: CalibrationReport | None = None
+        self._states = [self._disruption_states(hour) for hour in range(shift_hours)]
+        # E[min(duration, hours_left)] per (acuity, disruption), indexed by hours_left.
+        self._stay = {
+            (acuity, disruption): self._expected_stays(acuity, disruption)
+            for states in self._states
+            for _, disruption in states
+            for acuity in ACUITY_LEVELS
+        }
+        # Shortcut for staffing that never queues: every patient starts in their arrival hour.
+        self._worst_disruption = max(disruption for states in self._states for _, disruption in states)
+        self._disruption_hours: dict[float, float] = {}
+        self._unqueued_stay = 0.0
+        for hour, states in enumerate(self._states):
+            for probability, disruption in states:
+                self._disruption_hours[disruption] = self._disruption_hours.get(disruption, 0.0) + probability
+                self._unqueued_stay += probability * sum(self._stay[(a, disruption)][shift_hours - hour] for a in ACUITY_LEVELS)
+        self._unqueued_stay /= shift_hours * len(ACUITY_LEVELS)
+
+    def _disruption_states(self, hour: int) -> list[tuple[float, float]]:
+        """(probability, disruption) pairs for ``hour``; each event kind's active count is binomial."""
+        per_kind = []
+        for name, (severity, duration) in ERSimulationEngine.EVENT_PROFILES.items():
+            p = self.event_probabilities.get(name, 0.0)
+            trials = min(duration, hour + 1)
+            per_kind.append([(comb(trials, k) * p**k * (1 - p) ** (trials - k), severity * k) for k in range(trials + 1)])
+        states: dict[float, float] = {}
+        for combo in product(*per_kind):
+            probability = float(np.prod([c[0] for c in combo]))
+            disruption = round(1 + sum(c[1] for c in combo), 9)
+            states[disruption] = states.get(disruption, 0.0) + probability
+        return [(probability, disruption) for disruption, probability in states.items() if probability > 0]
+
+    def _expected_stays(self, acuity: int, disruption: float) -> list[float]:
+        # duration = max(1, round(S * disruption)), S = max(0.4, N(mu, sigma)), so
+        # P(duration <= j) = P(S < (j + 0.5) / disruption) for j >= 1.
+        normal = NormalDist(1.3 + acuity * 0.25, SERVICE_SIGMA)
+        stays = [0.0]
+        below = 0.0
+        for hours_left in range(1, self.shift_hours + 1):
+            stays.append(hours_left - below)
+            bound = (hours_left + 0.5) / disruption
+            below += normal.cdf(bound) if bound > SERVICE_FLOOR else 0.0
+        return stays
+
+    def estimate(self, resources: Resources, triage_efficiency: float = 1.0, workflow_efficiency: float = 1.0) -> KPIResult:
+        raw = self._raw(resources, triage_efficiency, workflow_efficiency)
+        if raw is None:
+            return KPIResult(0.0, 0.0, 0, 1.0, 0, self.shift_hours * self.patients_per_hour)
+        arrived = self.shift_hours * self.patients_per_hour
+        treated = int(round(min(arrived, raw["throughput"] * self.factors["throughput"])))
+        return KPIResult(
+            door_to_doctor=round(max(0.0, raw["door_to_doctor"] * self.factors["door_to_doctor"]), 2),
+            length_of_stay=round(max(1.0, raw["length_of_stay"] * self.factors["length_of_stay"]), 2),
+            throughput=treated,
+            error_rate=round(min(1.0, raw["error_rate"] * self.factors["error_rate"]), 3),
+            treated_patients=treated,
+            untreated_patients=arrived - treated,
+        )
+
+    def _raw(self, resources: Resources, triage_efficiency: float, workflow_efficiency: float) -> dict[str, float] | None:
+        hours = self.shift_hours
+        arrivals = self.patients_per_hour / len(ACUITY_LEVELS)
+        gross = ERSimulationEngine._gross_capacity(resources) * workflow_efficiency
+        if int(gross / self._worst_disruption) >= self.patients_per_hour:
+            return {
+                "door_to_doctor": 0.0,
+                "length_of_stay": self._unqueued_stay,
+                "throughput": float(hours * self.patients_per_hour),
+                "error_rate": sum(
+                    weight * min(0.5, 0.015 * disruption * (1 / triage_efficiency)) for disruption, weight in self._disruption_hours.items()
+                )
+                / hours,
+            }
+        backlog = dict.fromkeys(ACUITY_LEVELS, 0.0)
+        # Total hours already waited by each class's backlog. Within a class the queue is
+        # ordered by service time, not arrival, so starts draw from it in proportion.
+        age = dict.fromkeys(ACUITY_LEVELS, 0.0)
+        treated = waited = stayed = errors = 0.0
+
+        for hour in range(hours):
+            for acuity in ACUITY_LEVELS:
+                backlog[acuity] += arrivals
+            starts = dict.fromkeys(ACUITY_LEVELS, 0.0)
+            for probability, disruption in self._states[hour]:
+                capacity = float(max(1, int(gross / disruption)))
+                error_probability = min(0.5, 0.015 * disruption * (1 / triage_efficiency))
+                for acuity in ACUITY_LEVELS:
+                    served = min(backlog[acuity], capacity)
+                    if served <= 0:
+                        break
+                    capacity -= served
+                    weighted = probability * served
+                    starts[acuity] += weighted
+                    stayed += weighted * self._stay[(acuity, disruption)][hours - hour]
+                    errors += weighted * error_probability
+            for acuity in ACUITY_LEVELS:
+                if starts[acuity] > 0:
+                    share = starts[acuity] / backlog[acuity]
+                    waited += share * age[acuity]
+                    age[acuity] -= share * age[acuity]
+                    backlog[acuity] -= starts[acuity]
+                    treated += starts[acuity]
+                age[acuity] += backlog[acuity]
+
+        if treated <= 0:
+            return None
+        return {
+            "door_to_doctor": waited / treated,
+            "length_of_stay": (waited + stayed) / treated,
+            "throughput": treated,
+            "error_rate": errors / treated,
+        }
+
+    def calibrate(
+        self,
+        scenarios: Sequence[tuple[Resources, float, float]] = DEFAULT_SCENARIOS,
+        shifts_per_scenario: int = 64,
+    ) -> CalibrationReport:
+        """Fit one multiplicative factor per KPI against mean simulated KPIs and install it.
+
+        Every scenario (resources, triage efficiency, workflow efficiency) is simulated for
+        ``shifts_per_scenario`` seeds with ``simulate_batch``. Seeds are fixed, so the same
+        scenarios always give the same factors.
+        """
+        n = len(scenarios)
+        seeds = list(range(shifts_per_scenario)) * n
+
+        def repeat(values: list[float]) -> np.ndarray:
+            return np.repeat(np.asarray(values, dtype=np.float64), shifts_per_scenario)
+
+        batch = simulate_batch(
+            shift_hours=self.shift_hours,
+            patients_per_hour=self.patients_per_hour,
+            event_probabilities=self.event_probabilities,
+            event_profiles=ERSimulationEngine.EVENT_PROFILES,
+            seeds=seeds,
+            gross_capacities=repeat([ERSimulationEngine._gross_capacity(r) for r, _, _ in scenarios]),
+            triage_efficiencies=repeat([t for _, t, _ in scenarios]),
+            workflow_efficiencies=repeat([w for _, _, w in scenarios]),
+        )
+        simulated = {name: getattr(batch, name).astype(np.float64).reshape(n, shifts_per_scenario).mean(axis=1) for name in CALIBRATED_KPIS}
+        raw_rows = [self._raw(*scenario) or {name: 0.0 for name in CALIBRATED_KPIS} for scenario in scenarios]
+        raw = {name: np.array([row[name] for row in raw_rows]) for name in CALIBRATED_KPIS}
+
+        factors, mean_raw, mean_fit, max_fit = {}, {}, {}, {}
+        for name in CALIBRATED_KPIS:
+            # Least squares through the origin: min sum (sim - f * est)^2, kept only if it
+            # also lowers the mean absolute error.
+            denominator = float(raw[name] @ raw[name])
+            factor = float(raw[name] @ simulated[name]) / denominator if denominator > 0 else 1.0
+            raw_error = np.abs(simulated[name] - raw[name])
+            fitted_error = np.abs(simulated[name] - factor * raw[name])
+            if fitted_error.mean() > raw_error.mean():
+                factor, fitted_error = 1.0, raw_error
+            factors[name] = round(factor, 6)
+            mean_raw[name] = round(float(raw_error.mean()), 4)
+            mean_fit[name] = round(float(fitted_error.mean()), 4)
+            max_fit[name] = round(float(fitted_error.max()), 4)
+
+        self.factors = factors
+        self.report = CalibrationReport(
+            factors=factors,
+            scenarios=n,
+            shifts_per_scenario=shifts_per_scenario,
+            mean_abs_error_raw=mean_raw,
+            mean_abs_error=mean_fit,
+            max_abs_error=max_fit,
+            simulated_means={name: round(float(simulated[name].mean()), 4) for name in CALIBRATED_KPIS},
+        )
+        return self.report
@@ -0,0 +1,146 @@
+"""Vectorized many-shift simulation backing ``ERSimulationEngine.run_batch``."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from simulation.entities import KPIResult
+
+
+@dataclass
+class BatchKPIResult:
+    """KPI arrays for a batch of shifts, indexed by shift (unrounded)."""
+
+    door_to_doctor: np.ndarray
+    length_of_stay: np.ndarray
+    throughput: np.ndarray
+    error_rate: np.ndarray
+    treated_patients: np.ndarray
+    untreated_patients: np.ndarray
+    events_fired: np.ndarray
+    event_names: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.throughput)
+
+    def to_kpi_results(self) -> list[KPIResult]:
+        results: list[KPIResult] = []
+        for i in range(len(self)):
+            hours, kinds = np.nonzero(self.events_fired[i])
+            results.append(
+                KPIResult(
+                    door_to_doctor=round(float(self.door_to_doctor[i]), 2),
+                    length_of_stay=round(float(self.length_of_stay[i]), 2),
+                    throughput=int(self.throughput[i]),
+                    error_rate=round(float(self.error_rate[i]), 3),
+                    treated_patients=int(self.treated_patients[i]),
+                    untreated_patients=int(self.untreated_patients[i]),
+                    event_log=[f"Hour {h}: {self.event_names[k]}" for h, k in zip(hours, kinds)],
+                )
+            )
+        return results
+
+
+def _per_shift(values: float | Sequence[float], n_shifts: int) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 0:
+        return np.full(n_shifts, float(array))
+    if array.shape != (n_shifts,):
+        raise ValueError(f"expected a scalar or {n_shifts} values, got shape {array.shape}")
+    return array
+
+
+def simulate_batch(
+    shift_hours: int,
+    patients_per_hour: int,
+    event_probabilities: dict[str, float],
+    event_profiles: dict[str, tuple[float, int]],
+    seeds: Sequence[int | None],
+    gross_capacities: float | Sequence[float],
+    triage_efficiencies: float | Sequence[float] = 1.0,
+    workflow_efficiencies: float | Sequence[float] = 1.0,
+) -> BatchKPIResult:
+    """Simulate ``len(seeds)`` independent shifts with one hourly loop over 2-D arrays.
+
+    Each shift draws from its own ``numpy`` generator seeded with its entry in ``seeds``,
+    so a shift's outcome depends only on its seed and inputs, not on the batch it is in.
+    The queue discipline, event model, treatment durations and error model are the same
+    as ``ERSimulationEngine.run``; only the random streams differ, so KPIs agree with the
+    scalar path in distribution rather than draw for draw.
+    """
+    n_shifts = len(seeds)
+    n_patients = shift_hours * patients_per_hour
+    event_names = tuple(event_profiles)
+    severities = np.array([event_profiles[name][0] for name in event_names])
+    durations = [event_profiles[name][1] for name in event_names]
+    probabilities = np.array([event_probabilities.get(name, 0.0) for name in event_names])
+
+    gross = _per_shift(gross_capacities, n_shifts)
+    triage = _per_shift(triage_efficiencies, n_shifts)
+    workflow = _per_shift(workflow_efficiencies, n_shifts)
+
+    acuity = np.empty((n_shifts, n_patients), dtype=np.int64)
+    noise = np.empty((n_shifts, n_patients))
+    error_draws = np.empty((n_shifts, n_patients))
+    event_draws = np.empty((n_shifts, shift_hours, len(event_names)))
+    for i, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        acuity[i] = rng.integers(1, 6, n_patients)
+        noise[i] = rng.standard_normal(n_patients)
+        event_draws[i] = rng.random((shift_hours, len(event_names)))
+        error_draws[i] = rng.random(n_patients)
+
+    service_time = np.maximum(0.4, 1.3 + acuity * 0.25 + 0.35 * noise)
+    arrival = np.broadcast_to(np.repeat(np.arange(shift_hours), patients_per_hour), (n_shifts, n_patients))
+
+    # Priority is static per patient, so order every shift's columns once by
+    # (acuity desc, service time asc, arrival order) and select by running count.
+    order = np.lexsort((service_time, -acuity), axis=-1)
+    service_time = np.take_along_axis(service_time, order, axis=1)
+    arrival = np.take_along_axis(arrival, order, axis=1)
+    error_draws = np.take_along_axis(error_draws, order, axis=1)
+
+    # Sum active severities oldest-first, matching the scalar event list order.
+    events_fired = event_draws < probabilities
+    severity_total = np.zeros((n_shifts, shift_hours))
+    for lag in range(max(durations, default=1) - 1, -1, -1):
+        for k, duration in enumerate(durations):
+            if duration > lag:
+                severity_total[:, lag:] += severities[k] * events_fired[:, : shift_hours - lag, k]
+    disruption = 1 + severity_total
+    capacity = np.maximum(1, np.floor(gross[:, None] * workflow[:, None] / disruption)).astype(np.int64)
+    error_threshold = np.minimum(0.5, 0.015 * disruption * (1 / triage[:, None]))
+
+    started = np.full((n_shifts, n_patients), -1, dtype=np.int64)
+    completed = np.zeros((n_shifts, n_patients), dtype=np.int64)
+    has_error = np.zeros((n_shifts, n_patients), dtype=bool)
+    waiting = np.zeros((n_shifts, n_patients), dtype=bool)
+    for hour in range(shift_hours):
+        waiting |= arrival == hour
+        treat = waiting & (np.cumsum(waiting, axis=1) <= capacity[:, hour, None])
+        duration = np.maximum(1, np.rint(service_time * disruption[:, hour, None])).astype(np.int64)
+        started[treat] = hour
+        completed = np.where(treat, np.minimum(shift_hours, hour + duration), completed)
+        has_error |= treat & (error_draws < error_threshold[:, hour, None])
+        waiting &= ~treat
+
+    treated = started >= 0
+    treated_count = treated.sum(axis=1)
+    safe_count = np.maximum(treated_count, 1)
+    door_to_doctor = np.where(treated, started - arrival, 0).sum(axis=1) / safe_count
+    length_of_stay = np.where(treated, completed - arrival, 0).sum(axis=1) / safe_count
+    error_rate = np.where(treated_count > 0, has_error.sum(axis=1) / safe_count, 1.0)
+
+    return BatchKPIResult(
+        door_to_doctor=door_to_doctor,
+        length_of_stay=length_of_stay,
+        throughput=treated_count,
+        error_rate=error_rate,
+        treated_patients=treated_count,
+        untreated_patients=n_patients - treated_count,
+        events_fired=events_fired,
+        event_names=event_names,
+    )
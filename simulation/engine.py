@@ -1,30 +1,79 @@
 from __future__ import annotations
 
 import random
-from dataclasses import asdict
+import time
+from dataclasses import fields, replace
+from functools import partial
+from typing import Sequence
 
-from simulation.entities import KPIResult, Patient, RandomEvent, Resources
+from instrumentation import metrics
+from simulation.batch import BatchKPIResult, simulate_batch
+from simulation.entities import KPIResult, Patient, PatientCohort, RandomEvent, Resources
+from simulation.streams import RANDOM_STREAM_MODES, RandomStreams
+from simulation.triage_queue import TriageQueue
+
+_RUN_PHASES = metrics.phases("simulation_phase_seconds", "phase", ("patient_generation", "queue_processing", "kpi_aggregation"))
+_STREAMING_PHASES = metrics.phases("simulation_phase_seconds", "phase", ("patient_generation", "queue_processing"))
+_SHIFTS = metrics.counter("simulation_shifts_total")
+_PATIENTS_ARRIVED = metrics.counter("simulation_patients_arrived_total")
+_PATIENTS_TREATED = metrics.counter("simulation_patients_treated_total")
 
 
 class ERSimulationEngine:
     """Time-based ER simulation with queueing and disruption events."""
 
-    def __init__(self, shift_hours: int, patients_per_hour: int, event_probabilities: dict[str, float], seed: int | None = None):
+    # Event name -> (severity, duration in hours), checked in this order every hour.
+    EVENT_PROFILES: dict[str, tuple[float, int]] = {
+        "mass_casualty": (0.45, 2),
+        "system_outage": (0.7, 1),
+    }
+
+    def __init__(
+        self,
+        shift_hours: int,
+        patients_per_hour: int,
+        event_probabilities: dict[str, float],
+        seed: int | None = None,
+        random_streams: str = "single",
+    ):
+        """``random_streams`` is ``single`` (one RNG), ``common`` (a ``RandomStreams`` stream per
+        source, for common random numbers) or ``antithetic`` (the same streams mirrored)."""
+        if random_streams not in RANDOM_STREAM_MODES:
+            raise ValueError(f"unknown random_streams mode: {random_streams}")
         self.shift_hours = shift_hours
         self.patients_per_hour = patients_per_hour
         self.event_probabilities = event_probabilities
         self._rng = random.Random(seed)
+        self._streams = None if random_streams == "single" else RandomStreams(seed, antithetic=random_streams == "antithetic")
+        self._event_uniform = self._rng.random if self._streams is None else partial(self._streams.uniform, "events")
 
-    def run(self, resources: Resources, triage_efficiency: float = 1.0, workflow_efficiency: float = 1.0) -> KPIResult:
-        all_patients = self._generate_patients()
+    def generate_cohort(self) -> PatientCohort:
+        patients = self._generate_patients()
+        return PatientCohort(patients=tuple(patients), rng_state=self._rng.getstate())
+
+    def run(
+        self,
+        resources: Resources,
+        triage_efficiency: float = 1.0,
+        workflow_efficiency: float = 1.0,
+        cohort: PatientCohort | None = None,
+    ) -> KPIResult:
+        """Simulate one shift; a ``cohort`` from ``generate_cohort`` on the same seed skips regeneration."""
+        started = time.perf_counter()
+        if cohort is None:
+            all_patients = self._generate_patients()
+        else:
+            all_patients = [replace(patient) for patient in cohort.patients]
+            self._rng.setstate(cohort.rng_state)
         arrivals_by_hour: dict[int, list[Patient]] = {hour: [] for hour in range(self.shift_hours)}
         for patient in all_patients:
             arrivals_by_hour[patient.arrival_hour].append(patient)
 
-        queue: list[Patient] = []
+        queue = TriageQueue()
         events: list[RandomEvent] = []
         event_log: list[str] = []
 
+        generated = time.perf_counter()
         for hour in range(self.shift_hours):
             queue.extend(arrivals_by_hour[hour])
             self._activate_event(hour, events, event_log)
@@ -32,64 +81,183 @@ class ERSimulationEngine:
             disruption = 1 + sum(event.severity for event in events)
             capacity = self._hourly_capacity(resources, disruption, workflow_efficiency)
 
-            queue.sort(key=lambda p: (p.acuity_level, -p.estimated_service_time), reverse=True)
-            for patient in queue[:capacity]:
+            for patient in queue.pop_many(capacity):
                 if patient.started_hour is None:
                     patient.started_hour = hour
                 treatment_duration = max(1, round(patient.estimated_service_time * disruption))
                 patient.completed_hour = min(self.shift_hours, hour + treatment_duration)
-                patient.has_error = self._rng.random() < min(0.5, 0.015 * disruption * (1 / triage_efficiency))
+                error_draw = self._rng.random() if patient.error_draw is None else patient.error_draw
+                patient.has_error = error_draw < min(0.5, 0.015 * disruption * (1 / triage_efficiency))
 
-            queue = queue[capacity:]
             self._decay_events(events)
 
+        processed = time.perf_counter()
         treated = [p for p in all_patients if p.started_hour is not None and p.completed_hour is not None]
         untreated = [p for p in all_patients if p.started_hour is None]
         if not treated:
-            return KPIResult(0.0, 0.0, 0, 1.0, 0, len(untreated), event_log)
+            result = KPIResult(0.0, 0.0, 0, 1.0, 0, len(untreated), event_log)
+        else:
+            door_to_doctor = sum((p.started_hour - p.arrival_hour) for p in treated) / len(treated)
+            length_of_stay = sum((p.completed_hour - p.arrival_hour) for p in treated) / len(treated)
+            error_rate = sum(1 for p in treated if p.has_error) / len(treated)
+            result = KPIResult(
+                door_to_doctor=round(door_to_doctor, 2),
+                length_of_stay=round(length_of_stay, 2),
+                throughput=len(treated),
+                error_rate=round(error_rate, 3),
+                treated_patients=len(treated),
+                untreated_patients=len(untreated),
+                event_log=event_log,
+            )
+        if metrics.enabled():
+            _RUN_PHASES.record(started, generated, processed, time.perf_counter())
+            _SHIFTS.inc()
+            _PATIENTS_ARRIVED.inc(len(all_patients))
+            _PATIENTS_TREATED.inc(len(treated))
+        return result
+
+    def run_streaming(self, resources: Resources, triage_efficiency: float = 1.0, workflow_efficiency: float = 1.0) -> KPIResult:
+        """Same shift and result as ``run``, keeping only the waiting backlog in memory.
+
+        Each hour's arrivals are generated just before they join the queue, and KPIs are
+        accumulated as patients are treated, so no per-patient state outlives treatment.
+        ``run`` draws every arrival before the first event roll; to reproduce that stream
+        exactly, arrivals come from a copy of the RNG while the engine's own RNG is advanced
+        past the arrival draws up front, which costs a second pass of cheap draws.
+        """
+        arrivals_rng = random.Random()
+        arrivals_rng.setstate(self._rng.getstate())
+        started = time.perf_counter()
+        if self._streams is None:
+            self._skip_patient_draws()
+
+        queue = TriageQueue()
+        events: list[RandomEvent] = []
+        event_log: list[str] = []
+        treated = errors = wait_hours = stay_hours = 0
+
+        skipped = time.perf_counter()
+        for hour in range(self.shift_hours):
+            queue.extend(self._patients_for_hour(arrivals_rng, hour))
+            self._activate_event(hour, events, event_log)
+
+            disruption = 1 + sum(event.severity for event in events)
+            capacity = self._hourly_capacity(resources, disruption, workflow_efficiency)
+
+            for patient in queue.pop_many(capacity):
+                treatment_duration = max(1, round(patient.estimated_service_time * disruption))
+                treated += 1
+                wait_hours += hour - patient.arrival_hour
+                stay_hours += min(self.shift_hours, hour + treatment_duration) - patient.arrival_hour
+                error_draw = self._rng.random() if patient.error_draw is None else patient.error_draw
+                errors += error_draw < min(0.5, 0.015 * disruption * (1 / triage_efficiency))
 
-        door_to_doctor = sum((p.started_hour - p.arrival_hour) for p in treated) / len(treated)
-        length_of_stay = sum((p.completed_hour - p.arrival_hour) for p in treated) / len(treated)
-        error_rate = sum(1 for p in treated if p.has_error) / len(treated)
+            self._decay_events(events)
 
+        arrived = self.shift_hours * self.patients_per_hour
+        if metrics.enabled():
+            _STREAMING_PHASES.record(started, skipped, time.perf_counter())
+            _SHIFTS.inc()
+            _PATIENTS_ARRIVED.inc(arrived)
+            _PATIENTS_TREATED.inc(treated)
+        if not treated:
+            return KPIResult(0.0, 0.0, 0, 1.0, 0, arrived, event_log)
         return KPIResult(
-            door_to_doctor=round(door_to_doctor, 2),
-            length_of_stay=round(length_of_stay, 2),
-            throughput=len(treated),
-            error_rate=round(error_rate, 3),
-            treated_patients=len(treated),
-            untreated_patients=len(untreated),
+            door_to_doctor=round(wait_hours / treated, 2),
+            length_of_stay=round(stay_hours / treated, 2),
+            throughput=treated,
+            error_rate=round(errors / treated, 3),
+            treated_patients=treated,
+            untreated_patients=arrived - treated,
             event_log=event_log,
         )
 
+    def run_batch(
+        self,
+        seeds: Sequence[int | None],
+        resources: Resources | Sequence[Resources],
+        triage_efficiencies: float | Sequence[float] = 1.0,
+        workflow_efficiencies: float | Sequence[float] = 1.0,
+    ) -> BatchKPIResult:
+        """Simulate one shift per seed at once; see ``simulation.batch.simulate_batch``."""
+        if isinstance(resources, Resources):
+            gross_capacities: float | list[float] = self._gross_capacity(resources)
+        else:
+            gross_capacities = [self._gross_capacity(r) for r in resources]
+        return simulate_batch(
+            shift_hours=self.shift_hours,
+            patients_per_hour=self.patients_per_hour,
+            event_probabilities=self.event_probabilities,
+            event_profiles=self.EVENT_PROFILES,
+            seeds=seeds,
+            gross_capacities=gross_capacities,
+            triage_efficiencies=triage_efficiencies,
+            workflow_efficiencies=workflow_efficiencies,
+        )
+
     def _generate_patients(self) -> list[Patient]:
         patients: list[Patient] = []
-        patient_id = 0
         for hour in range(self.shift_hours):
-            for _ in range(self.patients_per_hour):
-                acuity = self._rng.randint(1, 5)
-                patients.append(
-                    Patient(
-                        patient_id=patient_id,
-                        arrival_hour=hour,
-                        acuity_level=acuity,
-                        estimated_service_time=max(0.4, self._rng.gauss(1.3 + acuity * 0.25, 0.35)),
-                    )
+            patients.extend(self._patients_for_hour(self._rng, hour))
+        return patients
+
+    def _patients_for_hour(self, rng: random.Random, hour: int) -> list[Patient]:
+        if self._streams is not None:
+            return self._stream_patients_for_hour(hour)
+        patients: list[Patient] = []
+        patient_id = hour * self.patients_per_hour
+        for _ in range(self.patients_per_hour):
+            acuity = rng.randint(1, 5)
+            patients.append(
+                Patient(
+                    patient_id=patient_id,
+                    arrival_hour=hour,
+                    acuity_level=acuity,
+                    estimated_service_time=max(0.4, rng.gauss(1.3 + acuity * 0.25, 0.35)),
                 )
-                patient_id += 1
+            )
+            patient_id += 1
         return patients
 
+    def _stream_patients_for_hour(self, hour: int) -> list[Patient]:
+        streams = self._streams
+        patients: list[Patient] = []
+        for patient_id in range(hour * self.patients_per_hour, (hour + 1) * self.patients_per_hour):
+            acuity = streams.acuity()
+            patients.append(
+                Patient(
+                    patient_id=patient_id,
+                    arrival_hour=hour,
+                    acuity_level=acuity,
+                    estimated_service_time=max(0.4, streams.normal("service", 1.3 + acuity * 0.25, 0.35)),
+                    error_draw=streams.uniform("errors"),
+                )
+            )
+        return patients
+
+    def _skip_patient_draws(self) -> None:
+        # Leaves self._rng exactly where _generate_patients would: randint may consume a
+        # variable number of bits, and gauss caches its second variate, so both are called.
+        randint, gauss = self._rng.randint, self._rng.gauss
+        for _ in range(self.shift_hours * self.patients_per_hour):
+            randint(1, 5)
+            gauss(0.0, 1.0)
+
     def _activate_event(self, hour: int, events: list[RandomEvent], event_log: list[str]) -> None:
-        if self._rng.random() < self.event_probabilities.get("mass_casualty", 0.0):
-            events.append(RandomEvent("mass_casualty", 0.45, 2))
-            event_log.append(f"Hour {hour}: mass_casualty")
-        if self._rng.random() < self.event_probabilities.get("system_outage", 0.0):
-            events.append(RandomEvent("system_outage", 0.7, 1))
-            event_log.append(f"Hour {hour}: system_outage")
+        for name, (severity, duration) in self.EVENT_PROFILES.items():
+            if self._event_uniform() < self.event_probabilities.get(name, 0.0):
+                events.append(RandomEvent(name, severity, duration))
+                event_log.append(f"Hour {hour}: {name}")
+                if metrics.enabled():
+                    metrics.inc("simulation_events_fired_total", event=name)
+
+    @staticmethod
+    def _gross_capacity(resources: Resources) -> float:
+        return (resources.doctors * 2.0) + (resources.nurses * 1.0) + (resources.beds * 0.4)
 
     @staticmethod
     def _hourly_capacity(resources: Resources, disruption: float, workflow_efficiency: float) -> int:
-        gross_capacity = (resources.doctors * 2.0) + (resources.nurses * 1.0) + (resources.beds * 0.4)
+        gross_capacity = ERSimulationEngine._gross_capacity(resources)
         adjusted = gross_capacity * workflow_efficiency / disruption
         return max(1, int(adjusted))
 
@@ -104,4 +272,7 @@ class ERSimulationEngine:
 
     @staticmethod
     def result_to_dict(result: KPIResult) -> dict:
-        return asdict(result)
+        # Same output as dataclasses.asdict without its recursive deepcopy, which dominated large tournaments.
+        kpis = {f.name: getattr(result, f.name) for f in fields(result)}
+        kpis["event_log"] = list(result.event_log)
+        return kpis
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+# Simulation entities use __slots__: a long shift creates one Patient per arrival, and
+# slotted instances are roughly half the size of ones carrying a __dict__.
 
-@dataclass
+
+@dataclass(slots=True)
 class Patient:
     patient_id: int
     arrival_hour: int
@@ -12,23 +15,25 @@ class Patient:
     started_hour: int | None = None
     completed_hour: int | None = None
     has_error: bool = False
+    # Uniform for the error roll, drawn at arrival when the engine uses split random streams.
+    error_draw: float | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Resources:
     beds: int
     nurses: int
     doctors: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RandomEvent:
     name: str
     severity: float
     remaining_hours: int
 
 
-@dataclass
+@dataclass(slots=True)
 class KPIResult:
     door_to_doctor: float
     length_of_stay: float
@@ -37,3 +42,11 @@ class KPIResult:
     treated_patients: int
     untreated_patients: int
     event_log: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class PatientCohort:
+    """A shift's generated arrivals plus the RNG state right after generating them."""
+
+    patients: tuple[Patient, ...]
+    rng_state: tuple
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from simulation.engine import ERSimulationEngine
+from simulation.entities import KPIResult, PatientCohort, Resources
+
+
+class SimulationMemo:
+    """Shares seeded shift work between callers that would otherwise repeat it.
+
+    For each seed it keeps the generated patient cohort and the KPI result per
+    (resources, triage_efficiency, workflow_efficiency). Seeded runs are deterministic,
+    so a hit is exactly what a fresh ``ERSimulationEngine.run`` would return. Unseeded
+    runs are never shared. Only the ``max_seeds`` most recently used seeds are kept.
+    """
+
+    def __init__(
+        self,
+        shift_hours: int,
+        patients_per_hour: int,
+        event_probabilities: dict[str, float],
+        max_seeds: int = 4,
+        random_streams: str = "single",
+    ):
+        self.shift_hours = shift_hours
+        self.patients_per_hour = patients_per_hour
+        self.event_probabilities = event_probabilities
+        self.random_streams = random_streams
+        self.max_seeds = max_seeds
+        self.hits = 0
+        self.misses = 0
+        self._cohorts: OrderedDict[int, PatientCohort] = OrderedDict()
+        self._results: dict[int, dict[tuple, KPIResult]] = {}
+
+    def run(
+        self,
+        seed: int | None,
+        resources: Resources,
+        triage_efficiency: float = 1.0,
+        workflow_efficiency: float = 1.0,
+        share: bool = True,
+    ) -> KPIResult:
+        """``share=False`` runs a one-off seed (e.g. drawn from a private stream) without memoizing it."""
+        if seed is None or not share:
+            self.misses += 1
+            return self._engine(seed).run(resources, triage_efficiency, workflow_efficiency)
+
+        key = (resources.beds, resources.nurses, resources.doctors, triage_efficiency, workflow_efficiency)
+        results = self._results.setdefault(seed, {})
+        if key in results:
+            self._cohorts.move_to_end(seed)
+            self.hits += 1
+            return results[key]
+
+        self.misses += 1
+        engine = self._engine(seed)
+        cohort = self._cohorts.get(seed)
+        if cohort is None:
+            cohort = engine.generate_cohort()
+            self._cohorts[seed] = cohort
+            while len(self._cohorts) > self.max_seeds:
+                evicted, _ = self._cohorts.popitem(last=False)
+                self._results.pop(evicted, None)
+        self._cohorts.move_to_end(seed)
+        results[key] = engine.run(resources, triage_efficiency, workflow_efficiency, cohort=cohort)
+        return results[key]
+
+    def _engine(self, seed: int | None) -> ERSimulationEngine:
+        return ERSimulationEngine(
+            self.shift_hours, self.patients_per_hour, self.event_probabilities, seed=seed, random_streams=self.random_streams
+        )
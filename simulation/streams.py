@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import random
+from statistics import NormalDist
+
+STREAM_NAMES = ("arrivals", "service", "events", "errors")
+RANDOM_STREAM_MODES = ("single", "common", "antithetic")
+
+_STANDARD_NORMAL = NormalDist()
+_EPSILON = 1e-12
+
+
+class RandomStreams:
+    """One independent uniform stream per source of randomness in a shift.
+
+    With a single RNG, two runs that treat different numbers of patients fall out of step
+    after the first difference, so their events and errors stop lining up. Seeding each
+    stream from (seed, name) keeps every source aligned across runs that share a seed,
+    which is what common random numbers need. With ``antithetic`` every uniform u becomes
+    1 - u, so paired runs are negatively correlated.
+    """
+
+    def __init__(self, seed: int | None, antithetic: bool = False) -> None:
+        base = seed if seed is not None else random.SystemRandom().getrandbits(63)
+        self.antithetic = antithetic
+        self._streams = {name: random.Random(f"{base}:{name}") for name in STREAM_NAMES}
+
+    def uniform(self, stream: str) -> float:
+        u = self._streams[stream].random()
+        return 1.0 - u if self.antithetic else u
+
+    def acuity(self) -> int:
+        return 1 + min(4, int(self.uniform("arrivals") * 5))
+
+    def normal(self, stream: str, mu: float, sigma: float) -> float:
+        # Inverse transform rather than random.gauss, so an antithetic draw mirrors the normal too.
+        u = min(1.0 - _EPSILON, max(_EPSILON, self.uniform(stream)))
+        return mu + sigma * _STANDARD_NORMAL.inv_cdf(u)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import heapq
+
+from simulation.entities import Patient
+
+
+class TriageQueue:
+    """Waiting-room priority queue: highest acuity first, then shortest service, then arrival.
+
+    Matches the order of the former ``queue.sort(key=(acuity, -service), reverse=True)``
+    (ties keep arrival order because that sort was stable), but each push and pop
+    costs O(log n) instead of re-sorting the whole backlog every hour.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, float, int, Patient]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, patient: Patient) -> None:
+        heapq.heappush(self._heap, (-patient.acuity_level, patient.estimated_service_time, patient.patient_id, patient))
+
+    def extend(self, patients: list[Patient]) -> None:
+        for patient in patients:
+            self.push(patient)
+
+    def pop(self) -> Patient:
+        return heapq.heappop(self._heap)[-1]
+
+    def pop_many(self, count: int) -> list[Patient]:
+        return [self.pop() for _ in range(min(count, len(self._heap)))]
@@ -0,0 +1,4 @@
+import os
+
+# The API module builds its run store from this at import; keep test runs out of data/.
+os.environ["HOSPITAL_LAB_RUN_STORE"] = ":memory:"
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents.base_agent import AgentDecision
+from agents.policy import HttpAgentPolicy, PolicyDecision
+from backend.app.main import app
+from backend.app.models.schemas import BatchSimulationRequest, EnsembleRequest, SimulationRequest, SweepRequest
+from backend.app.services.batch import BatchRunner
+from backend.app.services.ensemble import EnsembleRunner
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.sweep import StaffingSweep
+from instrumentation import metrics
+
+
+@contextmanager
+def stub_policy_server(latency: float, slow_agents: dict[str, float] | None = None):
+    """Answers every agent with ``conserve`` after ``latency`` seconds (longer for ``slow_agents``)."""
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            calls.append(payload)
+            agents = payload["agents"] if "agents" in payload else [payload]
+            time.sleep(max(latency, *((slow_agents or {}).get(a["agent_name"], 0.0) for a in agents)))
+            decisions = [
+                {"agent_name": a["agent_name"], "action": "conserve", "reason": "model says hold", "expected_roi": 0.02, "workflow_efficiency": 1.05}
+                for a in agents
+            ]
+            body = json.dumps({"decisions": decisions} if "agents" in payload else decisions[0]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler, bind_and_activate=False)
+    server.request_queue_size = 64  # the default backlog of 5 drops concurrent connects
+    server.server_bind()
+    server.server_activate()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/decide", calls
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(agents: int, rounds: int = 2, **overrides) -> SimulationRequest:
+    return SimulationRequest(rounds=rounds, agent_names=[f"Agent {i}" for i in range(agents)], seed=3, tokens_used=0, **overrides)
+
+
+def test_concurrent_calls_bound_round_latency_by_the_slowest_agent():
+    service = SurvivalLabService(cache_size=0)
+    with stub_policy_server(latency=0.2) as (url, calls):
+        service.register_policy("model", HttpAgentPolicy(url, timeout_seconds=1.0, batch=False))
+        started = time.perf_counter()
+        result = service.run_iteration(_request(8, agent_policy="model"))
+        elapsed = time.perf_counter() - started
+
+    assert len(calls) == 16
+    # Serial calls would take 8 agents x 2 rounds x 0.2s = 3.2s.
+    assert elapsed < 1.5
+    assert {r["decision"] for r in result["results"]} == {"conserve"}
+
+
+def test_batched_policy_makes_one_call_per_round_and_slow_answers_fall_back():
+    service = SurvivalLabService(cache_size=0)
+    with stub_policy_server(latency=0.05, slow_agents={"Agent 1": 0.6}) as (url, calls):
+        service.register_policy("batched", HttpAgentPolicy(url, timeout_seconds=2.0), deadline_seconds=3.0)
+        service.register_policy("per-agent", HttpAgentPolicy(url, timeout_seconds=0.25, batch=False))
+        batched = service.run_iteration(_request(3, agent_policy="batched"), persist=False)
+        assert len(calls) == 2
+        per_agent = service.run_iteration(_request(3, agent_policy="per-agent"), persist=False)
+
+    # Agent 1 slows down the batch call but still answers before its timeout.
+    assert {r["decision"] for r in batched["results"]} == {"conserve"}
+    decisions = {(r["round"], r["agent_name"]): r["decision"] for r in per_agent["results"]}
+    # Agent 1 misses its 0.25s timeout and uses the heuristic policy, which invests with a full balance.
+    assert decisions[(1, "Agent 1")] == "invest"
+    assert decisions[(1, "Agent 0")] == decisions[(1, "Agent 2")] == "conserve"
+
+
+def test_deadline_keeps_the_answers_already_back_and_reuses_the_client():
+    metrics.reset()
+    service = SurvivalLabService(cache_size=0)
+    with stub_policy_server(latency=0.02, slow_agents={"Agent 1": 1.0}) as (url, calls):
+        policy = HttpAgentPolicy(url, timeout_seconds=5.0, batch=False)
+        service.register_policy("per-agent", policy, deadline_seconds=0.3)
+        result = service.run_iteration(_request(3, agent_policy="per-agent"), persist=False)
+        client = policy._client
+        service.run_iteration(_request(3, rounds=1, agent_policy="per-agent"), persist=False)
+
+    decisions = {(r["round"], r["agent_name"]): r["decision"] for r in result["results"]}
+    # Only Agent 1 misses the round deadline; the answers already back are kept.
+    assert decisions[(1, "Agent 0")] == decisions[(1, "Agent 2")] == decisions[(2, "Agent 2")] == "conserve"
+    assert decisions[(1, "Agent 1")] == "invest"
+    assert 'agent_policy_failures_total{reason="timeout"} 3' in metrics.render()
+    assert policy._client is client
+
+
+def test_unknown_policy_is_rejected_before_the_run_starts():
+    service = SurvivalLabService(cache_size=0)
+    with pytest.raises(ValueError, match="unknown agent policy"):
+        service.run_iteration(_request(2, agent_policy="missing"))
+    # Streams validate on the call itself, before any frame is produced.
+    with pytest.raises(ValueError, match="unknown agent policy"):
+        service.stream_iteration(_request(2, agent_policy="missing"))
+
+    response = TestClient(app).post("/api/simulate/stream", json={"rounds": 1, "agent_policy": "missing"})
+    assert response.status_code == 422
+
+
+class ConservePolicy:
+    async def decide_round(self, requests):
+        return {r.agent_name: PolicyDecision(AgentDecision("conserve", "policy", 0.0)) for r in requests}
+
+
+def test_registered_policies_run_in_process_when_workers_are_requested(monkeypatch):
+    service = SurvivalLabService(cache_size=0)
+    service.register_policy("local", ConservePolicy())
+    policy_request = _request(2, agent_policy="local")
+    batch = BatchSimulationRequest(requests=[policy_request, _request(2), _request(2, rounds=3)], workers=2)
+    ensemble = EnsembleRequest(**_request(2, agent_policy="local").model_dump(exclude={"ledger"}), max_replications=4, workers=2)
+    sweep = SweepRequest(
+        **_request(1, agent_policy="local").model_dump(exclude={"beds", "nurses", "doctors"}),
+        beds_range={"start": 2, "stop": 8, "step": 5},
+        nurses_range={"start": 2, "stop": 2},
+        doctors_range={"start": 1, "stop": 1},
+        workers=2,
+    )
+    serial = (BatchRunner(service).run(batch), EnsembleRunner(service).run(ensemble), StaffingSweep(service).run(sweep))
+
+    # Pool workers only know the config's policies; with a pool in play these would fail there.
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    pooled = (BatchRunner(service).run(batch), EnsembleRunner(service).run(ensemble), StaffingSweep(service).run(sweep))
+
+    # Only the batch's shift-sharing counters depend on how requests were chunked.
+    assert pooled[0]["results"] == serial[0]["results"] and pooled[1:] == serial[1:]
+    assert {r["decision"] for r in pooled[0]["results"][0]["results"]} == {"conserve"}
+    assert pooled[2]["evaluated"] == 2
+
+
+def test_batch_and_ensemble_reject_unknown_policies_with_422():
+    client = TestClient(app)
+    batch = client.post("/api/simulate/batch", json={"requests": [{"rounds": 1}, {"rounds": 1, "agent_policy": "missing"}]})
+    ensemble = client.post("/api/simulate/ensemble", json={"rounds": 1, "agent_policy": "missing", "max_replications": 2})
+
+    assert batch.status_code == ensemble.status_code == 422
+    assert "unknown agent policy" in batch.json()["detail"]
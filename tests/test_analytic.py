@@ -0,0 +1,36 @@
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.lab_service import SurvivalLabService
+from simulation.analytic import QueueingEstimator
+from simulation.batch import simulate_batch
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Resources
+
+EVENTS = {"mass_casualty": 0.08, "system_outage": 0.05}
+
+
+def test_estimates_track_simulated_means_after_calibration():
+    estimator = QueueingEstimator(12, 6, EVENTS)
+    report = estimator.calibrate()
+
+    assert report == QueueingEstimator(12, 6, EVENTS).calibrate()
+    for name, error in report.mean_abs_error.items():
+        assert error <= report.mean_abs_error_raw[name]
+
+    for resources in (Resources(beds=20, nurses=12, doctors=6), Resources(beds=1, nurses=1, doctors=1)):
+        simulated = simulate_batch(12, 6, EVENTS, ERSimulationEngine.EVENT_PROFILES, list(range(500, 900)), ERSimulationEngine._gross_capacity(resources))
+        estimate = estimator.estimate(resources)
+        assert abs(estimate.door_to_doctor - simulated.door_to_doctor.mean()) < 0.15
+        assert abs(estimate.length_of_stay - simulated.length_of_stay.mean()) < 0.15
+        assert abs(estimate.throughput - simulated.throughput.mean()) < 2
+        assert abs(estimate.error_rate - simulated.error_rate.mean()) < 0.005
+
+
+def test_estimate_mode_plays_rounds_on_estimated_kpis():
+    service = SurvivalLabService(cache_size=0)
+    result = service.run_iteration(SimulationRequest(rounds=3, agent_names=["A", "B"], seed=1, mode="estimate"))
+
+    assert len(result["results"]) == 6
+    first = result["results"][0]
+    expected = service.estimator.estimate(Resources(beds=20, nurses=12, doctors=6), 1.2, 1.0)
+    assert first["kpis"]["throughput"] == expected.throughput
+    assert first["kpis"]["event_log"] == []
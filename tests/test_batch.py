@@ -0,0 +1,57 @@
+import os
+
+from backend.app.models.schemas import BatchSimulationRequest, SimulationRequest
+from backend.app.services import batch
+from backend.app.services.batch import BatchRunner
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.run_store import RunStore
+
+
+def _requests():
+    return [
+        SimulationRequest(rounds=4, agent_names=["A", "B"], seed=3),
+        SimulationRequest(rounds=4, agent_names=["A", "B"], seed=5, doctors=6),
+        SimulationRequest(rounds=3, agent_names=["C"], seed=4, tokens_used=0),
+        SimulationRequest(rounds=4, agent_names=["A", "B"], seed=3),
+    ]
+
+
+def test_batch_matches_individual_runs_in_order_and_shares_shifts(monkeypatch):
+    # Workers are capped at the CPU count; pretend there are enough to use the pool.
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    requests = _requests()
+    expected = [SurvivalLabService(cache_size=0).run_iteration(request, persist=False) for request in requests]
+
+    serial = BatchRunner(SurvivalLabService(cache_size=0)).run(BatchSimulationRequest(requests=requests))
+    pooled = BatchRunner(SurvivalLabService(cache_size=0)).run(BatchSimulationRequest(requests=requests, workers=2))
+
+    for result in (serial, pooled):
+        assert [{**r, "run_id": None} for r in result["results"]] == [{**r, "run_id": None} for r in expected]
+        assert result["unique_requests"] == 3
+    # Seeds 3..6 overlap across the first three requests, so shared shifts are played once.
+    assert serial["shifts_reused"] > 0
+    assert serial["shifts_simulated"] + serial["shifts_reused"] == 2 * 4 + 2 * 4 + 3
+
+
+def test_batch_records_each_unique_run_in_the_store():
+    store = RunStore(":memory:")
+    service = SurvivalLabService(cache_size=0, run_store=store)
+    result = BatchRunner(service).run(BatchSimulationRequest(requests=_requests()))
+
+    run_ids = [r["run_id"] for r in result["results"]]
+    assert run_ids[0] == run_ids[3] and len(set(run_ids)) == 3
+    assert {run["status"] for run in store.runs()} == {"completed"}
+    assert len(store.agent_series("C", run_id=run_ids[2])) == 3
+
+
+def test_batch_workers_play_agents_serially_instead_of_nesting_pools(monkeypatch):
+    def no_nested_pool():
+        raise AssertionError("a batch worker must not submit to the shared pool")
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(batch.worker_pool, "shared_pool", no_nested_pool)
+    request = SimulationRequest(rounds=2, agent_names=["A", "B", "C"], seed=3, agent_workers=2)
+    serial = request.model_copy(update={"agent_workers": 1})
+
+    (results, _, _), _ = batch._run_chunk_in_worker([request.model_dump()])
+    assert results[0]["leaderboard"] == SurvivalLabService(cache_size=0).run_iteration(serial, persist=False)["leaderboard"]
@@ -0,0 +1,15 @@
+from benchmarks.harness import compare, measure
+
+
+def test_regression_gate_flags_only_cases_past_threshold():
+    baseline = {"cases": [{"name": "fast", "p50_ms": 10.0}, {"name": "slow", "p50_ms": 10.0}]}
+    report = {"cases": [{"name": "fast", "p50_ms": 11.0}, {"name": "slow", "p50_ms": 13.0}, {"name": "new", "p50_ms": 99.0}]}
+
+    assert compare(report, baseline, threshold=0.25) == ["slow: p50 10.0ms -> 13.0ms"]
+
+
+def test_measure_reports_percentiles_throughput_and_memory():
+    case = measure("noop", {}, lambda i: [0] * 1000, repeats=5)
+
+    assert case["p50_ms"] <= case["p90_ms"] <= case["p99_ms"]
+    assert case["throughput_per_s"] > 0 and case["peak_memory_kb"] > 0
@@ -0,0 +1,102 @@
+import pytest
+
+from agents.base_agent import AgentDecision
+from agents.policy import PolicyDecision
+
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.run_store import RunStore
+
+
+class Stop(Exception):
+    pass
+
+
+@pytest.fixture
+def service():
+    return SurvivalLabService(cache_size=0, run_store=RunStore(":memory:"))
+
+
+@pytest.mark.parametrize("checkpoint_every", [2, 10])
+@pytest.mark.parametrize("seed", [11, None])
+@pytest.mark.parametrize("ledger", ["scalar", "columnar"])
+def test_unchanged_fork_reproduces_original_rounds(seed, ledger, checkpoint_every):
+    service = SurvivalLabService(cache_size=0, run_store=RunStore(":memory:"), checkpoint_every=checkpoint_every)
+    original = service.run_iteration(SimulationRequest(rounds=8, agent_names=["A", "B", "C"], seed=seed, ledger=ledger))
+    fork = service.fork(original["run_id"], from_round=5)
+
+    assert fork["run_id"] != original["run_id"]
+    assert fork["results"] == [r for r in original["results"] if r["round"] > 5]
+    assert fork["leaderboard"] == original["leaderboard"]
+    assert service.run_store.runs(limit=1)[0]["parent_run_id"] == original["run_id"]
+
+
+def test_fork_with_overrides_only_plays_later_rounds(service):
+    original = service.run_iteration(SimulationRequest(rounds=6, agent_names=["A"], seed=3))
+    fork = service.fork(original["run_id"], from_round=4, overrides={"tokens_used": 0})
+
+    assert [r["round"] for r in fork["results"]] == [5, 6]
+    assert fork["results"][0]["metrics"]["balance"] > original["results"][4]["metrics"]["balance"]
+    with pytest.raises(ValueError):
+        service.fork(original["run_id"], from_round=6)
+    with pytest.raises(KeyError):
+        service.fork(original["run_id"], from_round=9, overrides={"rounds": 12})
+
+
+class AlternatingPolicy:
+    """Invests on odd rounds and conserves on even ones, counting its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def decide_round(self, requests):
+        self.calls += 1
+        return {r.agent_name: PolicyDecision(AgentDecision("invest" if r.round % 2 else "conserve", "policy", 0.1)) for r in requests}
+
+
+def test_policy_runs_fork_from_a_checkpoint_without_calling_the_policy_again(service):
+    policy = AlternatingPolicy()
+    service.register_policy("alternating", policy)
+    original = service.run_iteration(SimulationRequest(rounds=4, agent_names=["A", "B"], seed=7, agent_policy="alternating"))
+    assert policy.calls == 4
+
+    fork = service.fork(original["run_id"], from_round=2)
+
+    # Every round was checkpointed, so only rounds 3 and 4 asked the policy again.
+    assert policy.calls == 6
+    assert fork["results"] == [r for r in original["results"] if r["round"] > 2]
+
+
+def test_fork_between_checkpoints_is_refused_after_a_config_change():
+    service = SurvivalLabService(cache_size=0, run_store=RunStore(":memory:"), checkpoint_every=2)
+    original = service.run_iteration(SimulationRequest(rounds=6, agent_names=["A"], seed=3))
+    service.config_fingerprint = "edited"
+
+    with pytest.raises(ValueError, match="config changed"):
+        service.fork(original["run_id"], from_round=3)
+    # Round 4 has a checkpoint, so nothing is replayed under the new config.
+    assert [r["round"] for r in service.fork(original["run_id"], from_round=4)["results"]] == [5, 6]
+
+
+def test_resume_finishes_an_aborted_run():
+    service = SurvivalLabService(cache_size=0, run_store=RunStore(":memory:"), checkpoint_every=2)
+    request = SimulationRequest(rounds=5, agent_names=["A", "B"], seed=None)
+
+    def stop_after_three(round_idx, results):
+        if round_idx == 3:
+            raise Stop
+
+    with pytest.raises(Stop):
+        service.run_iteration(request, on_round=stop_after_three)
+    run_id = service.run_store.runs(limit=1)[0]["run_id"]
+    assert service.run_store.runs(limit=1)[0]["status"] == "aborted"
+    stored = service.run_store.agent_series("A", run_id=run_id)
+    assert [p["round"] for p in stored] == [1, 2, 3]
+
+    # The latest checkpoint is after round 2, so round 3 is replayed, identically.
+    resumed = service.resume(run_id)
+    assert resumed["run_id"] == run_id
+    assert [r["round"] for r in resumed["results"]] == [3, 3, 4, 4, 5, 5]
+    assert service.run_store.agent_series("A", run_id=run_id)[:3] == stored
+    assert service.run_store.runs(limit=1)[0]["status"] == "completed"
+    assert [p["round"] for p in service.run_store.agent_series("A", run_id=run_id)] == [1, 2, 3, 4, 5]
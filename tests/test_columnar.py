@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from backend.app.main import app
+from backend.app.services import columnar
+
+REQUEST = {"rounds": 3, "agent_names": ["A", "B"], "seed": 21, "tokens_used": 0}
+
+
+def test_binary_and_columnar_json_match_the_default_response():
+    client = TestClient(app)
+    rows = client.post("/api/simulate", json=REQUEST).json()["results"]
+
+    binary = client.post("/api/simulate", json=REQUEST, headers={"Accept": columnar.BINARY_MEDIA_TYPE})
+    compact = client.post("/api/simulate?format=columnar", json=REQUEST)
+
+    assert binary.headers["content-type"] == columnar.BINARY_MEDIA_TYPE
+    assert compact.headers["content-type"] == columnar.JSON_MEDIA_TYPE
+    decoded = columnar.decode_binary(binary.content)
+    table = compact.json()
+    for name in ("round", "balance", "door_to_doctor", "error_rate", "bankrupt"):
+        assert decoded["columns"][name].tolist() == table["columns"][name]
+    assert [table["agents"][i] for i in table["columns"]["agent"]] == [r["agent_name"] for r in rows]
+    assert [table["decisions"][i] for i in table["columns"]["decision"]] == [r["decision"] for r in rows]
+    assert table["columns"]["balance"] == [r["metrics"]["balance"] for r in rows]
+    assert table["columns"]["throughput"] == [r["kpis"]["throughput"] for r in rows]
+    assert decoded["length"] == len(rows) == 6
+
+
+def test_columnar_formats_run_in_compact_mode(monkeypatch):
+    # Patched on the routes module the app was built from, which is imported as app.api.routes.
+    modes = []
+    run_iteration = routes.service.run_iteration
+
+    def recording_run_iteration(request):
+        modes.append(request.response_mode)
+        return run_iteration(request)
+
+    monkeypatch.setattr(routes.service, "run_iteration", recording_run_iteration)
+    client = TestClient(app)
+    client.post("/api/simulate", json=REQUEST)
+    client.post("/api/simulate?format=binary", json=REQUEST)
+    client.post("/api/simulate", json=REQUEST, headers={"Accept": columnar.JSON_MEDIA_TYPE})
+
+    assert modes == ["full", "compact", "compact"]
+
+
+def test_query_parameter_overrides_accept_header():
+    assert columnar.negotiate("json", columnar.BINARY_MEDIA_TYPE) == "json"
+    assert columnar.negotiate(None, "application/octet-stream") == "binary"
+    assert columnar.negotiate(None, "application/json") == "json"
@@ -1,4 +1,7 @@
+import numpy as np
+
 from economic_engine.engine import EconomicEngine
+from economic_engine.ledger import EconomicLedger
 
 
 def test_usage_charges_incrementally():
@@ -26,3 +29,47 @@ def test_usage_charges_incrementally():
     assert round(second, 2) == 1.3
     assert round(econ.total_cost, 2) == 2.6
     assert round(econ.balance, 2) == 7.4
+
+
+def test_columnar_ledger_matches_per_agent_engine_exactly():
+    config = {
+        "initial_capital": 10.0,
+        "token_cost": 0.001,
+        "api_call_cost": 0.02,
+        "simulation_run_cost": 0.15,
+        "hourly_burn_rate": 0.05,
+        "investment": {"skill_upgrade_cost": 0.8},
+        "reward_multipliers": {"door_to_doctor": 1.4, "length_of_stay": 1.2, "throughput": 1.3, "error_rate": 1.6},
+    }
+    engine = EconomicEngine(config)
+    names = ["a", "b", "c", "d"]
+    scalar = [engine.initialize_agent(name) for name in names]
+    ledger = EconomicLedger(config, names)
+    kpis = [
+        {"door_to_doctor": 0.31, "length_of_stay": 2.47, "throughput": 61, "error_rate": 0.016},
+        {"door_to_doctor": 7.0, "length_of_stay": 15.2, "throughput": 180, "error_rate": 0.0},
+        {"door_to_doctor": 0.0, "length_of_stay": 2.1, "throughput": 72, "error_rate": 0.333},
+        {"door_to_doctor": 1.25, "length_of_stay": 3.0, "throughput": 0, "error_rate": 1.0},
+    ]
+
+    for round_idx in range(6):
+        live = ~ledger.bankrupt
+        investing = np.array([i % 2 == round_idx % 2 for i in range(len(names))]) & live
+        roi = np.array([0.12, 0.12, 0.5, 0.08])
+        for i, econ in enumerate(scalar):
+            if econ.bankrupt:
+                continue
+            if investing[i]:
+                engine.invest_in_upgrade(econ, float(roi[i]))
+            engine.charge_usage(econ, tokens=2500, api_calls=20, simulation_runs=1)
+            engine.apply_burn_rate(econ, hours=12)
+            engine.reward(econ, engine.quality_score_from_kpis(kpis[i]), 2.5)
+
+        ledger.invest_in_upgrade(investing, roi)
+        ledger.charge_usage(live, tokens=2500, api_calls=20, simulation_runs=1)
+        ledger.apply_burn_rate(live, hours=12)
+        scores = ledger.quality_scores(*(np.array([k[f] for k in kpis]) for f in ("door_to_doctor", "length_of_stay", "throughput", "error_rate")))
+        ledger.reward(live, scores, 2.5)
+
+    assert ledger.to_economics(range(len(names))) == scalar
+    assert any(econ.bankrupt for econ in scalar)
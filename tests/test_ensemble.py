@@ -0,0 +1,34 @@
+import os
+
+from backend.app.models.schemas import EnsembleRequest
+from backend.app.services.ensemble import EnsembleRunner
+from backend.app.services.lab_service import SurvivalLabService
+
+
+def test_ensemble_is_deterministic_across_workers_and_stops_early(monkeypatch):
+    # Workers are capped at the CPU count; pretend there are two so the pool is used.
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    runner = EnsembleRunner(SurvivalLabService())
+    base = dict(rounds=3, agent_names=["A", "B"], seed=5, max_replications=40, min_replications=8, batch_size=8)
+
+    serial = runner.run(EnsembleRequest(**base))
+    pooled = runner.run(EnsembleRequest(**base, workers=2))
+    early = runner.run(EnsembleRequest(**base, target_ci_width=50.0))
+
+    assert serial == pooled
+    assert serial["replications"] == 40 and not serial["stopped_early"]
+    assert early["replications"] == 8 and early["stopped_early"]
+    balance = serial["agents"][0]["final_balance"]
+    assert balance["ci_low"] <= balance["mean"] <= balance["ci_high"]
+    assert set(serial["agents"][0]["kpis"]) == {"door_to_doctor", "length_of_stay", "throughput", "error_rate"}
+
+
+def test_antithetic_pairs_report_variance_reduction():
+    runner = EnsembleRunner(SurvivalLabService(cache_size=0))
+    result = runner.run(EnsembleRequest(rounds=2, agent_names=["A", "B"], seed=9, max_replications=12, antithetic_pairs=True))
+
+    assert result["replications"] == 12 and result["simulated_runs"] == 24
+    assert set(result["variance_reduction"]["antithetic"]) == {"A", "B"}
+    # Identical policies on shared seeds: the paired gap has no variance left to reduce.
+    assert result["agents"][1]["gap_to_leader"] == {"mean": 0.0, "ci_low": 0.0, "ci_high": 0.0}
+    assert result["variance_reduction"]["common_random_numbers"] == {"B": None}
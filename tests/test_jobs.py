@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.jobs import JobLimitError, JobManager
+from backend.app.services.lab_service import SurvivalLabService
+
+
+class GatedService(SurvivalLabService):
+    """Blocks after the first round until released, so tests can observe a running job."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_round_done = threading.Event()
+        self.release = threading.Event()
+
+    def run_iteration(self, request, on_round=None):
+        def gated(round_idx, results):
+            on_round(round_idx, results)
+            self.first_round_done.set()
+            self.release.wait(timeout=5)
+
+        return super().run_iteration(request, on_round=gated)
+
+
+def test_job_reports_progress_and_completes():
+    service = GatedService()
+    manager = JobManager(service, max_workers=1)
+    job = manager.submit(SimulationRequest(rounds=3, agent_names=["A", "B"], seed=2))
+
+    assert service.first_round_done.wait(timeout=5)
+    assert job.status == "running" and job.rounds_completed == 1 and len(job.partial_results) == 2
+    service.release.set()
+    manager.shutdown()
+
+    assert job.status == "completed"
+    assert job.result == SurvivalLabService().run_iteration(SimulationRequest(rounds=3, agent_names=["A", "B"], seed=2))
+
+
+def test_cancel_and_tenant_limit():
+    service = GatedService()
+    manager = JobManager(service, max_workers=1, max_jobs_per_tenant=2)
+    running = manager.submit(SimulationRequest(rounds=5, seed=1), tenant="sweep")
+    queued = manager.submit(SimulationRequest(rounds=5, seed=1), tenant="sweep")
+
+    with pytest.raises(JobLimitError):
+        manager.submit(SimulationRequest(rounds=5, seed=1), tenant="sweep")
+    interactive = manager.submit(SimulationRequest(rounds=1, seed=1), tenant="dashboard")
+
+    assert service.first_round_done.wait(timeout=5)
+    manager.cancel(running.job_id)
+    manager.cancel(queued.job_id)
+    service.release.set()
+    manager.shutdown()
+
+    assert running.status == "cancelled" and running.rounds_completed < 5
+    assert queued.status == "cancelled" and queued.rounds_completed == 0
+    assert interactive.status == "completed"
+
+
+def test_busy_tenant_cannot_hold_every_worker():
+    started = []
+    release = threading.Event()
+
+    class RecordingService(SurvivalLabService):
+        def run_iteration(self, request, on_round=None):
+            started.append(request.seed)
+            release.wait(timeout=5)
+            return super().run_iteration(request, on_round=on_round)
+
+    manager = JobManager(RecordingService(), max_workers=2)
+    sweep = [manager.submit(SimulationRequest(rounds=1, seed=seed), tenant="sweep") for seed in (1, 2, 3)]
+    interactive = manager.submit(SimulationRequest(rounds=1, seed=9), tenant="dashboard")
+
+    assert [job.status for job in sweep] == ["running", "queued", "queued"]
+    assert interactive.status == "running"
+    release.set()
+    manager.shutdown()
+
+    assert sorted(started[:2]) == [1, 9]
+    assert all(job.status == "completed" for job in sweep + [interactive])
@@ -0,0 +1,93 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.lab_service import SurvivalLabService
+from instrumentation import metrics
+
+
+def test_run_records_phase_timings_and_counters():
+    metrics.reset()
+    SurvivalLabService(cache_size=0).run_iteration(SimulationRequest(rounds=2, agent_names=["A", "B"], seed=4))
+    text = metrics.render()
+
+    for phase in ("patient_generation", "queue_processing", "kpi_aggregation"):
+        assert f'simulation_phase_seconds_count{{phase="{phase}"}}' in text
+    # One observation per agent-round in each phase.
+    for phase in ("decision", "economics_charge", "simulation", "economics_reward"):
+        assert f'service_phase_seconds_count{{phase="{phase}"}} 4' in text
+    assert 'service_phase_seconds_count{phase="result_building"}' in text
+    assert 'economics_operations_total{operation="reward"} 4' in text
+    assert 'service_run_iteration_seconds_bucket{le="+Inf"} 1' in text
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.reset()
+    metrics.set_enabled(False)
+    try:
+        assert metrics.timer("anything") is metrics.timer("other")
+        SurvivalLabService(cache_size=0).run_iteration(SimulationRequest(rounds=1, seed=4))
+        assert metrics.render() == "\n"
+    finally:
+        metrics.set_enabled(True)
+
+
+def test_metrics_endpoint_exposes_request_latency():
+    metrics.reset()
+    client = TestClient(app)
+    client.post("/api/simulate", json={"rounds": 1, "seed": 9})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="POST",path="/api/simulate"} 1' in response.text
+    assert 'http_handler_seconds_count{path="/api/simulate"} 1' in response.text
+
+
+def test_economics_counts_match_across_ledgers():
+    counted = []
+    for ledger in ("scalar", "columnar"):
+        metrics.reset()
+        SurvivalLabService(cache_size=0).run_iteration(SimulationRequest(rounds=3, agent_names=["A", "B"], seed=4, ledger=ledger))
+        counted.append([line for line in metrics.render().splitlines() if line.startswith("economics_")])
+
+    assert counted[0] == counted[1]
+    text = "\n".join(counted[0])
+    # Two agents over three rounds, each investing every round while their balance allows.
+    assert 'economics_operations_total{operation="charge_usage"} 6' in text
+    assert 'economics_operations_total{operation="invest_in_upgrade"} 6' in text
+    assert "economics_investments_total 6" in text
+
+
+def test_phases_add_up_queued_records_across_batches():
+    metrics.reset()
+    timed = metrics.phases("test_phase_seconds", "phase", ("a", "b", "c"))
+    records = metrics.PHASE_BATCH + 3
+    for _ in range(records):
+        timed.record(0.0, 1.0, 3.0, 6.0)
+    text = metrics.render()
+
+    assert f'test_phase_seconds_sum{{phase="a"}} {1.0 * records}' in text
+    assert f'test_phase_seconds_count{{phase="a"}} {records}' in text
+    assert f'test_phase_seconds_sum{{phase="b"}} {2.0 * records}' in text
+    assert f'test_phase_seconds_sum{{phase="c"}} {3.0 * records}' in text
+
+
+def test_agent_pool_timings_are_reported_by_the_parent(monkeypatch):
+    request = SimulationRequest(rounds=2, agent_names=["A", "B", "C", "D"], seed=4)
+    counted = []
+    for agent_workers in (1, 2):
+        # Workers are capped at the CPU count; pretend there are two so the pool is used.
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        metrics.reset()
+        SurvivalLabService(cache_size=0).run_iteration(request.model_copy(update={"agent_workers": agent_workers}))
+        lines = metrics.render().splitlines()
+        counted.append([line for line in lines if line.startswith(("service_phase_seconds_count", "economics_"))])
+
+    # Phases and counters recorded in the workers are reported by the parent like a serial run's.
+    assert counted[0] == counted[1]
+    assert 'service_phase_seconds_count{phase="simulation"} 8' in counted[1]
+    # Each worker memoizes its own shifts, so the engine's count differs but is reported.
+    assert any(line.startswith('simulation_phase_seconds_count{phase="queue_processing"}') for line in lines)
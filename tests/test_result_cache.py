@@ -0,0 +1,50 @@
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services import lab_service
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.run_store import RunStore
+
+
+def test_seeded_requests_are_cached_until_config_changes(monkeypatch):
+    service = SurvivalLabService(cache_size=2)
+    payload = SimulationRequest(rounds=2, agent_names=["A", "B"], seed=3)
+
+    first = service.run_iteration(payload)
+    assert service.run_iteration(SimulationRequest(**payload.model_dump())) is first
+    service.run_iteration(SimulationRequest(rounds=2, seed=None))
+    assert service.cache.stats() == {"hits": 1, "misses": 1, "bypassed": 1, "entries": 1, "max_entries": 2}
+
+    config = {**service.config, "impact_factor": 5.0}
+    monkeypatch.setattr(lab_service, "config_version", lambda: service.config_version + 1)
+    monkeypatch.setattr(lab_service, "load_config", lambda: config)
+    changed = service.run_iteration(payload)
+
+    assert changed is not first
+    assert changed["leaderboard"][0]["balance"] > first["leaderboard"][0]["balance"]
+    assert service.cache.stats()["entries"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    service = SurvivalLabService(cache_size=2)
+    requests = [SimulationRequest(rounds=1, seed=seed) for seed in (1, 2, 3)]
+    for request in requests:
+        service.run_iteration(request)
+    service.run_iteration(requests[0])
+
+    assert service.cache.stats()["hits"] == 0
+    service.run_iteration(requests[2])
+    assert service.cache.stats()["hits"] == 1
+
+
+def test_unpersisted_runs_bypass_the_cache():
+    store = RunStore(":memory:")
+    service = SurvivalLabService(cache_size=2, run_store=store)
+    interactive = SimulationRequest(rounds=1, seed=1)
+    first = service.run_iteration(interactive)
+    for seed in range(10, 20):
+        service.run_iteration(SimulationRequest(rounds=1, seed=seed), persist=False)
+
+    assert service.run_iteration(interactive) is first
+    # A request matching an earlier replication is played and stored, not served unstored.
+    replayed = service.run_iteration(SimulationRequest(rounds=1, seed=10))
+    assert replayed["run_id"] is not None
+    assert len(store.runs()) == 2
@@ -0,0 +1,43 @@
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.run_store import KPI_COLUMNS, RunStore
+
+
+def test_runs_are_persisted_round_by_round_and_queryable(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite")
+    service = SurvivalLabService(run_store=store)
+    request = SimulationRequest(rounds=3, agent_names=["A", "B"], seed=5)
+
+    seen_rounds = []
+
+    def on_round(round_idx, results):
+        seen_rounds.append(len(store.agent_series("A", run_id=store.runs(limit=1)[0]["run_id"])))
+
+    first = service.run_iteration(request, on_round=on_round)
+    second = service.run_iteration(SimulationRequest(rounds=3, agent_names=["A", "B"], seed=6))
+    assert service.run_iteration(request)["run_id"] == first["run_id"]  # cached, already stored
+
+    # Rows are committed as each round finishes, before the run returns.
+    assert seen_rounds == [1, 2, 3]
+    assert [run["run_id"] for run in store.runs()] == [second["run_id"], first["run_id"]]
+    assert all(run["status"] == "completed" for run in store.runs())
+
+    series = store.agent_series("A", run_id=first["run_id"])
+    expected = [r for r in first["results"] if r["agent_name"] == "A"]
+    assert [point["round"] for point in series] == [1, 2, 3]
+    assert [point["kpis"] for point in series] == [{k: r["kpis"][k] for k in KPI_COLUMNS} for r in expected]
+    assert len(store.agent_series("A", last_runs=2)) == 6
+
+    ranking = store.leaderboard()
+    assert len(ranking) == 4
+    assert ranking[0]["balance"] == max(e["balance"] for e in first["leaderboard"] + second["leaderboard"])
+    assert {e["agent_name"] for e in store.leaderboard(agent_name="B")} == {"B"}
+
+
+def test_persist_false_skips_store():
+    store = RunStore(":memory:")
+    service = SurvivalLabService(run_store=store)
+    result = service.run_iteration(SimulationRequest(rounds=1, seed=1), persist=False)
+
+    assert "run_id" not in result
+    assert store.runs() == []
@@ -1,4 +1,8 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from backend.app.models.schemas import SimulationRequest
+from backend.app.services import lab_service
 from backend.app.services.lab_service import SurvivalLabService
 
 
@@ -12,3 +16,81 @@ def test_multi_agent_rounds_output_shape():
     assert len(result["leaderboard"]) == 2
     assert len(result["results"]) >= 2
     assert {entry["agent_name"] for entry in result["leaderboard"]} == {"A", "B"}
+
+
+def test_stream_iteration_matches_run_iteration():
+    service = SurvivalLabService()
+    payload = SimulationRequest(rounds=3, agent_names=["A", "B"], seed=4)
+
+    frames = list(service.stream_iteration(payload))
+    expected = service.run_iteration(payload)
+
+    assert [f["data"] for f in frames if f["type"] == "round_result"] == expected["results"]
+    assert frames[-1] == {"type": "leaderboard", "data": {"rounds": 3, "leaderboard": expected["leaderboard"]}}
+
+
+def test_compact_mode_sends_each_decision_once():
+    service = SurvivalLabService()
+    full = service.run_iteration(SimulationRequest(rounds=4, agent_names=["A", "B"], seed=9))
+    compact = service.run_iteration(SimulationRequest(rounds=4, agent_names=["A", "B"], seed=9, response_mode="compact"))
+
+    assert all(len(r["decision_logs"]) == 1 for r in compact["results"])
+    assert [r["decision_logs"][0] for r in compact["results"]] == [r["decision_logs"][-1] for r in full["results"]]
+    assert compact["decision_logs"]["A"] == full["results"][-2]["decision_logs"]
+    assert "decision_logs" not in full
+
+
+def test_columnar_ledger_mode_matches_scalar_mode():
+    service = SurvivalLabService(cache_size=0)
+    base = dict(rounds=30, agent_names=[f"Agent {i}" for i in range(6)], seed=7, tokens_used=4000)
+
+    assert service.run_iteration(SimulationRequest(**base, ledger="columnar")) == service.run_iteration(SimulationRequest(**base))
+
+
+def test_parallel_agents_match_serial_output(monkeypatch):
+    # Worker counts are capped at the CPU count; pretend there are enough to run in parallel.
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    service = SurvivalLabService(cache_size=0)
+    names = [f"Agent {i}" for i in range(5)]
+    for request in [
+        SimulationRequest(rounds=4, agent_names=names, seed=7),
+        SimulationRequest(rounds=6, agent_names=names, seed=8, tokens_used=90000, response_mode="compact"),
+    ]:
+        serial = service.run_iteration(request)
+        parallel = service.run_iteration(request.model_copy(update={"agent_workers": 2}))
+        assert parallel == serial
+    assert any(entry["bankrupt"] for entry in serial["leaderboard"])
+
+    unseeded = SimulationRequest(rounds=3, agent_names=names, agent_workers=3)
+    serial_state, parallel_state = service.start_run(unseeded), service.start_run(unseeded)
+    parallel_state.stream_seed = serial_state.stream_seed
+    serial_results = list(service.iter_round_results(unseeded.model_copy(update={"agent_workers": 1}), serial_state))
+    assert list(service.iter_round_results(unseeded, parallel_state)) == serial_results
+
+
+class RecordingPool(ThreadPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=2)
+        self.chunk_sizes: list[int] = []
+
+    def submit(self, fn, *args):
+        self.chunk_sizes.append(len(args[-1]))
+        return super().submit(fn, *args)
+
+
+def test_parallel_runs_share_one_pool_and_cap_workers_at_the_cpu_count(monkeypatch):
+    pool = RecordingPool()
+    monkeypatch.setattr(lab_service.worker_pool, "shared_pool", lambda: pool)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    service = SurvivalLabService(cache_size=0)
+    request = SimulationRequest(rounds=2, agent_names=[f"Agent {i}" for i in range(6)], seed=5, agent_workers=16)
+
+    serial = service.run_iteration(request.model_copy(update={"agent_workers": 1}))
+    assert pool.chunk_sizes == []
+    # A second run reuses the pool, which a per-run shutdown would have closed.
+    assert service.run_iteration(request) == serial
+    assert service.run_iteration(request) == serial
+    pool.shutdown()
+
+    # Two rounds per run, each split into two chunks of three agents.
+    assert pool.chunk_sizes == [3] * 8
@@ -0,0 +1,89 @@
+from statistics import mean, variance
+
+from simulation.engine import ERSimulationEngine
+from simulation.entities import Patient, Resources
+from simulation.event_engine import DiscreteEventSimulationEngine
+from simulation.memo import SimulationMemo
+from simulation.triage_queue import TriageQueue
+
+EVENTS = {"mass_casualty": 0.08, "system_outage": 0.05}
+
+
+def test_batch_matches_scalar_summary_statistics():
+    resources = Resources(beds=2, nurses=2, doctors=1)
+    seeds = list(range(1500))
+    engine = ERSimulationEngine(shift_hours=12, patients_per_hour=6, event_probabilities=EVENTS)
+
+    batch = engine.run_batch(seeds, resources, triage_efficiencies=1.2, workflow_efficiencies=1.0)
+    scalar = [
+        ERSimulationEngine(12, 6, EVENTS, seed=seed).run(resources, triage_efficiency=1.2, workflow_efficiency=1.0)
+        for seed in seeds
+    ]
+
+    assert len(batch) == len(seeds)
+    for kpi, tolerance in [("door_to_doctor", 0.03), ("length_of_stay", 0.05), ("throughput", 0.5), ("error_rate", 0.002)]:
+        assert abs(float(getattr(batch, kpi).mean()) - mean(getattr(r, kpi) for r in scalar)) < tolerance
+    assert all(r.treated_patients + r.untreated_patients == 72 for r in batch.to_kpi_results())
+
+
+def test_triage_queue_preserves_stable_sort_order():
+    patients = [
+        Patient(patient_id=i, arrival_hour=0, acuity_level=acuity, estimated_service_time=service)
+        for i, (acuity, service) in enumerate([(3, 1.2), (5, 2.0), (3, 0.4), (5, 0.4), (3, 0.4), (1, 0.9)])
+    ]
+    expected = sorted(patients, key=lambda p: (p.acuity_level, -p.estimated_service_time), reverse=True)
+
+    queue = TriageQueue()
+    queue.extend(patients)
+
+    assert [p.patient_id for p in queue.pop_many(4)] == [p.patient_id for p in expected[:4]]
+    assert [p.patient_id for p in queue.pop_many(10)] == [p.patient_id for p in expected[4:]]
+
+
+def test_discrete_event_engine_tracks_hourly_model_over_multi_day_horizon():
+    resources = Resources(beds=20, nurses=12, doctors=6)
+    hourly = [ERSimulationEngine(12, 6, EVENTS, seed=seed).run(resources) for seed in range(200)]
+    minute = [DiscreteEventSimulationEngine(12, 6, EVENTS, seed=seed).run(resources) for seed in range(200)]
+
+    assert abs(mean(r.length_of_stay for r in minute) - mean(r.length_of_stay for r in hourly)) < 0.2
+    assert abs(mean(r.throughput for r in minute) - 72) < 3
+
+    week = DiscreteEventSimulationEngine(24 * 7, 6, EVENTS, seed=3).run(resources)
+    assert week == DiscreteEventSimulationEngine(24 * 7, 6, EVENTS, seed=3).run(resources)
+    assert 900 < week.treated_patients + week.untreated_patients < 1120
+
+
+def test_memo_and_cohort_reuse_match_fresh_runs():
+    memo = SimulationMemo(12, 6, EVENTS)
+    for resources in [Resources(beds=2, nurses=2, doctors=1), Resources(beds=20, nurses=12, doctors=6)]:
+        for seed in (1, 2):
+            fresh = ERSimulationEngine(12, 6, EVENTS, seed=seed).run(resources, 1.2, 0.95)
+            assert memo.run(seed, resources, 1.2, 0.95) == fresh
+            assert memo.run(seed, resources, 1.2, 0.95) is memo.run(seed, resources, 1.2, 0.95)
+
+    assert memo.misses == 4
+
+
+def test_streaming_run_matches_run_exactly():
+    for resources in [Resources(beds=2, nurses=2, doctors=1), Resources(beds=20, nurses=12, doctors=6)]:
+        for seed in range(25):
+            expected = ERSimulationEngine(24, 12, EVENTS, seed=seed).run(resources, 1.2, 0.95)
+            assert ERSimulationEngine(24, 12, EVENTS, seed=seed).run_streaming(resources, 1.2, 0.95) == expected
+
+    assert not hasattr(Patient(patient_id=0, arrival_hour=0, acuity_level=3, estimated_service_time=1.0), "__dict__")
+
+
+def test_common_random_streams_tighten_staffing_comparisons():
+    def los_gaps(random_streams):
+        gaps = []
+        for seed in range(300):
+            small, large = (
+                ERSimulationEngine(12, 6, EVENTS, seed=seed, random_streams=random_streams).run(Resources(beds=beds, nurses=3, doctors=1))
+                for beds in (3, 4)
+            )
+            gaps.append(small.length_of_stay - large.length_of_stay)
+        return gaps
+
+    assert variance(los_gaps("single")) > 4 * variance(los_gaps("common"))
+    mirrored = ERSimulationEngine(12, 6, EVENTS, seed=1, random_streams="antithetic").run(Resources(beds=3, nurses=3, doctors=1))
+    assert mirrored != ERSimulationEngine(12, 6, EVENTS, seed=1, random_streams="common").run(Resources(beds=3, nurses=3, doctors=1))
@@ -0,0 +1,70 @@
+import os
+from statistics import fmean
+
+from agents.base_agent import AgentDecision
+from agents.policy import PolicyDecision
+from backend.app.models.schemas import SimulationRequest, SweepRequest
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.sweep import StaffingSweep, pareto_frontier
+
+SWEEP = dict(
+    rounds=4,
+    seed=3,
+    agent_names=["A", "B"],
+    beds_range={"start": 2, "stop": 12, "step": 5},
+    nurses_range={"start": 1, "stop": 7, "step": 3},
+    doctors_range={"start": 1, "stop": 3, "step": 2},
+)
+
+
+def test_sweep_points_match_direct_runs_and_reuse_cache(monkeypatch):
+    # Workers are capped at the CPU count; pretend there are two so the pool is used.
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    service = SurvivalLabService(cache_size=0)
+    sweep = StaffingSweep(service)
+
+    first = sweep.run(SweepRequest(**SWEEP))
+    pooled = StaffingSweep(SurvivalLabService()).run(SweepRequest(**SWEEP, workers=2))
+    again = sweep.run(SweepRequest(**SWEEP))
+
+    assert pooled == first
+    assert again["evaluated"] == 0 and again["cached"] == first["evaluated"]
+    point = next(p for p in first["points"] if p["status"] == "evaluated")
+    direct = service.run_iteration(SimulationRequest(rounds=4, seed=3, agent_names=["A", "B"], beds=point["beds"], nurses=point["nurses"], doctors=point["doctors"]))
+    assert point["quality_score"] == round(fmean(service.econ_engine.quality_score_from_kpis(r["kpis"]) for r in direct["results"]), 4)
+    assert first["pareto_frontier"] == pareto_frontier([p for p in first["points"] if p["status"] == "evaluated"])
+
+
+def test_sweep_prunes_dominated_staffing_and_early_bankruptcy():
+    sweep = StaffingSweep(SurvivalLabService())
+    dominated = sweep.run(SweepRequest(**{**SWEEP, "beds_range": {"start": 5, "stop": 10, "step": 5}, "nurses_range": {"start": 2, "stop": 4, "step": 2}}))
+    # beds=10, nurses=2 has the same gross capacity as beds=5, nurses=4 but costs less.
+    pruned = {(p["beds"], p["nurses"], p["doctors"]): p for p in dominated["points"]}
+    assert pruned[(5, 4, 3)]["status"] == "pruned_dominated"
+    assert pruned[(5, 4, 3)]["dominated_by"] == {"beds": 10, "nurses": 2, "doctors": 3}
+
+    broke = sweep.run(SweepRequest(**{**SWEEP, "tokens_used": 8000, "rounds": 8, "prune_bankrupt_round": 2}))
+    assert broke["pareto_frontier"] == []
+    assert all(p["rounds_played"] == 2 for p in broke["points"] if p["status"] == "pruned_bankrupt")
+
+
+class OneBedPolicy:
+    """Staffs a single bed whatever was requested, so equal allocated capacity no longer means equal outcomes."""
+
+    async def decide_round(self, requests):
+        return {
+            r.agent_name: PolicyDecision(AgentDecision("work", "policy", 0.08), staffing={"beds": 1, "nurses": r.nurses, "doctors": r.doctors})
+            for r in requests
+        }
+
+
+def test_sweep_with_policy_overrides_does_not_prune_by_capacity():
+    service = SurvivalLabService(cache_size=0)
+    service.register_policy("one-bed", OneBedPolicy())
+    grid = {"beds_range": {"start": 5, "stop": 10, "step": 5}, "nurses_range": {"start": 2, "stop": 4, "step": 2}}
+    swept = StaffingSweep(service).run(SweepRequest(**{**SWEEP, **grid, "agent_policy": "one-bed"}))
+
+    points = {(p["beds"], p["nurses"], p["doctors"]): p for p in swept["points"]}
+    assert swept["pruned"] == 0 and swept["evaluated"] == len(points)
+    # Capacity pruning would keep the cheaper beds=10, nurses=2 and drop this better point.
+    assert points[(5, 4, 1)]["quality_score"] > points[(10, 2, 1)]["quality_score"]
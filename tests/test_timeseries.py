@@ -0,0 +1,51 @@
+import pytest
+
+from backend.app.models.schemas import SimulationRequest
+from backend.app.services.lab_service import SurvivalLabService
+from backend.app.services.run_store import RunStore
+from backend.app.services.timeseries import TimeSeriesView, lttb
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = list(range(100))
+    y = [0.0] * 100
+    y[37], y[81] = 50.0, -20.0
+
+    kept = lttb(x, y, 10)
+
+    assert len(kept) == 10 and kept[0] == 0 and kept[-1] == 99
+    assert kept == sorted(kept)
+    assert 37 in kept and 81 in kept
+    assert lttb(x[:5], y[:5], 10) == [0, 1, 2, 3, 4]
+
+
+def test_series_grow_with_stored_rounds_and_stay_constant_size():
+    store = RunStore(":memory:")
+    service = SurvivalLabService(cache_size=0, run_store=store)
+    view = TimeSeriesView(store)
+    request = SimulationRequest(rounds=40, agent_names=["A", "B"], seed=2, tokens_used=0, api_calls=0)
+
+    frames = service.stream_iteration(request)
+    run_id = next(frames)["data"]["run_id"]
+    for frame in frames:
+        if frame["data"]["round"] == 4:
+            break
+    # Rounds 1-3 are stored by the time round 4 starts streaming.
+    partial = view.series(run_id, points=10, metrics=["balance"])
+    assert partial["status"] == "running" and partial["rounds_completed"] == 3
+    assert partial["agents"]["A"]["balance"]["round"] == [1, 2, 3]
+
+    for _ in frames:
+        pass
+    final = view.series(run_id, points=10, agent_names=["B"])
+    assert final["status"] == "completed" and final["rounds_completed"] == 40
+    assert list(final["agents"]) == ["B"]
+    balance = final["agents"]["B"]["balance"]
+    assert len(balance["round"]) == 10 and balance["round"][0] == 1 and balance["round"][-1] == 40
+    full = {point["round"]: point["metrics"]["balance"] for point in store.agent_series("B", run_id=run_id)}
+    assert all(full[rnd] == value for rnd, value in zip(balance["round"], balance["value"]))
+
+    with pytest.raises(KeyError):
+        view.series("missing")
+    with pytest.raises(ValueError):
+        view.series(run_id, metrics=["bogus"])